@@ -0,0 +1,163 @@
+import os
+import subprocess
+import sys
+import unittest
+import linear
+from linear import Vector, Matrix, PythonBackend
+import matrix_test
+import vector_test
+
+
+def available(name):
+    """
+    Returns True if the backend called 'name' can be loaded here.
+    """
+    try:
+        linear.get_backend(name)
+    except ImportError:
+        return False
+    return True
+
+
+class BackendCase(object):
+    """
+    Mixed into an existing TestCase to run all of its tests with 'backend'
+    as the active compute backend.
+    """
+    backend = None
+
+    def setUp(self):
+        context = linear.use_backend(self.backend)
+        context.__enter__()
+        self.addCleanup(context.__exit__, None, None, None)
+        super().setUp()
+
+
+# Run the existing Matrix and Vector tests against every registered backend
+for _name in linear.backends():
+    for _case in (matrix_test.TestMatrix, vector_test.TestVector):
+        _parity = type('{}{}'.format(_case.__name__, _name.title()),
+                       (BackendCase, _case), {'backend': _name})
+        skip = unittest.skipUnless(available(_name),
+                                   "{} backend not available".format(_name))
+        globals()[_parity.__name__] = skip(_parity)
+
+
+class CountingBackend(PythonBackend):
+    """
+    Reference backend which counts how often it is asked to add, or to
+    find an angle.
+    """
+    name = 'counting'
+
+    def __init__(self):
+        self.adds = 0
+        self.angles = 0
+
+    def add(self, a, b):
+        self.adds += 1
+        return super().add(a, b)
+
+    def angle(self, a, b):
+        self.angles += 1
+        return super().angle(a, b)
+
+
+# unittest requires CamelCase
+class TestBackends(unittest.TestCase):
+    def setUp(self):
+        linear.register_backend('counting', CountingBackend)
+        self.counting = linear.get_backend('counting')
+        self.m = Matrix([Vector([1, 2]), Vector([3, 4])])
+
+
+    def tearDown(self):
+        linear._BACKENDS.pop('counting')
+        linear._LOADED.pop('counting')
+
+
+    def test_registry(self):
+        # Verify that the reference backend is the default
+        self.assertIsInstance(linear.get_backend(), PythonBackend)
+        self.assertEqual(linear.get_backend().name, 'python')
+        self.assertIn('numpy', linear.backends())
+
+        # Verify that unknown backends are rejected
+        self.assertRaises(ValueError, lambda: linear.get_backend('fortran'))
+        self.assertRaises(ValueError, lambda: linear.set_backend('fortran'))
+
+
+    def test_context_manager(self):
+        # Verify that operators dispatch through the active backend and that
+        # the previous backend comes back afterwards.
+        with linear.use_backend('counting') as backend:
+            self.assertIs(backend, self.counting)
+            with linear.use_backend('python'):
+                self.m + self.m
+            self.m + self.m
+            Vector([1, 2]) + Vector([3, 4])
+        self.m + self.m
+        self.assertEqual(self.counting.adds, 2)
+        self.assertEqual(linear.get_backend().name, 'python')
+
+
+    def test_per_call(self):
+        # Verify that a backend can be picked for a single call
+        self.assertEqual(self.m.scale(2, backend='counting'),
+                         self.m.scale(2))
+        self.assertEqual(self.m.trace(backend=self.counting), 5)
+        self.assertRaises(ValueError,
+                          lambda: self.m.hadamard(self.m, backend='fortran'))
+
+        # Verify that sums go through the backend picked for the call
+        v = Vector([1, 2])
+        self.assertEqual(self.m.add(self.m, backend='counting'),
+                         self.m.scale(2))
+        self.assertEqual(v.add(v, backend=self.counting), Vector([2, 4]))
+        self.assertEqual(self.counting.adds, 2)
+        self.assertEqual(self.m.subtract(self.m, backend='counting'),
+                         self.m.scale(0))
+        self.assertEqual(v.subtract(v, backend='counting'), Vector([0, 0]))
+        self.assertEqual(self.m.__mul__(v, backend='counting'), self.m * v)
+        self.assertEqual(v.__mul__(self.m, backend='counting'), v * self.m)
+        self.assertEqual(v.__matmul__(v, backend='counting'), 5)
+        self.assertEqual(v.angle(Vector([2, -1]), backend='counting'), 90)
+        self.assertEqual(self.counting.angles, 1)
+        self.assertRaises(ValueError,
+                          lambda: self.m.__mul__(v, backend='fortran'))
+        self.assertRaises(ValueError,
+                          lambda: v.__matmul__(v, backend='fortran'))
+
+
+    def test_set_backend(self):
+        linear.set_backend('counting')
+        try:
+            self.m + self.m
+        finally:
+            linear.set_backend('python')
+        self.assertEqual(self.counting.adds, 1)
+
+
+    @unittest.skipUnless(available('numpy'), "numpy backend not available")
+    def test_environment(self):
+        # Verify that the default backend can be chosen from the environment
+        # and that operations are then worked out by it
+        env = dict(os.environ, LINEAR_BACKEND='numpy')
+        code = ('import linear, numpy_backend\n'
+                'calls = []\n'
+                'add = numpy_backend.NumpyBackend.add\n'
+                'def counted(self, *args, **kwargs):\n'
+                '    calls.append(self.name)\n'
+                '    return add(self, *args, **kwargs)\n'
+                'numpy_backend.NumpyBackend.add = counted\n'
+                'm = linear.Matrix([linear.Vector([1, 2])])\n'
+                'm + m\n'
+                'print(linear.DEFAULT_BACKEND, *calls)')
+        out = subprocess.run([sys.executable, '-c', code], env=env,
+                             cwd=os.path.dirname(os.path.abspath(__file__)),
+                             capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.split(), ['numpy', 'numpy'])
+
+
+if __name__ == "__main__":
+    unittest.main()
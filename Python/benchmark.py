@@ -0,0 +1,372 @@
+"""
+Benchmark suite for linear.py.
+
+Times every Vector and Matrix operation over a ladder of sizes for int,
+float and complex numbers, and records for each the best time per call,
+the throughput in numbers processed per second and the peak memory the
+call allocated.  Results are written as JSON so that a later run can be
+compared with a saved baseline:
+
+    python benchmark.py run --output baseline.json
+    ... change something ...
+    python benchmark.py run --output current.json
+    python benchmark.py compare baseline.json current.json
+
+compare prints the ratio of current to baseline time for every benchmark
+found in both files, flags those which got slower by more than the
+threshold (10% by default) and exits with status 1 if any did.
+
+Matrix products cost n^3 and are only timed up to PRODUCT_LIMIT rows by
+default; --full times them over the whole ladder.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from random import Random
+
+import linear
+from linear import Matrix, Vector, _COMPLEX
+
+
+VECTOR_SIZES = (2, 3, 16, 128, 1024)
+MATRIX_SIZES = (2, 16, 128, 512, 1000)
+QUICK_VECTOR_SIZES = (2, 3, 16, 128)
+QUICK_MATRIX_SIZES = (2, 16, 64)
+PRODUCT_LIMIT = 128
+TYPES = ('int', 'float', 'complex')
+
+# Benchmarks which slowed down by more than this fraction are regressions
+THRESHOLD = 0.10
+
+# Each timing lasts at least WINDOW seconds, so short calls are repeated
+# often enough to be measured.
+WINDOW = 0.02
+
+
+def timings(function, repeats=5, window=0.01):
+    """
+    Times 'function' 'repeats' times and returns the time of one call, in
+    seconds, for each.  Cheap functions are called in a loop so each time
+    lasts at least 'window' seconds.
+    """
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        if time.perf_counter() - start > window:
+            break
+        calls *= 10
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        times.append((time.perf_counter() - start) / calls)
+    return times
+
+
+def best_time(function, repeats=5, window=0.01):
+    """
+    Calls 'function' 'repeats' times and returns the fastest time in seconds.
+    """
+    return min(timings(function, repeats, window))
+
+
+def peak_memory(function):
+    """
+    Calls 'function' once and returns the peak number of bytes it had
+    allocated at any one time.  If tracemalloc is already tracing it is
+    left running, though its peak is reset, and only memory allocated
+    after the call started counts.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        function()
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def numbers(rng, element_type, count):
+    """
+    Returns 'count' random numbers of 'element_type' from 'rng'.
+    """
+    if element_type == 'int':
+        return [rng.randint(-100, 100) for _ in range(count)]
+    if element_type == 'float':
+        return [rng.uniform(-100.0, 100.0) for _ in range(count)]
+    return [complex(rng.uniform(-100.0, 100.0), rng.uniform(-100.0, 100.0))
+            for _ in range(count)]
+
+
+def vector_cases(v, w, m):
+    """
+    Returns (name, work, function) for every Vector benchmark, where 'work'
+    is the number of numbers the operation processes.  In-place operations
+    work on a copy of 'v' with numbers which leave it as it was, such as
+    adding zero, so it neither grows nor changes kind as they repeat.
+    """
+    n = v.dimension
+    x = v.scale(1)
+    zero = w.scale(0)
+    cases = [
+        ('vector.add', n, lambda: v + w),
+        ('vector.subtract', n, lambda: v - w),
+        ('vector.scale', n, lambda: v.scale(3)),
+        ('vector.dot', n, lambda: v * w),
+        ('vector.equal', n, lambda: v == w),
+        ('vector.vecmat', n * n, lambda: v * m),
+        ('vector.iadd', n, lambda: x.__iadd__(zero)),
+        ('vector.isub', n, lambda: x.__isub__(zero)),
+        ('vector.imul', n, lambda: x.__imul__(1)),
+        ('vector.scale_', n, lambda: x.scale_(1)),
+        ('vector.add_out', n, lambda: v.add(w, out=x)),
+        ('vector.subtract_out', n, lambda: v.subtract(w, out=x)),
+        ('vector.scale_out', n, lambda: v.scale(3, out=x)),
+    ]
+    if v._kind < _COMPLEX:
+        # Magnitudes are only defined here for real Vectors
+        cases += [
+            ('vector.magnitude', n, lambda: v.magnitude()),
+            ('vector.angle', n, lambda: v.angle(w)),
+            ('vector.unit', n, lambda: v.unit()),
+        ]
+    if n == 3:
+        cases.append(('vector.cross', n, lambda: v.cross(w)))
+    return cases
+
+
+def matrix_cases(a, b, v, full):
+    """
+    Returns (name, work, function) for every Matrix benchmark, where 'work'
+    is the number of numbers, or for products multiply-adds, processed.
+    In-place operations work on a copy of 'a' as for vector_cases().  The
+    structure checks are given Matrices which have the structure, so they
+    read every number rather than stopping at the first which does not fit.
+    """
+    n = a.rows
+    t = b.transpose()
+    c = a.scale(1)
+    zero = b.scale(0)
+    identity = a.identity()
+    ones = Matrix([Vector([a[0][0] * 0 + 1] * n)] * n)
+    symmetric = a + a.transpose()
+    hermitian = a + a.ht()
+    diagonal = a.hadamard(identity)
+    p = q = None
+    if n >= 3:
+        # Stacks of n 3D Vectors, for the cross products
+        p, q = [Matrix([Vector(row.elements[:3]) for row in m.row_list])
+                for m in (a, b)]
+    cases = [
+        ('matrix.add', n * n, lambda: a + b),
+        ('matrix.add_transpose', n * n, lambda: a + t),
+        ('matrix.subtract', n * n, lambda: a - b),
+        ('matrix.scale', n * n, lambda: a.scale(3)),
+        ('matrix.hadamard', n * n, lambda: a.hadamard(b)),
+        ('matrix.equal', n * n, lambda: a == b),
+        ('matrix.transpose', n * n, lambda: a.transpose()._flat()),
+        ('matrix.ht', n * n, lambda: a.ht()._flat()),
+        ('matrix.diagonal', n, lambda: a.diagonal()),
+        ('matrix.trace', n, lambda: a.trace()),
+        ('matrix.matvec', n * n, lambda: a * v),
+        ('matrix.shift', n, lambda: a.shift(3)),
+        ('matrix.identity', n * n, lambda: a.identity()),
+        ('matrix.rowwise_dot', n * n, lambda: a.rowwise_dot(b)),
+        ('matrix.is_symmetric', n * n, lambda: symmetric.is_symmetric()),
+        ('matrix.is_hermitian', n * n, lambda: hermitian.is_hermitian()),
+        ('matrix.is_diagonal', n * n, lambda: diagonal.is_diagonal()),
+        ('matrix.is_upper_triangular', n * n,
+         lambda: diagonal.is_upper_triangular()),
+        ('matrix.is_lower_triangular', n * n,
+         lambda: diagonal.is_lower_triangular()),
+        ('matrix.iadd', n * n, lambda: c.__iadd__(zero)),
+        ('matrix.isub', n * n, lambda: c.__isub__(zero)),
+        ('matrix.imul', n * n, lambda: c.__imul__(1)),
+        ('matrix.scale_', n * n, lambda: c.scale_(1)),
+        ('matrix.hadamard_', n * n, lambda: c.hadamard_(ones)),
+        ('matrix.add_out', n * n, lambda: a.add(b, out=c)),
+        ('matrix.subtract_out', n * n, lambda: a.subtract(b, out=c)),
+        ('matrix.scale_out', n * n, lambda: a.scale(3, out=c)),
+        ('matrix.hadamard_out', n * n, lambda: a.hadamard(b, out=c)),
+    ]
+    if a._kind < _COMPLEX:
+        # Magnitudes are only defined here for real rows
+        cases += [
+            ('matrix.rowwise_norm', n * n, lambda: a.rowwise_norm()),
+            ('matrix.rowwise_angle', n * n, lambda: a.rowwise_angle(b)),
+        ]
+    if p is not None:
+        # Where Vector.cross only has n = 3, this shows how it scales
+        cases.append(('matrix.rowwise_cross', 3 * n,
+                      lambda: p.rowwise_cross(q)))
+    if full or n <= PRODUCT_LIMIT:
+        cases += [
+            ('matrix.multiply', n ** 3, lambda: a * b),
+            ('matrix.imul_matrix', n ** 3, lambda: c.__imul__(identity)),
+            ('matrix.multiply_out', n ** 3, lambda: a.multiply(b, out=c)),
+        ]
+    return cases
+
+
+def measure(name, element_type, size, work, function, repeats, window):
+    """
+    Times one benchmark and returns its result record.  'seconds' is the
+    fastest time and 'spread' how much slower, as a fraction of it, the
+    median time was, which is how noisy the timing is.
+    """
+    times = sorted(timings(function, repeats, window))
+    seconds = times[0]
+    spread = times[len(times) // 2] / seconds - 1
+    peak = peak_memory(function)
+    return {'name': name, 'type': element_type, 'size': size,
+            'seconds': seconds, 'spread': spread,
+            'throughput': work / seconds, 'peak_bytes': peak}
+
+
+def run(vector_sizes=VECTOR_SIZES, matrix_sizes=MATRIX_SIZES, types=TYPES,
+        full=False, repeats=5, window=WINDOW, seed=0, report=None):
+    """
+    Runs every benchmark and returns the list of result records.  'report'
+    is called with each record as it is made.
+    """
+    rng = Random(seed)
+    results = []
+    size = linear.CACHE_SIZE
+    # Derived values would be cached after the first call and never timed
+    linear.CACHE_SIZE = 0
+    try:
+        for element_type in types:
+            for n in vector_sizes:
+                v = Vector(numbers(rng, element_type, n))
+                w = Vector(numbers(rng, element_type, n))
+                m = Matrix([Vector(numbers(rng, element_type, n))
+                            for _ in range(n)])
+                for name, work, function in vector_cases(v, w, m):
+                    results.append(measure(name, element_type, n, work,
+                                           function, repeats, window))
+                    if report:
+                        report(results[-1])
+            for n in matrix_sizes:
+                a, b = [Matrix([Vector(numbers(rng, element_type, n))
+                                for _ in range(n)]) for _ in range(2)]
+                v = Vector(numbers(rng, element_type, n))
+                for name, work, function in matrix_cases(a, b, v, full):
+                    results.append(measure(name, element_type, n, work,
+                                           function, repeats, window))
+                    if report:
+                        report(results[-1])
+    finally:
+        linear.CACHE_SIZE = size
+    return results
+
+
+def environment():
+    """
+    Returns a description of where the benchmarks were run.
+    """
+    return {'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'backend': linear.get_backend().name,
+            'date': datetime.now(timezone.utc).isoformat()}
+
+
+def compare(baseline, current, threshold=THRESHOLD):
+    """
+    Compares two lists of result records.  Returns (key, baseline seconds,
+    current seconds, ratio, regressed) for each benchmark found in both.
+    A regression is a ratio above 1 + 'threshold' which is also larger
+    than the noise, the spread, measured in both runs.
+    """
+    def key(record):
+        return record['name'], record['type'], record['size']
+
+    old = {key(r): r for r in baseline}
+    rows = []
+    for record in current:
+        k = key(record)
+        if k not in old:
+            continue
+        before, after = old[k]['seconds'], record['seconds']
+        ratio = after / before
+        noise = old[k].get('spread', 0) + record.get('spread', 0)
+        rows.append((k, before, after, ratio,
+                     ratio > 1 + max(threshold, noise)))
+    return rows
+
+
+def print_record(record):
+    print("{:<28} {:<8} {:>6} {:>12.2f} {:>14.4g} {:>12}".format(
+        record['name'], record['type'], record['size'],
+        record['seconds'] * 1e6, record['throughput'],
+        record['peak_bytes']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1],
+                                     prog='benchmark.py')
+    commands = parser.add_subparsers(dest='command', required=True)
+    runner = commands.add_parser('run', help='run the benchmarks')
+    runner.add_argument('--output', help='write the results to this file')
+    runner.add_argument('--quick', action='store_true',
+                        help='only the smaller sizes')
+    runner.add_argument('--full', action='store_true',
+                        help='time products at every size')
+    runner.add_argument('--types', nargs='+', choices=TYPES, default=TYPES)
+    runner.add_argument('--backend', help='compute backend to benchmark')
+    runner.add_argument('--repeats', type=int, default=5)
+    comparer = commands.add_parser('compare',
+                                   help='compare results with a baseline')
+    comparer.add_argument('baseline')
+    comparer.add_argument('current')
+    comparer.add_argument('--threshold', type=float, default=THRESHOLD,
+                          help='fraction slower which counts as a '
+                               'regression')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        if args.backend:
+            linear.set_backend(args.backend)
+        print("{:<28} {:<8} {:>6} {:>12} {:>14} {:>12}".format(
+            'benchmark', 'type', 'n', 'us/call', 'numbers/s', 'peak bytes'))
+        sizes = ((QUICK_VECTOR_SIZES, QUICK_MATRIX_SIZES) if args.quick
+                 else (VECTOR_SIZES, MATRIX_SIZES))
+        results = run(*sizes, types=args.types, full=args.full,
+                      repeats=args.repeats, report=print_record)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump({'environment': environment(), 'results': results},
+                          f, indent=1)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    with open(args.current) as f:
+        current = json.load(f)['results']
+    rows = compare(baseline, current, args.threshold)
+    print("{:<28} {:<8} {:>6} {:>12} {:>12} {:>8}".format(
+        'benchmark', 'type', 'n', 'before us', 'after us', 'ratio'))
+    regressions = 0
+    for (name, element_type, size), before, after, ratio, regressed in rows:
+        regressions += regressed
+        print("{:<28} {:<8} {:>6} {:>12.2f} {:>12.2f} {:>8.2f}{}".format(
+            name, element_type, size, before * 1e6, after * 1e6, ratio,
+            '  REGRESSION' if regressed else ''))
+    print("{} of {} benchmarks regressed by more than {:.0%}".format(
+        regressions, len(rows), args.threshold))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
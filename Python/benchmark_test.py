@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+import benchmark
+
+
+# unittest requires CamelCase
+class TestBenchmark(unittest.TestCase):
+    def test_run(self):
+        results = benchmark.run((3,), (3,), types=('int', 'complex'),
+                                repeats=1, window=0)
+        names = {r['name'] for r in results}
+        for name in ('vector.cross', 'vector.iadd', 'vector.scale_out',
+                     'matrix.multiply', 'matrix.shift', 'matrix.identity',
+                     'matrix.rowwise_cross', 'matrix.is_hermitian',
+                     'matrix.hadamard_', 'matrix.multiply_out'):
+            self.assertIn(name, names)
+        self.assertEqual({r['type'] for r in results}, {'int', 'complex'})
+        for r in results:
+            self.assertGreater(r['seconds'], 0)
+            self.assertGreater(r['throughput'], 0)
+            self.assertGreaterEqual(r['peak_bytes'], 0)
+
+
+    def test_peak_memory(self):
+        # Verify that tracing started elsewhere is left running
+        tracemalloc.start()
+        try:
+            peak = benchmark.peak_memory(lambda: bytearray(100000))
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+        self.assertGreaterEqual(peak, 100000)
+        self.assertGreaterEqual(benchmark.peak_memory(
+            lambda: bytearray(100000)), 100000)
+        self.assertFalse(tracemalloc.is_tracing())
+
+
+    def test_compare(self):
+        baseline = [{'name': 'vector.add', 'type': 'int', 'size': 2,
+                     'seconds': 1.0},
+                    {'name': 'vector.dot', 'type': 'int', 'size': 2,
+                     'seconds': 1.0}]
+        current = [{'name': 'vector.add', 'type': 'int', 'size': 2,
+                    'seconds': 1.05},
+                   {'name': 'vector.dot', 'type': 'int', 'size': 2,
+                    'seconds': 1.5},
+                   {'name': 'vector.dot', 'type': 'int', 'size': 16,
+                    'seconds': 1.0}]
+        rows = benchmark.compare(baseline, current)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual([r[4] for r in rows], [False, True])
+        self.assertFalse(benchmark.compare(baseline, current, 0.6)[1][4])
+
+        # Verify that the compare command fails only on a regression
+        with tempfile.TemporaryDirectory() as folder:
+            paths = []
+            for name, results in (('old', baseline), ('new', current)):
+                paths.append(os.path.join(folder, name + '.json'))
+                with open(paths[-1], 'w') as f:
+                    json.dump({'results': results}, f)
+            self.assertEqual(benchmark.main(['compare'] + paths), 1)
+            self.assertEqual(benchmark.main(['compare', paths[0],
+                                             paths[0]]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
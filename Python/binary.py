@@ -0,0 +1,189 @@
+"""
+Compact binary files for Matrices and Vectors.
+
+A file starts with a 32 byte header giving the shape and the type of the
+numbers, followed by the numbers themselves, row-major and little-endian:
+
+    magic      4 bytes   b'LINR'
+    version    1 byte    1
+    dimensions 1 byte    1 for a Vector, 2 for a Matrix
+    dtype      1 byte    b'q' int64, b'd' float64 or b'D' complex128
+    padding    9 bytes
+    rows       8 bytes   1 for a Vector
+    columns    8 bytes
+
+Complex numbers are stored as every real part followed by every imaginary
+part, the same split layout a Vector or Matrix keeps them in, so both parts
+can be mapped straight into storage.
+
+load() can memory-map the file instead of reading it.  The Matrix is then
+backed by the mapping itself: nothing is read until it is used, and row
+access or multiplying by a Vector only brings in the pages of the rows it
+touches.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+
+from linear import Matrix, Vector, _INT, _FLOAT, _COMPLEX
+
+
+MAGIC = b'LINR'
+VERSION = 1
+
+# magic, version, dimensions, dtype, rows, columns
+HEADER = struct.Struct('<4sBBc9xQQ')
+
+DTYPES = {_INT: b'q', _FLOAT: b'd', _COMPLEX: b'D'}
+KINDS = {dtype: kind for kind, dtype in DTYPES.items()}
+
+# Memory map modes, as for numpy.load(): read-only, copy-on-write, or
+# written through to the file.
+MODES = {'r': mmap.ACCESS_READ, 'c': mmap.ACCESS_COPY,
+         'r+': mmap.ACCESS_WRITE}
+
+
+@contextmanager
+def _opened(file, mode):
+    """
+    Yields 'file' if it is already an open file, otherwise opens the path
+    'file' in 'mode' and closes it afterwards.
+    """
+    if hasattr(file, 'read') or hasattr(file, 'write'):
+        yield file
+        return
+    with open(file, mode) as f:
+        yield f
+
+
+def _little(buf, typecode):
+    """
+    Returns storage buffer 'buf' in little-endian byte order.
+    """
+    if sys.byteorder == 'little':
+        return buf
+    buf = array(typecode, buf)
+    buf.byteswap()
+    return buf
+
+
+def save(x, file):
+    """
+    Writes Matrix or Vector 'x' to 'file', a path or a binary file open for
+    writing.  Raises TypeError for anything else, or if 'x' holds numbers
+    other than int, float or complex.
+    """
+    if isinstance(x, Matrix):
+        re, im, kind = x._flat()
+        header = (2, x.rows, x.columns)
+    elif isinstance(x, Vector):
+        re, im, kind = x._re, x._im, x._kind
+        header = (1, 1, x.dimension)
+    else:
+        raise TypeError("Can only save a Matrix or a Vector")
+    if kind not in DTYPES:
+        raise TypeError("Can only save int, float or complex numbers")
+    dimensions, rows, columns = header
+    typecode = 'q' if kind == _INT else 'd'
+    if isinstance(re, memoryview) and not re.c_contiguous:
+        # A column of a Matrix is a strided view, gathered before writing
+        re = array(typecode, re)
+        if im is not None:
+            im = array('d', im)
+    with _opened(file, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, dimensions, DTYPES[kind], rows,
+                            columns))
+        f.write(_little(re, typecode))
+        if im is not None:
+            f.write(_little(im, typecode))
+
+
+def _header(data):
+    """
+    Unpacks the header at the start of 'data' and returns (dimensions,
+    kind, rows, columns).  Raises ValueError if it is not a valid header.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("File is too short to hold a Matrix")
+    magic, version, dimensions, dtype, rows, columns = HEADER.unpack_from(
+        data)
+    if magic != MAGIC:
+        raise ValueError("Not a Matrix file")
+    if version != VERSION:
+        raise ValueError("Unsupported Matrix file version {}".format(version))
+    if dimensions not in (1, 2) or dtype not in KINDS:
+        raise ValueError("Corrupt Matrix file header")
+    return dimensions, KINDS[dtype], rows, columns
+
+
+def _build(dimensions, re, im, kind, rows, columns):
+    if dimensions == 1:
+        return Vector._adopt(re, im, kind)
+    return Matrix._adopt(re, im, kind, rows, columns)
+
+
+def load(file, mmap_mode=None):
+    """
+    Reads a Matrix or Vector written by save() from 'file', a path or a
+    binary file open for reading.  With 'mmap_mode' of 'r', 'c' or 'r+' the
+    file is memory-mapped rather than read: read-only, with changes kept
+    private to this process, or with changes written to the file.  Raises
+    ValueError if the file is not a valid Matrix file.
+    """
+    if mmap_mode is not None and mmap_mode not in MODES:
+        raise ValueError("mmap_mode must be one of 'r', 'c' or 'r+'")
+    with _opened(file, 'r+b' if mmap_mode == 'r+' else 'rb') as f:
+        if mmap_mode is not None:
+            return _mapped(f, MODES[mmap_mode])
+        dimensions, kind, rows, columns = _header(f.read(HEADER.size))
+        typecode = 'q' if kind == _INT else 'd'
+        count = rows * columns
+        try:
+            re = array(typecode)
+            re.fromfile(f, count)
+            im = None
+            if kind == _COMPLEX:
+                im = array('d')
+                im.fromfile(f, count)
+        except EOFError:
+            raise ValueError("Matrix file is truncated")
+        if sys.byteorder != 'little':
+            re.byteswap()
+            if im is not None:
+                im.byteswap()
+    return _build(dimensions, re, im, kind, rows, columns)
+
+
+def _mapped(f, access):
+    """
+    Memory-maps open file 'f' with 'access' and returns the Matrix or
+    Vector it holds, backed by the mapping.
+    """
+    if sys.byteorder != 'little':
+        raise ValueError("Matrix files can only be memory-mapped on "
+                         "little-endian machines")
+    mapping = mmap.mmap(f.fileno(), 0, access=access)
+    view = memoryview(mapping)
+    re = im = None
+    try:
+        dimensions, kind, rows, columns = _header(view)
+        typecode = 'q' if kind == _INT else 'd'
+        size = 8 * rows * columns
+        planes = 2 if kind == _COMPLEX else 1
+        if len(view) < HEADER.size + planes * size:
+            raise ValueError("Matrix file is truncated")
+        start = HEADER.size
+        re = view[start:start + size].cast(typecode)
+        if kind == _COMPLEX:
+            im = view[start + size:start + 2 * size].cast('d')
+        return _build(dimensions, re, im, kind, rows, columns)
+    except Exception:
+        # Nothing holds on to the mapping, so close it rather than leave it
+        # open until it is collected
+        for buf in (im, re, view):
+            if buf is not None:
+                buf.release()
+        mapping.close()
+        raise
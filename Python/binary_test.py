@@ -0,0 +1,109 @@
+import io
+import mmap
+import os
+import tempfile
+import unittest
+from unittest import mock
+from fractions import Fraction
+from linear import Vector, Matrix
+from binary import HEADER, save, load
+from testutil import storage
+
+
+# unittest requires CamelCase
+class TestBinary(unittest.TestCase):
+    def setUp(self):
+        self.m1 = Matrix([Vector([1, 2, 3]),
+                          Vector([4, 5, -2 ** 62])])
+        self.m2 = Matrix([Vector([0.5, -1.5, 2.25]),
+                          Vector([3.1, 0.7, -8.0])])
+        self.m3 = Matrix([Vector([1j, 2 - 1.5j, 3]),
+                          Vector([-4.2, 5j, 6 + 0.1j])])
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'matrix.bin')
+
+
+    def tearDown(self):
+        del self.m1
+        del self.m2
+        del self.m3
+        self.folder.cleanup()
+        del self.folder
+
+
+    def test_round_trip(self):
+        cases = (self.m1, self.m2, self.m3, self.m3.ht(), self.m1[1],
+                 Vector([1.5, 2j]), self.m1.transpose()[2],
+                 self.m3.transpose()[1], self.m3.ht()[0])
+        for x in cases:
+            for mode in (None, 'r', 'c', 'r+'):
+                with self.subTest(x=str(x), mode=mode):
+                    save(x, self.path)
+                    y = load(self.path, mode)
+                    self.assertIs(type(y), type(x))
+                    self.assertEqual(storage(y), storage(x))
+        buf = io.BytesIO()
+        save(self.m2, buf)
+        self.assertEqual(len(buf.getvalue()), HEADER.size + 6 * 8)
+        buf.seek(0)
+        self.assertEqual(storage(load(buf)), storage(self.m2))
+
+
+    def test_mapped(self):
+        save(self.m2, self.path)
+        m = load(self.path, 'r')
+        self.assertIsInstance(m._re, memoryview)
+        self.assertEqual(m * Vector([1, 0, 1]), self.m2 * Vector([1, 0, 1]))
+        self.assertEqual(m[1], self.m2[1])
+        self.assertRaises(TypeError, m.scale_, 2)
+        # Private changes stay in memory
+        m = load(self.path, 'c')
+        m.scale_(2)
+        self.assertEqual(m, self.m2.scale(2))
+        self.assertEqual(load(self.path), self.m2)
+        # Shared changes go to the file
+        m = load(self.path, 'r+')
+        m[0] = Vector([1.0, 2.0, 3.0])
+        del m
+        self.assertEqual(load(self.path)[0], Vector([1.0, 2.0, 3.0]))
+
+
+    def test_errors(self):
+        self.assertRaises(TypeError, save, [1, 2], self.path)
+        self.assertRaises(TypeError, save, Vector([Fraction(1, 2), 1]),
+                          self.path)
+        bad_version = HEADER.pack(b'LINR', 9, 2, b'd', 1, 2)
+        for data in (b'', b'NOPE' + bytes(28), bad_version):
+            with open(self.path, 'wb') as f:
+                f.write(data)
+            with self.subTest(data=data):
+                self.assertRaises(ValueError, load, self.path)
+        save(self.m3, self.path)
+        with open(self.path, 'r+b') as f:
+            f.truncate(HEADER.size + 8 * 8)
+        self.assertRaises(ValueError, load, self.path)
+        self.assertRaises(ValueError, load, self.path, 'r')
+        self.assertRaises(ValueError, load, self.path, 'w')
+
+        # Verify that a mapping which turns out not to hold a Matrix is
+        # closed
+        with open(self.path, 'rb') as f:
+            truncated = f.read()
+        mappings = []
+        real = mmap.mmap
+
+        def mapped(*args, **kwargs):
+            mappings.append(real(*args, **kwargs))
+            return mappings[-1]
+
+        with mock.patch('mmap.mmap', mapped):
+            for data in (b'NOPE' + bytes(28), truncated):
+                with open(self.path, 'wb') as f:
+                    f.write(data)
+                self.assertRaises(ValueError, load, self.path, 'r')
+        self.assertEqual(len(mappings), 2)
+        self.assertTrue(all(m.closed for m in mappings))
+
+
+if __name__ == "__main__":
+    unittest.main()
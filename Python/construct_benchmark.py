@@ -0,0 +1,48 @@
+"""
+Times how much each Vector operation saves by building its result with the
+trusted Vector._adopt() instead of the public Vector constructor.
+
+The public constructor copies its input and checks that every element is a
+number.  Results of arithmetic are known to be numbers already, so they are
+packed straight into storage instead.  For each size this prints the time
+taken by the public and the trusted constructor, the difference between
+them, which is what every operation saves, and the time each operation now
+takes.
+
+Usage:  python construct_benchmark.py [size ...]
+"""
+import sys
+from benchmark import best_time
+from linear import Matrix, RandomVector, Vector, _FLOAT, _pack
+
+
+SIZES = (3, 10, 100, 1000, 10000)
+
+
+def compare(sizes):
+    """
+    Prints constructor and operation timings, in microseconds, for Vectors
+    of each size in 'sizes'.
+    """
+    print("{:>6} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10}".format(
+        'n', 'public', 'trusted', 'saved', 'v + w', 'scale', 'v * m'))
+    for n in sizes:
+        v = RandomVector(n, 'float')
+        w = RandomVector(n, 'float')
+        m = Matrix([RandomVector(n, 'float') for _ in range(min(n, 100))])
+        u = RandomVector(m.rows, 'float')
+        values = v.elements
+        public = best_time(lambda: Vector(values))
+        trusted = best_time(lambda: Vector._adopt(*_pack(values, _FLOAT)))
+        add = best_time(lambda: v + w)
+        scale = best_time(lambda: v.scale(2.0))
+        vecmat = best_time(lambda: u * m)
+        print("{:>6} {:>10.2f} {:>10.2f} {:>10.2f} {:>10.2f} {:>10.2f} "
+              "{:>10.2f}".format(n, public * 1e6, trusted * 1e6,
+                                 (public - trusted) * 1e6, add * 1e6,
+                                 scale * 1e6, vecmat * 1e6))
+
+
+if __name__ == "__main__":
+    sizes = [int(s) for s in sys.argv[1:]] or SIZES
+    compare(sizes)
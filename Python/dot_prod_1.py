@@ -16,7 +16,7 @@ dot product results so I'm just putting them into a list.
 from random import seed
 from random import gauss
 from random import randint
-from linear import Vector
+from linear import Vector, Matrix
 
 
 NUMBER_VECTORS = 6
@@ -31,10 +31,10 @@ def gen_matrix():
         for value in range(NUMBER_VALUES):
             elements.append(10 * gauss(0, 1))
         matrix.append(Vector(elements))
-    return matrix
+    return Matrix(matrix)
 
 
 m1 = gen_matrix()
 m2 = gen_matrix()
 
-print([m1[v] @ m2[v] for v in range(NUMBER_VECTORS)])
+print(m1.rowwise_dot(m2).elements)
@@ -16,7 +16,7 @@ which order the dot products were done in.
 from random import seed
 from random import gauss
 from random import randint
-from linear import Vector
+from linear import Vector, Matrix
 
 
 NUMBER_VECTORS = 6
@@ -31,12 +31,12 @@ def gen_matrix():
         for value in range(NUMBER_VALUES):
             elements.append(10 * gauss(0, 1))
         matrix.append(Vector(elements))
-    return matrix
+    return Matrix(matrix)
 
 
 m1 = gen_matrix()
 m2 = gen_matrix()
 
-v1 = Vector([m1[v] @ m2[v] for v in range(NUMBER_VECTORS)])
-v2 = Vector([m2[v] @ m1[v] for v in range(NUMBER_VECTORS)])
+v1 = m1.rowwise_dot(m2)
+v2 = m2.rowwise_dot(m1)
 print(v2 - v1)
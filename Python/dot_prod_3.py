@@ -16,7 +16,7 @@ change.  If only one Vector is scaled then polarity WILL change if that scale
 is negative but will NOT change if that scale is positive.
 """
 from random import seed, gauss, randint
-from linear import Vector
+from linear import Vector, Matrix
 
 NUMBER_VECTORS = 6
 NUMBER_VALUES = 3
@@ -31,19 +31,16 @@ def gen_matrix():
         for value in range(NUMBER_VALUES):
             elements.append(10 * gauss(0, 1))
         matrix.append(Vector(elements))
-    return matrix
+    return Matrix(matrix)
 
 
 def scale_matrix(matrix, k):
     """
-    The 'matrix' input is really a list of Vectors.
+    The 'matrix' input is a Matrix whose rows are the Vectors.
     This scales each Vector by the constant 'k' and puts the new Vector
     into a new matrix.  The new matrix is returned.
     """
-    new_matrix = []
-    for v in range(NUMBER_VECTORS):
-        new_matrix.append(matrix[v].scale(k))
-    return new_matrix
+    return matrix.scale(k)
 
 
 def list_of_signs(base_dot_prods):
@@ -63,9 +60,9 @@ def test(scale):
     m3 = scale_matrix(m1, scale)
     m4 = scale_matrix(m2, scale)
 
-    base_dot_prods = [m1[v] @ m2[v] for v in range(NUMBER_VECTORS)]
-    scaled_dot_prods = [m3[v] @ m4[v] for v in range(NUMBER_VECTORS)]
-    mixed_dot_prods = [m1[v] @ m4[v] for v in range(NUMBER_VECTORS)]
+    base_dot_prods = m1.rowwise_dot(m2).elements
+    scaled_dot_prods = m3.rowwise_dot(m4).elements
+    mixed_dot_prods = m1.rowwise_dot(m4).elements
 
     msg = "Scaling two Vectors by {} does not change the sign of their" + \
           " resulting dot product: {}"
@@ -0,0 +1,277 @@
+"""
+Opt-in instrumentation of the Vector and Matrix operations in linear.py.
+
+Inside an instrument() block every Vector and Matrix operation is recorded:
+how often it was called, the shapes it was called with, the wall time it
+took, an estimate of the floating point operations it did and how many
+Vectors and Matrices it allocated:
+
+    with instrument() as profile:
+        run_the_model()
+    print(profile)
+    profile.to_json()
+
+Only the outermost operation is recorded, so m1 + m2 counts as one
+Matrix.__add__ whose time and allocations include everything it called on
+the way.  The operations are wrapped when the block starts and the
+originals put back when it ends, so outside a block nothing at all is
+added to their cost.  The wrappers are installed for every thread, so
+only time one thread at a time.
+"""
+import json
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from numbers import Complex
+from time import perf_counter
+
+from linear import Matrix, RandomMatrix, RandomVector, Vector
+
+
+VECTOR_OPERATIONS = (
+    '__add__', '__sub__', '__mul__', '__matmul__', '__iadd__', '__isub__',
+    '__imul__', '__eq__', 'add', 'subtract', 'scale', 'scale_', 'magnitude',
+    'angle', 'unit', 'cross')
+
+MATRIX_OPERATIONS = (
+    '__add__', '__sub__', '__mul__', '__iadd__', '__isub__', '__imul__',
+    '__eq__', 'add', 'subtract', 'hadamard', 'hadamard_', 'scale', 'scale_',
+    'multiply', 'transpose', 'ht', 'diagonal', 'trace', 'shift', 'identity',
+    'rowwise_dot', 'rowwise_norm', 'rowwise_angle', 'rowwise_cross',
+    'is_symmetric', 'is_hermitian', 'is_diagonal', 'is_upper_triangular',
+    'is_lower_triangular')
+
+# Builders of new Vectors and Matrices, which count allocations
+CONSTRUCTORS = ((Vector, '__init__'), (Vector, '_adopt'),
+                (RandomVector, '__init__'), (Matrix, '__init__'),
+                (Matrix, '_adopt'), (RandomMatrix, '__init__'))
+
+
+def _size(x):
+    """
+    Returns how many numbers Vector or Matrix 'x' holds, or 1 for anything
+    else.
+    """
+    if isinstance(x, Vector):
+        return x.dimension
+    if isinstance(x, Matrix):
+        return x.rows * x.columns
+    return 1
+
+
+def _shape(x):
+    """
+    Describes the shape of an operand for the shape histogram.
+    """
+    if isinstance(x, Matrix):
+        return '{}x{}'.format(x.rows, x.columns)
+    if isinstance(x, Vector):
+        return str(x.dimension)
+    if isinstance(x, Complex):
+        return 'scalar'
+    return type(x).__name__
+
+
+def _product_flops(a, b):
+    """
+    Estimates the floating point operations of a * b, where 'a' is a Vector
+    or Matrix: two for every multiply-add, or one per number when scaling.
+    """
+    if isinstance(b, Complex):
+        return _size(a)
+    if isinstance(a, Vector) and isinstance(b, Vector):
+        return 2 * a.dimension
+    if isinstance(a, Matrix) and isinstance(b, Matrix):
+        return 2 * a.rows * a.columns * b.columns
+    return 2 * _size(a if isinstance(a, Matrix) else b)
+
+
+def _elementwise(a, *args):
+    return _size(a)
+
+
+def _product(a, b=None, *args):
+    return _product_flops(a, b)
+
+
+def _scale(a, k=None, *args):
+    if isinstance(a, Matrix) and isinstance(k, Matrix):
+        # Scaling by Matrix 'k' multiplies by its transpose, so the product
+        # has a column for every row of 'k'
+        return 2 * a.rows * a.columns * k.rows
+    return _product_flops(a, k)
+
+
+def _none(*args):
+    return 0
+
+
+# Estimated floating point operations of each operation, from its arguments
+FLOPS = {
+    '__add__': _elementwise, '__sub__': _elementwise,
+    '__iadd__': _elementwise, '__isub__': _elementwise,
+    'add': _elementwise, 'subtract': _elementwise,
+    'hadamard': _elementwise, 'hadamard_': _elementwise,
+    'scale': _scale, 'scale_': _scale,
+    '__mul__': _product, '__imul__': _product, 'multiply': _product,
+    '__matmul__': _product,
+    'magnitude': lambda v, *args: 2 * v.dimension,
+    'angle': lambda v, *args: 6 * v.dimension,
+    'unit': lambda v, *args: 3 * v.dimension,
+    'cross': lambda v, *args: 9,
+    'trace': lambda m, *args: m.rows,
+    'shift': lambda m, *args: m.rows,
+    'rowwise_dot': lambda m, *args: 2 * _size(m),
+    'rowwise_norm': lambda m, *args: 2 * _size(m),
+    'rowwise_angle': lambda m, *args: 6 * _size(m),
+    'rowwise_cross': lambda m, *args: 9 * m.rows,
+}
+
+
+class Profile(object):
+    """
+    A Profile collects what happened to Vectors and Matrices inside an
+    instrument() block.  'operations' maps the name of each operation to
+    its statistics and 'allocations' counts the Vectors and Matrices built,
+    by type.
+    """
+
+    def __init__(self):
+        self.operations = {}
+        self.allocations = Counter()
+        self._depth = 0
+        self._current = None
+
+    def _stats(self, name):
+        try:
+            return self.operations[name]
+        except KeyError:
+            stats = self.operations[name] = {
+                'calls': 0, 'seconds': 0.0, 'flops': 0, 'allocations': 0,
+                'shapes': Counter()}
+            return stats
+
+    def _record(self, stats, flops, args, seconds):
+        """
+        Adds one call of an operation with 'args' to its 'stats'.
+        """
+        stats['calls'] += 1
+        stats['seconds'] += seconds
+        stats['shapes'][', '.join(map(_shape, args))] += 1
+        try:
+            stats['flops'] += flops(*args)
+        except (AttributeError, TypeError):
+            # Bad arguments raise in the operation itself
+            pass
+
+    def _allocated(self, cls):
+        """
+        Counts a new object of 'cls', charging it to the operation running.
+        """
+        self.allocations[cls.__name__] += 1
+        if self._current is not None:
+            self._current['allocations'] += 1
+
+    def as_dict(self):
+        """
+        Returns everything recorded as plain dicts, lists and numbers.
+        """
+        return {'operations': {name: dict(stats, shapes=dict(stats['shapes']))
+                               for name, stats in self.operations.items()},
+                'allocations': dict(self.allocations)}
+
+    def to_json(self, indent=1):
+        """
+        Returns everything recorded as a JSON document.
+        """
+        return json.dumps(self.as_dict(), indent=indent)
+
+    def __str__(self):
+        string = "{:<28} {:>8} {:>12} {:>14} {:>8}\n".format(
+            'operation', 'calls', 'seconds', 'flops', 'allocs')
+        ranked = sorted(self.operations.items(),
+                        key=lambda item: item[1]['seconds'], reverse=True)
+        for name, stats in ranked:
+            string += "{:<28} {:>8} {:>12.6f} {:>14} {:>8}\n".format(
+                name, stats['calls'], stats['seconds'], stats['flops'],
+                stats['allocations'])
+        return string
+
+
+def _timed(profile, name, original, flops):
+    """
+    Wraps operation 'original' so that calls made outside any other
+    recorded operation are recorded in 'profile'.
+    """
+    @wraps(original)
+    def wrapper(*args, **kwargs):
+        if profile._depth:
+            return original(*args, **kwargs)
+        stats = profile._stats(name)
+        profile._depth += 1
+        profile._current = stats
+        start = perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            seconds = perf_counter() - start
+            profile._depth -= 1
+            profile._current = None
+            profile._record(stats, flops, args, seconds)
+    return wrapper
+
+
+def _counted(profile, cls, name, original):
+    """
+    Wraps constructor 'original' of 'cls' so each object it builds is
+    counted in 'profile'.
+    """
+    if isinstance(original, classmethod):
+        function = original.__func__
+
+        @wraps(function)
+        def build(klass, *args, **kwargs):
+            profile._allocated(klass)
+            return function(klass, *args, **kwargs)
+        return classmethod(build)
+
+    @wraps(original)
+    def init(self, *args, **kwargs):
+        if type(self) is cls:
+            profile._allocated(cls)
+        return original(self, *args, **kwargs)
+    return init
+
+
+_ACTIVE = []
+
+
+@contextmanager
+def instrument():
+    """
+    Records every Vector and Matrix operation inside a with block and
+    yields the Profile they are recorded in.  Blocks cannot be nested.
+    """
+    if _ACTIVE:
+        raise RuntimeError("Instrumentation is already running")
+    profile = Profile()
+    saved = []
+    for cls, names in ((Vector, VECTOR_OPERATIONS),
+                       (Matrix, MATRIX_OPERATIONS)):
+        for name in names:
+            original = cls.__dict__[name]
+            saved.append((cls, name, original))
+            setattr(cls, name, _timed(profile,
+                                      '{}.{}'.format(cls.__name__, name),
+                                      original, FLOPS.get(name, _none)))
+    for cls, name in CONSTRUCTORS:
+        original = cls.__dict__[name]
+        saved.append((cls, name, original))
+        setattr(cls, name, _counted(profile, cls, name, original))
+    _ACTIVE.append(profile)
+    try:
+        yield profile
+    finally:
+        for cls, name, original in reversed(saved):
+            setattr(cls, name, original)
+        _ACTIVE.pop()
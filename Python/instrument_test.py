@@ -0,0 +1,91 @@
+import json
+import unittest
+from linear import Vector, Matrix, RandomVector
+from instrument import instrument
+
+
+# unittest requires CamelCase
+class TestInstrument(unittest.TestCase):
+    def setUp(self):
+        self.m1 = Matrix([Vector([1, 2, 3]),
+                          Vector([4, 5, 6])])
+        self.m2 = Matrix([Vector([1, 2]),
+                          Vector([3, 4]),
+                          Vector([5, 6])])
+        self.v1 = Vector([1, 2, 3])
+
+
+    def tearDown(self):
+        del self.m1
+        del self.m2
+        del self.v1
+
+
+    def test_operations(self):
+        m1, m2, v1 = self.m1, self.m2, self.v1
+        with instrument() as profile:
+            m1 * m2
+            m1 * m2
+            m1 * v1
+            v1 + v1
+            m1.scale(2)
+        stats = profile.operations['Matrix.__mul__']
+        self.assertEqual(stats['calls'], 3)
+        self.assertEqual(dict(stats['shapes']), {'2x3, 3x2': 2, '2x3, 3': 1})
+        # Two 2x3 by 3x2 products and one 2x3 by 3 product
+        self.assertEqual(stats['flops'], 2 * 24 + 12)
+        self.assertEqual(stats['allocations'], 3)
+        self.assertGreater(stats['seconds'], 0)
+        self.assertEqual(profile.operations['Vector.__add__']['flops'], 3)
+        # Nested calls are part of the outer operation
+        self.assertNotIn('Vector.add', profile.operations)
+        self.assertEqual(profile.operations['Matrix.scale']['calls'], 1)
+
+        # Scaling a 2x3 Matrix by a 4x3 Matrix is a 2x3 by 3x4 product
+        k = Matrix([v1, v1, v1, v1])
+        with instrument() as profile:
+            m1.scale(k)
+        self.assertEqual(profile.operations['Matrix.scale']['flops'],
+                         2 * 2 * 3 * 4)
+
+
+    def test_allocations(self):
+        with instrument() as profile:
+            Vector([1, 2])
+            RandomVector(3)
+            self.m1 + self.m1
+        self.assertEqual(profile.allocations['Vector'], 1)
+        self.assertEqual(profile.allocations['RandomVector'], 1)
+        self.assertEqual(profile.allocations['Matrix'], 1)
+        self.assertEqual(profile.operations['Matrix.__add__']['allocations'],
+                         1)
+
+
+    def test_disabled(self):
+        mul, adopt = Matrix.__mul__, Vector.__dict__['_adopt']
+        with instrument():
+            self.assertIsNot(Matrix.__mul__, mul)
+        self.assertIs(Matrix.__mul__, mul)
+        self.assertIs(Vector.__dict__['_adopt'], adopt)
+        with self.assertRaises(ZeroDivisionError):
+            with instrument():
+                1 / 0
+        self.assertIs(Matrix.__mul__, mul)
+        with instrument():
+            self.assertRaises(RuntimeError, instrument().__enter__)
+
+
+    def test_export(self):
+        with instrument() as profile:
+            self.m1.transpose()
+            self.assertRaises(IndexError, lambda: self.m1 * self.m1)
+        data = json.loads(profile.to_json())
+        self.assertEqual(data, profile.as_dict())
+        self.assertEqual(data['operations']['Matrix.__mul__']['calls'], 1)
+        self.assertEqual(data['operations']['Matrix.transpose']['shapes'],
+                         {'2x3': 1})
+        self.assertIn('Matrix.transpose', str(profile))
+
+
+if __name__ == "__main__":
+    unittest.main()
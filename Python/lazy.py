@@ -0,0 +1,496 @@
+"""
+Lazy evaluation of Matrix and Vector arithmetic for linear.py.
+
+Arithmetic on Matrices and Vectors is eager: m1.scale(k) + m2.scale(k)
+builds two scaled Matrices and then a third for their sum.  Wrapping the
+operands with lazy() makes the same operators build a tree describing the
+calculation instead, which is only worked out when evaluate() is called:
+
+    total = (lazy(m1).scale(k) + lazy(m2).scale(k)).evaluate()
+
+When it is evaluated:
+
+    - a chain of element by element operations (scale, +, -, hadamard and
+      transpose) is compiled into one loop which reads each operand once
+      and packs the numbers it works out straight into the storage of a
+      single new Matrix or Vector.  Transposes are pushed down onto the
+      operands, where they are free views, so nothing is ever transposed in
+      between.
+    - a chain of products such as a * b * c * v is multiplied in the order
+      which needs the fewest multiplications, which for a Matrix chain
+      ending in a Vector means never multiplying two Matrices at all.
+
+Element by element results are worked out with exactly the same arithmetic
+as the eager operations, so they are identical to eager results.  Products
+use the eager operators, and so the active backend, but reordering a chain
+sums floating point numbers in a different order, so those results agree
+with eager ones to the 6 decimal places Matrix equality uses.
+"""
+from array import array
+from itertools import chain
+from numbers import Complex
+
+from linear import Matrix, Vector, _COMPLEX, _kind_of, _pack
+
+
+# Compiled element by element kernels, by their source code, so repeated
+# evaluation of the same shape of expression compiles it only once.  Like
+# the caches of linear.py it holds at most KERNEL_CACHE_SIZE, and the
+# oldest makes way for a new one.
+KERNEL_CACHE_SIZE = 64
+_KERNELS = {}
+
+
+def lazy(x):
+    """
+    Wraps Matrix or Vector 'x' as an expression so that arithmetic on it is
+    put off until evaluate() is called.  Expressions are returned as is.
+    """
+    if isinstance(x, Expr):
+        return x
+    if isinstance(x, Matrix):
+        return Expr('leaf', (x,), (x.rows, x.columns))
+    if isinstance(x, Vector):
+        return Expr('leaf', (x,), (x.dimension,))
+    raise TypeError("Need a Matrix or Vector")
+
+
+def evaluate(x):
+    """
+    Works out expression 'x' and returns the resulting Matrix, Vector or,
+    for a dot product, number.  Anything which is not an expression is
+    returned as is.
+    """
+    if not isinstance(x, Expr):
+        return x
+    if x.op == 'leaf':
+        return x.args[0]
+    if x.op == 'product':
+        return _multiply_chain(x)
+    return _fuse(x)
+
+
+def _as_expr(x):
+    """
+    Returns 'x' as an expression if it is one, or a Matrix or Vector, and
+    None otherwise.
+    """
+    if isinstance(x, (Expr, Matrix, Vector)):
+        return lazy(x)
+    return None
+
+
+class Expr(object):
+    """
+    An Expr is one step of a Matrix or Vector calculation which has not
+    been worked out yet.  'op' names the step, 'args' holds the expressions
+    (and numbers) it works on and 'shape' is (rows, columns) for a Matrix,
+    (dimension,) for a Vector or () for a number.  Build them with lazy()
+    and the usual operators, then call evaluate().
+    """
+
+    __slots__ = ('op', 'args', 'shape')
+
+    def __init__(self, op, args, shape):
+        self.op = op
+        self.args = args
+        self.shape = shape
+
+    @property
+    def rows(self):
+        return self.shape[0]
+
+    @property
+    def columns(self):
+        return self.shape[1]
+
+    @property
+    def dimension(self):
+        return self.shape[0]
+
+    def _check_same_size(self, e, verb):
+        """
+        Raises an exception unless expression 'e' has the same shape as this
+        one, as the eager operation called 'verb' would.
+        """
+        if len(self.shape) != len(e.shape) or not self.shape:
+            raise TypeError("Other item must be a {}".format(
+                'Matrix' if len(self.shape) == 2 else 'Vector'))
+        if self.shape != e.shape:
+            if len(self.shape) == 1:
+                raise IndexError("Vectors must be same size.")
+            raise IndexError("Matrices must be same size to {}".format(verb))
+
+    def __add__(self, e):
+        e = _as_expr(e)
+        if e is None:
+            return NotImplemented
+        self._check_same_size(e, 'add')
+        return Expr('add', (self, e), self.shape)
+
+    def __radd__(self, e):
+        e = _as_expr(e)
+        if e is None:
+            return NotImplemented
+        return e.__add__(self)
+
+    def __sub__(self, e):
+        e = _as_expr(e)
+        if e is None:
+            return NotImplemented
+        self._check_same_size(e, 'subtract')
+        return Expr('sub', (self, e), self.shape)
+
+    def __rsub__(self, e):
+        e = _as_expr(e)
+        if e is None:
+            return NotImplemented
+        return e.__sub__(self)
+
+    def hadamard(self, e):
+        """
+        Element by element multiplication with Matrix expression 'e'.
+        """
+        e = _as_expr(e)
+        if e is None or len(self.shape) != 2:
+            raise TypeError("Other item must be a Matrix")
+        self._check_same_size(e, 'multiply')
+        return Expr('hadamard', (self, e), self.shape)
+
+    def scale(self, k):
+        """
+        Scales every element by the number 'k'.  As with Matrix.scale(), if
+        'k' is a Matrix this is multiplying by the transpose of 'k'.
+        """
+        if isinstance(k, (Expr, Matrix)):
+            return self * lazy(k).transpose()
+        if not isinstance(k, Complex):
+            raise TypeError('Scalar needs to be a number')
+        if not self.shape:
+            raise TypeError("Cannot scale a number lazily")
+        return Expr('scale', (self, k), self.shape)
+
+    def transpose(self):
+        """
+        The transpose of a Matrix expression.
+        """
+        if len(self.shape) != 2:
+            raise TypeError("Only a Matrix can be transposed")
+        rows, columns = self.shape
+        return Expr('transpose', (self,), (columns, rows))
+
+    def __mul__(self, e):
+        """
+        Use '*' operator for products with Matrix or Vector expressions, as
+        the eager '*' does, or to scale by a number.
+        """
+        if isinstance(e, Complex):
+            return self.scale(e)
+        e = _as_expr(e)
+        if e is None:
+            return NotImplemented
+        return Expr('product', (self, e), _product_shape(self.shape,
+                                                         e.shape))
+
+    def __rmul__(self, e):
+        if isinstance(e, Complex):
+            return self.scale(e)
+        e = _as_expr(e)
+        if e is None:
+            return NotImplemented
+        return e.__mul__(self)
+
+    def evaluate(self):
+        """
+        Works out this expression.  See evaluate().
+        """
+        return evaluate(self)
+
+
+def _product_shape(a, b):
+    """
+    Returns the shape of the product of expressions shaped 'a' and 'b', or
+    raises the exception the eager '*' operator would.
+    """
+    if not a or not b:
+        raise TypeError("Cannot multiply a number lazily")
+    if len(a) == 2 and len(b) == 2:
+        if a[1] != b[0]:
+            raise IndexError("Matrix is wrong size")
+        return (a[0], b[1])
+    if len(a) == 2:
+        if a[1] != b[0]:
+            raise IndexError("Vector is wrong size")
+        return (a[0],)
+    if len(b) == 2:
+        if a[0] != b[0]:
+            raise IndexError("Matrix is wrong size")
+        return (b[1],)
+    if a != b:
+        raise IndexError("Vectors must be same size")
+    return ()
+
+
+def _factors(e, left_end=True, right_end=True):
+    """
+    Flattens nested products into the list of expressions multiplied
+    together.  A Vector can only be the first or last factor of a chain, so
+    a product which would put one anywhere else is kept whole.
+    """
+    if e.op != 'product':
+        return [e]
+    a, b = e.args
+    if (len(a.shape) == 1 and not left_end or
+            len(b.shape) == 1 and not right_end):
+        return [e]
+    return (_factors(a, left_end, False) + _factors(b, False, right_end))
+
+
+def _chain_order(sizes):
+    """
+    Finds the cheapest order to multiply a chain of factors, where factor i
+    is sizes[i] by sizes[i + 1], by dynamic programming over every way of
+    splitting it.  Returns a table in which split[i][j] is the factor after
+    which the product of factors i to j should be split.
+    """
+    n = len(sizes) - 1
+    cost = [[0] * n for _ in range(n)]
+    split = [[0] * n for _ in range(n)]
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            j = i + length - 1
+            cost[i][j] = None
+            for s in range(i, j):
+                c = (cost[i][s] + cost[s + 1][j] +
+                     sizes[i] * sizes[s + 1] * sizes[j + 1])
+                if cost[i][j] is None or c < cost[i][j]:
+                    cost[i][j] = c
+                    split[i][j] = s
+    return split
+
+
+def _multiply_chain(e):
+    """
+    Evaluates product expression 'e' by multiplying its chain of factors in
+    the cheapest order.
+    """
+    factors = [evaluate(f) for f in _factors(e)]
+    sizes = []
+    for i, f in enumerate(factors):
+        if isinstance(f, Matrix):
+            sizes.append(f.rows)
+        else:
+            # A Vector is a row at the start of a chain, else a column
+            sizes.append(1 if i == 0 else f.dimension)
+    last = factors[-1]
+    sizes.append(last.columns if isinstance(last, Matrix) else 1)
+    split = _chain_order(sizes)
+
+    def product(i, j):
+        if i == j:
+            return factors[i]
+        s = split[i][j]
+        return product(i, s) * product(s + 1, j)
+
+    return product(0, len(factors) - 1)
+
+
+def _prepare(e, transposed=False):
+    """
+    Rewrites element by element expression 'e' so every transpose sits on
+    an operand, where it is a free view, and every product is worked out.
+    Returns the new expression, whose leaves are Matrices and Vectors.
+    """
+    if e.op == 'transpose':
+        return _prepare(e.args[0], not transposed)
+    if e.op in ('leaf', 'product'):
+        x = evaluate(e)
+        return Expr('leaf', (x.transpose() if transposed else x,), None)
+    if e.op == 'scale':
+        return Expr('scale', (_prepare(e.args[0], transposed), e.args[1]),
+                    None)
+    return Expr(e.op, tuple(_prepare(a, transposed) for a in e.args), None)
+
+
+class _Kernel(object):
+    """
+    Writes the source code of one loop which works out an element by
+    element expression, one statement per step.  The arithmetic of each
+    step copies the eager storage kernel for the same kind of numbers, so
+    the results are identical.
+    """
+
+    def __init__(self):
+        self.sources = []
+        self.constants = []
+        self.lines = []
+
+    def _source(self, numbers):
+        """
+        Adds a sequence of numbers the loop reads one at a time, and returns
+        the name each number goes by in the loop.
+        """
+        self.sources.append(numbers)
+        return 'v{}'.format(len(self.sources) - 1)
+
+    def _constant(self, k):
+        """
+        Adds a number the loop uses throughout and returns its name.
+        """
+        self.constants.append(k)
+        return 'k{}'.format(len(self.constants) - 1)
+
+    def _temp(self, code):
+        """
+        Adds a statement to the loop body and returns the name of its
+        result.
+        """
+        name = 't{}'.format(len(self.lines))
+        self.lines.append('{} = {}'.format(name, code))
+        return name
+
+    def visit(self, e):
+        """
+        Adds the steps of expression 'e' to the loop.  Returns (kind, real
+        part, imaginary part) naming its result.  The imaginary part is
+        None unless the kind is complex, in which case the numbers are
+        split into parts as they are in complex storage.
+        """
+        if e.op == 'leaf':
+            return self._leaf(e.args[0])
+        if e.op == 'scale':
+            return self._scale(self.visit(e.args[0]), e.args[1])
+        a, b = self.visit(e.args[0]), self.visit(e.args[1])
+        kind = max(a[0], b[0])
+        if e.op == 'hadamard':
+            return self._product(kind, a, b)
+        return self._combine(kind, a, b, '+' if e.op == 'add' else '-')
+
+    def _leaf(self, x):
+        kind = x._kind
+        if isinstance(x, Matrix) and (x._strides != (x.columns, 1) or
+                                      x._conj):
+            # Read views a row at a time rather than gathering a copy
+            rows = [x._row(i, kind) for i in range(x.rows)]
+            re = chain.from_iterable(r for r, _ in rows)
+            im = None
+            if x._im is not None:
+                im = chain.from_iterable(i for _, i in rows)
+        else:
+            re, im = x._re, x._im
+        if im is not None:
+            return kind, self._source(re), self._source(im)
+        return kind, self._source(re), None
+
+    def _value(self, part):
+        """
+        Returns code for the plain number held by a (kind, real, imaginary)
+        result, as _values() gives it.
+        """
+        _, re, im = part
+        if im is None:
+            return re
+        return 'complex({}, {})'.format(re, im)
+
+    def _combine(self, kind, a, b, op):
+        if kind != _COMPLEX:
+            code = '{} {} {}'.format(self._value(a), op, self._value(b))
+            return kind, self._temp(code), None
+        re = self._temp('{} {} {}'.format(a[1], op, b[1]))
+        if b[2] is None:
+            im = a[2]
+        elif a[2] is None:
+            im = self._temp('0.0 {} {}'.format(op, b[2]))
+        else:
+            im = self._temp('{} {} {}'.format(a[2], op, b[2]))
+        return kind, re, im
+
+    def _product(self, kind, a, b):
+        if kind != _COMPLEX:
+            code = '{} * {}'.format(self._value(a), self._value(b))
+            return kind, self._temp(code), None
+        (_, ar, ai), (_, br, bi) = a, b
+        if ai is None:
+            return (kind, self._temp('{} * {}'.format(ar, br)),
+                    self._temp('{} * {}'.format(ar, bi)))
+        if bi is None:
+            return (kind, self._temp('{} * {}'.format(ar, br)),
+                    self._temp('{} * {}'.format(ai, br)))
+        return (kind,
+                self._temp('{} * {} - {} * {}'.format(ar, br, ai, bi)),
+                self._temp('{} * {} + {} * {}'.format(ar, bi, ai, br)))
+
+    def _scale(self, a, k):
+        kind = max(a[0], _kind_of((k,)))
+        if kind != _COMPLEX:
+            code = '{} * {}'.format(self._constant(k), self._value(a))
+            return kind, self._temp(code), None
+        kr, ki = self._constant(k.real), self._constant(k.imag)
+        _, re, im = a
+        if im is None:
+            return (kind, self._temp('{} * {}'.format(kr, re)),
+                    self._temp('{} * {}'.format(ki, re)))
+        return (kind, self._temp('{} * {} - {} * {}'.format(kr, re, ki, im)),
+                self._temp('{} * {} + {} * {}'.format(kr, im, ki, re)))
+
+    def source(self, result):
+        """
+        Returns the source code of the loop for an expression whose steps
+        end in 'result'.  The loop takes a tuple of the sequences it reads
+        and a tuple of its constants, and returns lists of the real and
+        imaginary parts of the result (None when real).
+        """
+        _, re, im = result
+        names = ['v{}'.format(i) for i in range(len(self.sources))]
+        lines = ['def kernel(sources, constants):']
+        if self.constants:
+            lines.append('    {}, = constants'.format(', '.join(
+                'k{}'.format(i) for i in range(len(self.constants)))))
+        lines += ['    out_re = []', '    add_re = out_re.append']
+        if im is not None:
+            lines += ['    out_im = []', '    add_im = out_im.append']
+        else:
+            lines.append('    out_im = None')
+        lines.append('    for {}, in zip(*sources):'.format(', '.join(names)))
+        lines += ['        ' + line for line in self.lines]
+        lines.append('        add_re({})'.format(re))
+        if im is not None:
+            lines.append('        add_im({})'.format(im))
+        lines.append('    return out_re, out_im')
+        return '\n'.join(lines) + '\n'
+
+
+def _compiled(source):
+    """
+    Compiles the source of a kernel, or finds it already compiled.
+    """
+    try:
+        return _KERNELS[source]
+    except KeyError:
+        pass
+    namespace = {}
+    exec(compile(source, '<lazy kernel>', 'exec'), namespace)
+    while _KERNELS and len(_KERNELS) >= KERNEL_CACHE_SIZE:
+        del _KERNELS[next(iter(_KERNELS))]
+    _KERNELS[source] = namespace['kernel']
+    return namespace['kernel']
+
+
+def _fuse(e):
+    """
+    Evaluates element by element expression 'e' in a single loop, whose
+    results are packed straight into the storage of the new Matrix or
+    Vector.
+    """
+    kernel = _Kernel()
+    result = kernel.visit(_prepare(e))
+    kind = result[0]
+    run = _compiled(kernel.source(result))
+    re, im = run(tuple(kernel.sources), tuple(kernel.constants))
+    if kind == _COMPLEX:
+        re, im = array('d', re), array('d', im)
+    else:
+        re, im, kind = _pack(re, kind)
+    if len(e.shape) == 2:
+        return Matrix._adopt(re, im, kind, *e.shape)
+    return Vector._adopt(re, im, kind)
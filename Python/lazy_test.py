@@ -0,0 +1,142 @@
+import unittest
+import lazy as lazy_module
+from linear import Vector, Matrix
+from lazy import Expr, _chain_order, lazy, evaluate
+from testutil import storage
+
+
+# unittest requires CamelCase
+class TestLazy(unittest.TestCase):
+    def setUp(self):
+        self.m1 = Matrix([Vector([1, 2, 3]),
+                          Vector([4, 5, 6])])
+        self.m2 = Matrix([Vector([0.5, -1.5, 2.25]),
+                          Vector([3.1, 0.7, -8.0])])
+        self.m3 = Matrix([Vector([1j, 2 - 1.5j, 3]),
+                          Vector([-4.2, 5j, 6 + 0.1j])])
+        self.v1 = Vector([1, -2, 3])
+        self.v2 = Vector([0.5, 1.5j, -2.0])
+
+
+    def tearDown(self):
+        del self.m1
+        del self.m2
+        del self.m3
+        del self.v1
+        del self.v2
+
+
+    def assertSame(self, lazy_result, eager_result):
+        self.assertEqual(storage(lazy_result), storage(eager_result))
+
+
+    def test_elementwise(self):
+        m1, m2, m3 = self.m1, self.m2, self.m3
+        self.assertSame((lazy(m1).scale(3) + lazy(m1).scale(2)).evaluate(),
+                        m1.scale(3) + m1.scale(2))
+        for a in (m1, m2, m3):
+            for b in (m1, m2, m3):
+                for k in (2, -0.5, 1.5 - 2j):
+                    with self.subTest(a=a._kind, b=b._kind, k=k):
+                        self.assertSame((lazy(a).scale(k) - b).evaluate(),
+                                        a.scale(k) - b)
+                        self.assertSame(
+                            (lazy(a).hadamard(b) + lazy(b).scale(k))
+                            .evaluate(), a.hadamard(b) + b.scale(k))
+        self.assertSame((lazy(m1) - m3 + lazy(m2).scale(2j)).evaluate(),
+                        m1 - m3 + m2.scale(2j))
+        self.assertIsInstance(lazy(m1) + m2, Expr)
+        self.assertIsInstance(m1 + lazy(m2), Expr)
+
+        # Verify that compiled kernels are bounded like the other caches
+        size = lazy_module.KERNEL_CACHE_SIZE
+        lazy_module.KERNEL_CACHE_SIZE = 2
+        try:
+            for k in (2, 2.5, 2j):
+                (lazy(m1).scale(k) + m2).evaluate()
+            self.assertLessEqual(len(lazy_module._KERNELS), 2)
+            self.assertSame((lazy(m1).scale(2j) + m2).evaluate(),
+                            m1.scale(2j) + m2)
+        finally:
+            lazy_module.KERNEL_CACHE_SIZE = size
+
+
+    def test_transpose(self):
+        m1, m2, m3 = self.m1, self.m2, self.m3
+        square = m1 * m1.transpose()
+        self.assertSame((lazy(square) + lazy(square).transpose()).evaluate(),
+                        square + square.transpose())
+        self.assertSame((lazy(m1).scale(2) - m3).transpose().evaluate(),
+                        (m1.scale(2) - m3).transpose())
+        self.assertSame((lazy(m2).transpose() + m3.ht()).evaluate(),
+                        m2.transpose() + m3.ht())
+        self.assertSame((lazy(m1.transpose()).transpose() - m2).evaluate(),
+                        m1 - m2)
+        t = lazy(m3).transpose()
+        self.assertEqual((t.rows, t.columns), (3, 2))
+        self.assertRaises(TypeError, lambda: lazy(self.v1).transpose())
+
+
+    def test_vectors(self):
+        v1, v2 = self.v1, self.v2
+        self.assertSame((lazy(v1).scale(2) + v2).evaluate(),
+                        v1.scale(2) + v2)
+        self.assertSame((v2 - lazy(v1) * 1.5).evaluate(), v2 - v1.scale(1.5))
+        self.assertEqual((lazy(v1) * v2).evaluate(), v1 * v2)
+        self.assertEqual(evaluate(lazy(v1)), v1)
+        self.assertEqual(evaluate(5), 5)
+
+
+    def test_overflow(self):
+        big = Matrix([Vector([2 ** 62, 1]), Vector([1, -2 ** 62])])
+        self.assertSame((lazy(big) + big).evaluate(), big + big)
+        self.assertSame((lazy(big).scale(4) - big).evaluate(),
+                        big.scale(4) - big)
+
+
+    def test_products(self):
+        m1, m2, m3 = self.m1, self.m2, self.m3
+        square = m1 * m2.transpose()
+        self.assertEqual((lazy(m1) * m2.transpose()).evaluate(), square)
+        self.assertEqual((lazy(square) * square * m1).evaluate(),
+                         square * square * m1)
+        self.assertEqual((lazy(m1).transpose() * square * m3).evaluate(),
+                         m1.transpose() * square * m3)
+        v = Vector([1, -2])
+        self.assertEqual((lazy(square) * square * v).evaluate(),
+                         square * square * v)
+        self.assertEqual((self.v1 * lazy(m1.transpose()) * square).evaluate(),
+                         self.v1 * m1.transpose() * square)
+        self.assertEqual((lazy(m1) * self.v1 * lazy(m1) * self.v1).evaluate(),
+                         m1 * self.v1 * m1 * self.v1)
+        self.assertEqual((lazy(square) * square + m1 * m2.transpose())
+                         .evaluate(), square * square + square)
+        self.assertEqual(lazy(m1).scale(m2).evaluate(), m1.scale(m2))
+
+
+    def test_chain_order(self):
+        # (10 x 100)(100 x 5) first costs 5000 + 2500 multiplications
+        self.assertEqual(_chain_order([10, 100, 5, 50])[0][2], 1)
+        # A Matrix chain ending in a Vector multiplies from the right
+        split = _chain_order([50, 50, 50, 1])
+        self.assertEqual(split[0][2], 0)
+        self.assertEqual(split[1][2], 1)
+
+
+    def test_errors(self):
+        m1, v1 = lazy(self.m1), lazy(self.v1)
+        self.assertRaises(IndexError, lambda: m1 + self.m1.transpose())
+        self.assertRaises(TypeError, lambda: m1 + v1)
+        self.assertRaises(TypeError, lambda: m1 + 1)
+        self.assertRaises(IndexError, lambda: v1 - Vector([1, 2]))
+        self.assertRaises(IndexError, lambda: m1 * self.m1)
+        self.assertRaises(IndexError, lambda: m1 * Vector([1, 2]))
+        self.assertRaises(IndexError, lambda: Vector([1, 2, 3]) * m1)
+        self.assertRaises(TypeError, lambda: m1.scale('text'))
+        self.assertRaises(TypeError, lambda: v1.hadamard(v1))
+        self.assertRaises(TypeError, lambda: lazy(1))
+        self.assertRaises(TypeError, lambda: (v1 * v1).scale(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,30 +1,921 @@
+from array import array
+from collections import namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from contextvars import ContextVar
+from functools import partial
+from itertools import repeat
 from numbers import Complex
+from operator import add, mul, neg, sub
 import cmath
 import math
-from random import seed, randint, random
+import os
+from multiprocessing.shared_memory import SharedMemory
+import random
+
+
+# Storage kinds for the numbers held by a Vector.  They are ordered so that
+# the kind needed to hold the result of combining two kinds is their max().
+_INT, _FLOAT, _COMPLEX, _OBJECT = range(4)
+
+# The public name of each storage kind, as given by the dtype of a Vector or
+# a Matrix.
+DTYPES = ('int', 'float', 'complex', 'object')
+
+# Kernel used for Matrix products when none is asked for.  One of 'auto',
+# 'classic', 'tiled', 'strassen' or 'parallel'.
+MULTIPLY_METHOD = 'auto'
+
+# Tiled products work in square tiles of BLOCK_SIZE rather than one dot
+# product at a time.  Timed against the classic kernel from 256 to 384 on a
+# side, tiling was as often slower as faster, since the rows and columns are
+# already gathered into lists, so 'auto' only tiles products at least
+# TILED_THRESHOLD on every side once it is set.  None never tiles.  Both
+# may be tuned at run time.
+TILED_THRESHOLD = None
+BLOCK_SIZE = 256
+
+# Strassen-Winograd multiplication splits square products in half until
+# they are no bigger than STRASSEN_CUTOFF, then uses the classic kernel.
+STRASSEN_CUTOFF = 128
+
+# Parallel multiplication splits products which are at least
+# PARALLEL_THRESHOLD on every side into bands of rows, one per worker
+# process.  WORKERS of None means one worker per CPU.
+PARALLEL_THRESHOLD = 256
+WORKERS = None
+
+# Derived quantities, such as the magnitude of a Vector or the transpose of
+# a Matrix, are cached on the object they came from, up to CACHE_SIZE of
+# them each, and worked out again once its numbers change.  Changes made by
+# any Vector or Matrix operation, by assigning to v[i] or m[i], or through a
+# view of the same storage, are all noticed; 'elements' is only ever a copy.
+# A CACHE_SIZE of 0 turns caching off.
+CACHE_SIZE = 8
+
+# Cache hits and misses across every Vector and Matrix.  Cached quantities
+# are only trusted if they were cached in the current epoch.
+_CACHE = {'hits': 0, 'misses': 0, 'epoch': 0}
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize'])
+
+
+def _kind_of(values):
+    """
+    Returns the storage kind needed to hold every number in 'values'.  Raises
+    AssertionError if anything in 'values' is not a number.
+    """
+    kind = _INT
+    for v in values:
+        if isinstance(v, int):
+            continue
+        if isinstance(v, float):
+            if kind < _FLOAT:
+                kind = _FLOAT
+        elif isinstance(v, complex):
+            if kind < _COMPLEX:
+                kind = _COMPLEX
+        else:
+            assert isinstance(v, Complex)
+            kind = _OBJECT
+    return kind
+
+
+def _pack(values, kind):
+    """
+    Packs the numbers in 'values' into storage buffers for 'kind'.  Returns
+    a tuple of (real buffer, imaginary buffer, kind).  The imaginary buffer
+    is None unless the numbers are complex.  Numbers too large for a typed
+    buffer are kept in a plain list instead.
+    """
+    try:
+        if kind == _INT:
+            return array('q', values), None, _INT
+        if kind == _FLOAT:
+            return array('d', values), None, _FLOAT
+        if kind == _COMPLEX:
+            return (array('d', [v.real for v in values]),
+                    array('d', [v.imag for v in values]), _COMPLEX)
+    except OverflowError:
+        pass
+    return list(values), None, _OBJECT
+
+
+# Numbers which agree to within TOLERANCE, 6 decimal places, are equal.
+TOLERANCE = 10 ** -6
+
+
+def _isclose(a, b):
+    """
+    Returns True if numbers 'a' and 'b' agree to 6 decimal places.
+    """
+    return math.isclose(a, b, abs_tol=TOLERANCE)
+
+
+def _split(re, im, kind):
+    """
+    Returns the real and imaginary parts of storage buffers 're' and 'im' as
+    a pair of iterables, each to be read once.  The imaginary part is None
+    when the storage is real.
+    """
+    if kind == _OBJECT:
+        return (e.real for e in re), (e.imag for e in re)
+    return re, im
+
+
+def _all_close(a, b, tolerance=None):
+    """
+    Returns True if two sets of numbers, each given as the (real, imaginary)
+    pair returned by _split(), agree to within 'tolerance', which defaults
+    to TOLERANCE.  Stops at the first pair of numbers which do not agree.
+    """
+    close = partial(math.isclose, abs_tol=TOLERANCE if tolerance is None
+                    else tolerance)
+    (re1, im1), (re2, im2) = a, b
+    if not all(map(close, re1, re2)):
+        return False
+    if im1 is None and im2 is None:
+        return True
+    zeros = repeat(0.0)
+    return all(map(close, zeros if im1 is None else im1,
+                   zeros if im2 is None else im2))
+
+
+def _typed(buf):
+    return isinstance(buf, (array, memoryview))
+
+
+def _equal(a, b):
+    """
+    Returns True if the numbers in two storages, each given as (real,
+    imaginary, kind), agree to within TOLERANCE.  Integers are compared
+    exactly, and typed storage is first compared a whole buffer at a time,
+    so only numbers which are not identical are checked one by one.
+    """
+    (re1, im1, kind1), (re2, im2, kind2) = a, b
+    if kind1 == kind2 and kind1 != _OBJECT and _typed(re1) and _typed(re2):
+        if kind1 == _INT:
+            return re1 == re2
+        if re1 == re2 and (im1 is None or im1 == im2):
+            return True
+    return _all_close(_split(re1, im1, kind1), _split(re2, im2, kind2))
+
+
+def _all_zero(a, tolerance=None):
+    """
+    Returns True if every number in 'a', given as the (real, imaginary)
+    pair returned by _split(), is zero to within 'tolerance'.
+    """
+    return _all_close(a, (repeat(0.0), None), tolerance)
+
+
+class _ListView(object):
+    """
+    A window onto the numbers of a plain list, the storage of the generic
+    object kind, which memoryview cannot look at.  Slicing one gives another
+    window onto the same list, and writing into one writes into the list.
+    """
+
+    __slots__ = ('_buf', '_indices')
+
+    def __init__(self, buf, indices=None):
+        self._buf = buf
+        self._indices = range(len(buf)) if indices is None else indices
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __iter__(self):
+        return map(self._buf.__getitem__, self._indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return _ListView(self._buf, self._indices[i])
+        return self._buf[self._indices[i]]
+
+    def __setitem__(self, i, values):
+        if not isinstance(i, slice):
+            self._buf[self._indices[i]] = values
+            return
+        indices = self._indices[i]
+        values = list(values)
+        if len(values) != len(indices):
+            raise ValueError("Cannot change the size of a view")
+        buf = self._buf
+        for j, x in zip(indices, values):
+            buf[j] = x
+
+
+def _view(buf):
+    """
+    Returns a view of storage buffer 'buf' which can be sliced without
+    copying.  Plain lists are viewed through a _ListView, and anything which
+    is already a view is returned as is.
+    """
+    if isinstance(buf, array):
+        return memoryview(buf)
+    if isinstance(buf, list):
+        return _ListView(buf)
+    return buf
+
+
+def _values(re, im):
+    """
+    Returns the numbers held in storage buffers 're' and 'im' as a sequence
+    of plain numbers.
+    """
+    if im is None:
+        return re
+    return list(map(complex, re, im))
+
+
+def _parts(re, im, kind):
+    """
+    Returns storage buffers 're' and 'im' in the form needed by a kernel
+    working in 'kind'.  Complex storage which is mixed with the generic
+    object kind is turned back into plain numbers.
+    """
+    if kind == _OBJECT and im is not None:
+        return list(map(complex, re, im)), None
+    return re, im
+
+
+def _buffer(kind):
+    """
+    Returns a new, empty storage buffer for numbers of 'kind'.
+    """
+    if kind == _OBJECT:
+        return []
+    return array('q' if kind == _INT else 'd')
+
+
+def _extend(buf, values):
+    """
+    Appends the numbers in 'values', which may be a buffer or a view of one,
+    to storage buffer 'buf'.
+    """
+    if isinstance(buf, list):
+        buf.extend(values)
+        return
+    if isinstance(values, array) and values.typecode != buf.typecode:
+        values = memoryview(values)
+    if isinstance(values, memoryview) and values.format == buf.typecode:
+        buf.frombytes(values.tobytes())
+    else:
+        buf.extend(values)
+
+
+def _stack(vectors):
+    """
+    Copies the numbers held by a sequence of Vectors, one after another, into
+    a single flat storage.  Returns the packed storage.
+    """
+    kind = max(v._kind for v in vectors)
+    re = _buffer(kind)
+    im = array('d') if kind == _COMPLEX else None
+    for v in vectors:
+        v_re, v_im = _parts(v._re, v._im, kind)
+        _extend(re, v_re)
+        if im is not None:
+            if v_im is None:
+                im.frombytes(bytes(8 * v.dimension))
+            else:
+                _extend(im, v_im)
+    return re, im, kind
+
+
+def _convert(re, im, kind, target):
+    """
+    Returns storage buffers 're' and 'im', which hold numbers of 'kind', as
+    typed buffers in the form used by storage of kind 'target', which must
+    be at least 'kind'.  Views are copied into buffers of their own.
+    """
+    if target == _OBJECT:
+        return list(_values(re, im)), None
+    typecode = 'q' if target == _INT else 'd'
+    if not (isinstance(re, array) and re.typecode == typecode):
+        re = array(typecode, re)
+    if target != _COMPLEX:
+        return re, None
+    if im is None:
+        return re, array('d', bytes(8 * len(re)))
+    return re, im if isinstance(im, array) else array('d', im)
+
+
+def _widened(re, im, kind, dtype):
+    """
+    Returns new storage buffers, as (real, imaginary, kind), holding the
+    numbers of 're' and 'im', of 'kind', as numbers of public 'dtype'.
+    Raises TypeError if 'dtype' is unknown or would lose information.
+    """
+    try:
+        target = DTYPES.index(dtype)
+    except ValueError:
+        raise TypeError("{} is not a supported dtype".format(dtype))
+    if target < kind:
+        raise TypeError("Cannot convert {} numbers to {}"
+                        .format(DTYPES[kind], dtype))
+    # Views always convert into buffers of their own
+    return (*_convert(_view(re), None if im is None else _view(im), kind,
+                      target), target)
+
+
+def _readonly(buf):
+    """
+    Returns storage buffer 'buf', or None, in a form which can be read like
+    it but raises TypeError when written to.
+    """
+    if buf is None:
+        return None
+    if isinstance(buf, list):
+        return tuple(buf)
+    return memoryview(buf).toreadonly()
+
+
+def _check_writable(v):
+    """
+    Raises TypeError if the storage of Vector 'v' cannot be written to.  A
+    row of a Matrix which conjugates its numbers holds conjugated copies,
+    so a write could never reach the Matrix, and is handed out read-only.
+    """
+    re = v._re
+    if isinstance(re, tuple) or (isinstance(re, memoryview) and re.readonly):
+        raise TypeError("Cannot write into read-only storage, such as a row "
+                        "of a Hermitian transpose")
+
+
+def _check_widen(x, kind):
+    """
+    Raises TypeError if Vector or Matrix 'x' is a view, which cannot take
+    over new storage to hold numbers of the wider 'kind'.  Widening it would
+    leave it looking at storage of its own while the Matrix it came from
+    kept the old numbers.
+    """
+    if x._shared:
+        raise TypeError("Cannot write {} numbers into a view of {} storage"
+                        .format(DTYPES[kind], DTYPES[x._kind]))
+
+
+def _deliver(like, storage, out=None):
+    """
+    Hands back packed 'storage', the result of an operation, as a new Vector
+    or Matrix shaped like 'like'.  If 'out' is given the result is written
+    into it instead and 'out' is returned.
+    """
+    if out is not None:
+        out._assign(*storage)
+        return out
+    if isinstance(like, Matrix):
+        return Matrix._adopt(*storage, like.rows, like.columns)
+    return Vector._adopt(*storage)
+
+
+def _stamp(value):
+    """
+    Returns the version of the numbers of 'value' if it is a Vector or a
+    Matrix, or None for anything else.  Storage which owns its numbers
+    counts its version in a plain int, and storage which is shared with
+    views counts it in a one item list they all hold.
+    """
+    version = getattr(value, '_version', None)
+    if version is None or isinstance(version, int):
+        return version
+    return version[0]
+
+
+# Stands in the cache for a quantity which was worked out once but not kept
+_ASKED = object()
+
+
+def _cached(obj, key, compute, reused=False):
+    """
+    Returns the derived quantity 'key' of Vector or Matrix 'obj' from its
+    cache.  'compute' is called to work it out if it is not cached, or if
+    the numbers of 'obj', or of the cached Vector or Matrix itself, have
+    changed since.  The oldest entry makes way once CACHE_SIZE are held.
+    If 'reused' is True the quantity is only kept the second time it is
+    worked out for the same numbers, so one that is only used once never
+    holds on to memory.
+    """
+    stamp = (_stamp(obj), _CACHE['epoch'])
+    cache = obj._cache if CACHE_SIZE > 0 else None
+    keep = not reused
+    if cache is not None:
+        entry = cache.get(key)
+        if (entry is not None and entry[0] == stamp and
+                _stamp(entry[1]) == entry[2]):
+            if entry[1] is not _ASKED:
+                _CACHE['hits'] += 1
+                return entry[1]
+            keep = True
+    _CACHE['misses'] += 1
+    value = compute()
+    if CACHE_SIZE > 0:
+        if cache is None:
+            cache = obj._cache = {}
+        cache.pop(key, None)
+        while len(cache) >= CACHE_SIZE:
+            del cache[next(iter(cache))]
+        kept = value if keep else _ASKED
+        cache[key] = (stamp, kept, _stamp(kept))
+    return value
+
+
+def cache_info():
+    """
+    Returns the number of cache hits and misses for derived quantities of
+    every Vector and Matrix since the last cache_clear(), along with the
+    CACHE_SIZE of each cache.
+    """
+    return CacheInfo(_CACHE['hits'], _CACHE['misses'], CACHE_SIZE)
+
+
+def cache_clear():
+    """
+    Forgets every cached derived quantity and resets the hit and miss
+    counts.
+    """
+    _CACHE['hits'] = _CACHE['misses'] = 0
+    _CACHE['epoch'] += 1
+
+
+def _call(op, *args, out=None):
+    """
+    Calls backend method 'op' with 'args', handing 'out' on only when it is
+    given so that backends written without in-place support still work.
+    """
+    if out is None:
+        return op(*args)
+    return op(*args, out=out)
+
+
+def _combine(a, b, op):
+    """
+    Applies 'op' (add or sub) element by element to storages 'a' and 'b',
+    which hold the same quantity of numbers.  Each storage is a tuple of
+    (real buffer, imaginary buffer, kind).  Returns the packed result.
+    """
+    kind = max(a[2], b[2])
+    if kind != _COMPLEX:
+        return _pack(list(map(op, _values(a[0], a[1]), _values(b[0], b[1]))),
+                     kind)
+    re = array('d', map(op, a[0], b[0]))
+    if b[1] is None:
+        im = array('d', a[1])
+    elif a[1] is None:
+        im = array('d', map(op, repeat(0.0), b[1]))
+    else:
+        im = array('d', map(op, a[1], b[1]))
+    return re, im, _COMPLEX
+
+
+def _product(a, b):
+    """
+    Multiplies the numbers held in storages 'a' and 'b' element by element
+    and returns the packed result.
+    """
+    kind = max(a[2], b[2])
+    if kind != _COMPLEX:
+        return _pack(list(map(mul, _values(a[0], a[1]),
+                              _values(b[0], b[1]))), kind)
+
+    # (a + bi)(c + di) = (ac - bd) + (ad + bc)i
+    (ar, ai, _), (br, bi, _) = a, b
+    if ai is None:
+        return (array('d', map(mul, ar, br)), array('d', map(mul, ar, bi)),
+                _COMPLEX)
+    if bi is None:
+        return (array('d', map(mul, ar, br)), array('d', map(mul, ai, br)),
+                _COMPLEX)
+    re = array('d', [w * y - x * z for w, x, y, z in zip(ar, ai, br, bi)])
+    im = array('d', [w * z + x * y for w, x, y, z in zip(ar, ai, br, bi)])
+    return re, im, _COMPLEX
+
+
+def _scaled(a, k):
+    """
+    Multiplies every number held in storage 'a' by the number 'k' and returns
+    the packed result.
+    """
+    kind = max(a[2], _kind_of((k,)))
+    if kind != _COMPLEX:
+        return _pack(list(map(mul, repeat(k), _values(a[0], a[1]))), kind)
+    re, im = a[0], a[1]
+    kr, ki = k.real, k.imag
+    if im is None:
+        return (array('d', [kr * x for x in re]),
+                array('d', [ki * x for x in re]), _COMPLEX)
+    return (array('d', [kr * x - ki * y for x, y in zip(re, im)]),
+            array('d', [kr * y + ki * x for x, y in zip(re, im)]), _COMPLEX)
+
+
+def _dot(are, aim, bre, bim):
+    """
+    Returns the dot product of two equally sized runs of numbers, each given
+    as real and imaginary parts.  Imaginary parts are None for real numbers.
+    """
+    if aim is None and bim is None:
+        return sum(map(mul, are, bre))
+
+    # (a + bi)(c + di) = (ac - bd) + (ad + bc)i
+    if aim is None:
+        return complex(sum(map(mul, are, bre)), sum(map(mul, are, bim)))
+    if bim is None:
+        return complex(sum(map(mul, are, bre)), sum(map(mul, aim, bre)))
+    return complex(sum(map(mul, are, bre)) - sum(map(mul, aim, bim)),
+                   sum(map(mul, are, bim)) + sum(map(mul, aim, bre)))
+
+
+def _tolist(seq):
+    """
+    Returns the numbers in 'seq', which may be a buffer or a view of one, as
+    a list so that kernels reading them many times only box them once.
+    """
+    return seq.tolist() if isinstance(seq, (array, memoryview)) else list(seq)
+
+
+def _lists(slices):
+    """
+    Turns a list of (real, imaginary) slices into a pair of lists of lists.
+    The second list is None when the slices are real.
+    """
+    re = [_tolist(r) for r, _ in slices]
+    if slices[0][1] is None:
+        return re, None
+    return re, [_tolist(i) for _, i in slices]
+
+
+def _classic_product(rows, columns):
+    """
+    Multiplies lists of row numbers by lists of column numbers, one dot
+    product per result, and returns the results as a flat row-major list.
+    """
+    return [sum(map(mul, r, c)) for r in rows for c in columns]
+
+
+def _tiled_product(rows, columns, block_size):
+    """
+    Multiplies lists of row numbers by lists of column numbers one tile at a
+    time.  Each tile covers 'block_size' columns, 'block_size' terms deep, and
+    is swept down every row while it is still in cache, accumulating into
+    preallocated result rows.  Returns the results as a flat row-major list.
+    """
+    depth = len(columns[0])
+    width = len(columns)
+    out = [[0] * width for _ in rows]
+    for k0 in range(0, depth, block_size):
+        k1 = k0 + block_size
+        for j0 in range(0, width, block_size):
+            tile = [(j, c[k0:k1]) for j, c in
+                    enumerate(columns[j0:j0 + block_size], j0)]
+            for r, acc in zip(rows, out):
+                segment = r[k0:k1]
+                for j, c in tile:
+                    acc[j] += sum(map(mul, segment, c))
+    return [x for acc in out for x in acc]
+
+
+def _strassen(a, b, cutoff):
+    """
+    Multiplies square Matrix 'a' by square Matrix 'b', both given as lists of
+    row lists, with the Strassen-Winograd scheme of 7 half-size products and
+    15 additions.  Odd sizes are padded with a row and column of zeros.
+    Returns the product as a list of row lists.
+    """
+    n = len(a)
+    if n <= cutoff:
+        columns = list(zip(*b))
+        return [[sum(map(mul, r, c)) for c in columns] for r in a]
+    if n % 2:
+        a = [r + [0] for r in a] + [[0] * (n + 1)]
+        b = [r + [0] for r in b] + [[0] * (n + 1)]
+        return [r[:n] for r in _strassen(a, b, cutoff)[:n]]
+
+    h = n // 2
+    a11, a12 = [r[:h] for r in a[:h]], [r[h:] for r in a[:h]]
+    a21, a22 = [r[:h] for r in a[h:]], [r[h:] for r in a[h:]]
+    b11, b12 = [r[:h] for r in b[:h]], [r[h:] for r in b[:h]]
+    b21, b22 = [r[:h] for r in b[h:]], [r[h:] for r in b[h:]]
+
+    s1 = _madd(a21, a22)
+    s2 = _msub(s1, a11)
+    s3 = _msub(a11, a21)
+    s4 = _msub(a12, s2)
+    t1 = _msub(b12, b11)
+    t2 = _msub(b22, t1)
+    t3 = _msub(b22, b12)
+    t4 = _msub(t2, b21)
+
+    p1 = _strassen(a11, b11, cutoff)
+    p2 = _strassen(a12, b21, cutoff)
+    p3 = _strassen(s4, b22, cutoff)
+    p4 = _strassen(a22, t4, cutoff)
+    p5 = _strassen(s1, t1, cutoff)
+    p6 = _strassen(s2, t2, cutoff)
+    p7 = _strassen(s3, t3, cutoff)
+
+    u2 = _madd(p1, p6)
+    u3 = _madd(u2, p7)
+    c11 = _madd(p1, p2)
+    c12 = _madd(_madd(u2, p5), p3)
+    c21 = _msub(u3, p4)
+    c22 = _madd(u3, p5)
+    return ([x + y for x, y in zip(c11, c12)] +
+            [x + y for x, y in zip(c21, c22)])
+
+
+def _madd(a, b):
+    """
+    Adds two Matrices given as lists of row lists.
+    """
+    return [list(map(add, x, y)) for x, y in zip(a, b)]
+
+
+def _msub(a, b):
+    """
+    Subtracts two Matrices given as lists of row lists.
+    """
+    return [list(map(sub, x, y)) for x, y in zip(a, b)]
+
+
+def _strassen_product(rows, columns, cutoff):
+    """
+    Multiplies square lists of row numbers by lists of column numbers with
+    _strassen() and returns the results as a flat row-major list.
+    """
+    b = [list(r) for r in zip(*columns)]
+    return [x for r in _strassen(rows, b, max(cutoff, 1)) for x in r]
+
+
+def _share(blocks, key, values, typecode):
+    """
+    Copies 'values' into a new block of shared memory as numbers of type
+    'typecode' and keeps the block in dictionary 'blocks' under 'key'.
+    """
+    if not (isinstance(values, array) and values.typecode == typecode):
+        values = array(typecode, values)
+    size = len(values) * values.itemsize
+    blocks[key] = SharedMemory(create=True, size=size)
+    blocks[key].buf[:size] = memoryview(values).cast('B')
+
+
+def _multiply_rows(spec, start, stop):
+    """
+    Worker for _parallel_matmul().  Attaches to the shared memory described
+    by 'spec', multiplies rows 'start' up to 'stop' of the left operand by
+    the right operand and writes them into the shared result.
+    """
+    blocks = {}
+    try:
+        for key, name in spec['names'].items():
+            blocks[key] = SharedMemory(name=name)
+        _write_rows(spec, blocks, start, stop)
+    finally:
+        for block in blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                # A view is still held by a traceback; the mapping goes
+                # away with the worker.
+                pass
+
+
+def _write_rows(spec, blocks, start, stop):
+    """
+    Does the work of _multiply_rows() on the attached shared memory.  Kept
+    apart so every view of the memory is gone before it is closed.
+    """
+    typecode = spec['typecode']
+    n, k, m = spec['shape']
+
+    def view(key, first, last):
+        if key not in blocks:
+            return None
+        return blocks[key].buf.cast(typecode if key.endswith('re') else 'd')[
+            first:last]
+
+    def kind(im):
+        if im is not None:
+            return _COMPLEX
+        return _INT if typecode == 'q' else _FLOAT
+
+    a_im = view('a_im', start * k, stop * k)
+    a = Matrix._adopt(view('a_re', start * k, stop * k), a_im, kind(a_im),
+                      stop - start, k)
+    b_im = view('b_im', 0, k * m)
+    b = Matrix._adopt(view('b_re', 0, k * m), b_im, kind(b_im), k, m)
+    re, im, result_kind = _matmul(a, b, 'auto', spec['block_size'])
+    if result_kind == _OBJECT:
+        raise OverflowError("Product too large for 64 bit integers")
+    view('c_re', start * m, stop * m)[:] = re
+    if im is not None:
+        view('c_im', start * m, stop * m)[:] = im
+
+
+def _parallel_matmul(a, b, workers, block_size=None):
+    """
+    Multiplies Matrix 'a' by Matrix 'b' across 'workers' processes and
+    returns the packed result.  Both operands and the result live in shared
+    memory so nothing is pickled but the names of the blocks, and each
+    worker computes one band of result rows.  Raises OverflowError if an
+    integer product does not fit in 64 bits.
+    """
+    kind = max(a._kind, b._kind)
+    typecode = 'q' if kind == _INT else 'd'
+    n, k, m = a.rows, a.columns, b.columns
+    blocks = {}
+    try:
+        a_re, a_im, _ = a._flat()
+        b_re, b_im, _ = b._flat()
+        _share(blocks, 'a_re', a_re, typecode)
+        _share(blocks, 'b_re', b_re, typecode)
+        if a_im is not None:
+            _share(blocks, 'a_im', a_im, 'd')
+        if b_im is not None:
+            _share(blocks, 'b_im', b_im, 'd')
+        _share(blocks, 'c_re', array(typecode, [0]) * (n * m), typecode)
+        if kind == _COMPLEX:
+            _share(blocks, 'c_im', array('d', [0]) * (n * m), 'd')
+        spec = {'names': {key: block.name for key, block in blocks.items()},
+                'typecode': typecode, 'shape': (n, k, m),
+                'block_size': block_size}
+
+        band = -(-n // workers)
+        with ProcessPoolExecutor(workers) as pool:
+            jobs = [pool.submit(_multiply_rows, spec, i, min(i + band, n))
+                    for i in range(0, n, band)]
+            for job in jobs:
+                job.result()
+
+        size = 8 * n * m
+        re = array(typecode)
+        re.frombytes(blocks['c_re'].buf[:size])
+        im = None
+        if kind == _COMPLEX:
+            im = array('d')
+            im.frombytes(blocks['c_im'].buf[:size])
+        return re, im, kind
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+
+def _matmul(a, b, method=None, block_size=None, cutoff=None, workers=None):
+    """
+    Multiplies Matrix 'a' by Matrix 'b' and returns the packed result in
+    row-major order.  'method' picks the kernel: 'classic', 'tiled',
+    'strassen', 'parallel' or 'auto', which tiles products at least
+    TILED_THRESHOLD on every side if that is set and otherwise uses the
+    classic kernel.  It defaults to MULTIPLY_METHOD.
+    Strassen only applies to square products, and parallel products to
+    large ones with more than one worker, otherwise 'auto' is used.
+    """
+    method = method or MULTIPLY_METHOD
+    if method == 'parallel':
+        workers = workers or WORKERS or os.cpu_count() or 1
+        side = min(a.rows, a.columns, b.columns)
+        if (workers > 1 and side >= PARALLEL_THRESHOLD and
+                max(a._kind, b._kind) != _OBJECT):
+            try:
+                return _parallel_matmul(a, b, workers, block_size)
+            except OverflowError:
+                pass
+        method = 'auto'
+    if method == 'strassen':
+        if a.rows == a.columns == b.columns:
+            kernel = partial(_strassen_product,
+                             cutoff=cutoff or STRASSEN_CUTOFF)
+        else:
+            method = 'auto'
+    if method == 'auto':
+        side = min(a.rows, a.columns, b.columns)
+        tile = TILED_THRESHOLD is not None and side >= TILED_THRESHOLD
+        method = 'tiled' if tile else 'classic'
+    if method == 'classic':
+        kernel = _classic_product
+    elif method == 'tiled':
+        kernel = partial(_tiled_product, block_size=block_size or BLOCK_SIZE)
+    elif method != 'strassen':
+        raise ValueError("Unknown multiply method {}".format(method))
+
+    kind = max(a._kind, b._kind)
+    ar, ai = a._rows(kind)
+    br, bi = b._columns(kind)
+    re = kernel(ar, br)
+    if ai is None and bi is None:
+        return _pack(re, kind)
+
+    # (a + bi)(c + di) = (ac - bd) + (ad + bc)i
+    if ai is None:
+        im = kernel(ar, bi)
+    elif bi is None:
+        im = kernel(ai, br)
+    else:
+        re = list(map(sub, re, kernel(ai, bi)))
+        im = list(map(add, kernel(ar, bi), kernel(ai, br)))
+    return array('d', re), array('d', im), _COMPLEX
+
+
+# Element types of RandomVectors and RandomMatrices.  Numbers are uniform
+# between -RANDOM_RANGE and RANDOM_RANGE, apart from 'gaussian' numbers,
+# which are normal with a mean of 0 and a standard deviation of 1.  Complex
+# numbers have uniform real and imaginary parts.
+RANDOM_TYPES = ('int', 'float', 'gaussian', 'complex')
+RANDOM_RANGE = 100
+
+
+def _random_type(element_type):
+    """
+    Returns 'element_type' in lower case or raises TypeError if it is not
+    one of RANDOM_TYPES.
+    """
+    try:
+        assert isinstance(element_type, str)
+        element_type = element_type.lower()
+        assert element_type in RANDOM_TYPES
+    except AssertionError:
+        raise TypeError("{} is not a supported element type"
+                        .format(element_type))
+    return element_type
+
+
+def _generator(seed, rng):
+    """
+    Returns the random number generator to draw from: 'rng', a new one
+    seeded with 'seed', or the shared one of the random module.
+    """
+    if rng is not None:
+        if seed is not None:
+            raise ValueError("Give either a seed or a generator, not both")
+        return rng
+    if seed is not None:
+        return random.Random(seed)
+    return random
+
+
+def _uniform(rng, count):
+    """
+    Returns 'count' uniform floats between -RANDOM_RANGE and RANDOM_RANGE.
+    """
+    draw = rng.random
+    low, span = -float(RANDOM_RANGE), 2.0 * RANDOM_RANGE
+    return array('d', [low + span * draw() for _ in repeat(None, count)])
+
+
+def _random_storage(rng, element_type, count):
+    """
+    Draws 'count' random numbers of 'element_type' from 'rng' straight into
+    storage buffers, and returns them as (real, imaginary, kind).
+    """
+    if element_type == 'int':
+        numbers = range(-RANDOM_RANGE, RANDOM_RANGE + 1)
+        return array('q', rng.choices(numbers, k=count)), None, _INT
+    if element_type == 'float':
+        return _uniform(rng, count), None, _FLOAT
+    if element_type == 'gaussian':
+        gauss = rng.gauss
+        return (array('d', [gauss(0.0, 1.0) for _ in repeat(None, count)]),
+                None, _FLOAT)
+    return _uniform(rng, count), _uniform(rng, count), _COMPLEX
+
+
+def substream(seed, index):
+    """
+    Returns random number generator 'index' of a family of independent
+    streams set by 'seed'.  Each stream depends only on 'seed' and 'index',
+    so work split across threads or processes, one stream per piece, draws
+    the same numbers however it is scheduled.
+    """
+    # Seeding with a string hashes it with SHA-512, which spreads nearby
+    # seeds and indices across unrelated states.
+    return random.Random('{!r}/{}'.format(seed, index))
 
 
 class Vector(object):
     """
     A Vector is an ordered group of two or more numbers.
+
+    The numbers are kept in compact typed buffers instead of a list of boxed
+    objects.  Integers are held in an array('q'), real numbers in an
+    array('d') and complex numbers in a pair of array('d') for the real and
+    imaginary parts.  Any other kind of number falls back to a plain list.
     """
 
+    __slots__ = ('_re', '_im', '_kind', 'dimension', 'index', '_version',
+                 '_cache', '_shared')
+
     def __init__(self, elements):
         try:
             if not elements:
                 raise ValueError
-            # Better to use a list?  Would number of elements ever change?
-            # If not maybe scale method could just alter the current Vector
-            # in place.
-            # self.elements = tuple(elements)
-            self.elements = list(elements)
-            self.dimension = len(elements)
+            values = list(elements)
+            self.dimension = len(values)
             if self.dimension < 2:
                 raise IndexError
 
             # For my purposes a Vector contains only numbers
-            for e in self.elements:
-                assert isinstance(e, Complex)
+            kind = _kind_of(values)
 
         except ValueError:
             raise ValueError("Require elements to form vector")
@@ -35,7 +926,109 @@ class Vector(object):
         except AssertionError:
             raise TypeError("All elements must numbers")
 
+        self._re, self._im, self._kind = _pack(values, kind)
         self.index = -1
+        self._version = 0
+        self._cache = None
+        self._shared = False
+
+    @classmethod
+    def _adopt(cls, re, im, kind, version=None):
+        """
+        Builds a Vector around existing storage buffers without copying or
+        checking them.  Used to hand out rows of a Matrix as views, and by
+        every operation whose results are already known to be numbers of
+        'kind', so only the public constructor pays for validation.  A view
+        shares the 'version' of the storage it looks at, and is marked as
+        shared so it never swaps that storage for storage of its own.
+        """
+        v = cls.__new__(cls)
+        v._re, v._im, v._kind = re, im, kind
+        v.dimension = len(re)
+        v.index = -1
+        v._version = 0 if version is None else version
+        v._cache = None
+        v._shared = version is not None
+        return v
+
+    def _touch(self):
+        """
+        Records that the numbers in the storage of this Vector have changed,
+        so quantities cached from them, here or on any view of the same
+        storage, are worked out again.
+        """
+        if isinstance(self._version, int):
+            self._version += 1
+        else:
+            self._version[0] += 1
+
+    def _renew(self):
+        """
+        Records that this Vector has taken over new storage.  Views of its
+        old storage are told it changed, and it starts a fresh version.
+        """
+        self._touch()
+        self._version = 0
+        self._cache = None
+
+    def _assign(self, re, im, kind):
+        """
+        Overwrites the numbers of this Vector with those held in storage
+        buffers 're' and 'im' of 'kind'.  The numbers are written into the
+        existing storage, so a Vector which is a row of a Matrix writes into
+        the Matrix, unless they need a wider kind of storage, in which case
+        the Vector takes the new buffers over.  A Vector which is a view
+        cannot, so for one TypeError is raised instead, as it is for one
+        whose storage is read-only.
+        """
+        _check_writable(self)
+        if kind > self._kind:
+            _check_widen(self, kind)
+            self._re, self._im, self._kind = re, im, kind
+            self._renew()
+            return
+        re, im = _convert(re, im, kind, self._kind)
+        self._re[:] = re
+        if im is not None:
+            self._im[:] = im
+        self._touch()
+
+    def _check_out(self, out):
+        """
+        Raises an exception unless 'out' is None or a Vector the same size
+        as this one.
+        """
+        if out is None:
+            return
+        if not isinstance(out, Vector):
+            raise TypeError("Output must be a Vector")
+        if out.dimension != self.dimension:
+            raise IndexError("Output Vector must be same size.")
+
+    @property
+    def elements(self):
+        """
+        The numbers held in this Vector, as a new list.  Changing the list
+        does not change the Vector; assign to v[i] to do that.
+        """
+        if self._im is None:
+            return _tolist(self._re)
+        return list(map(complex, self._re, self._im))
+
+    @property
+    def dtype(self):
+        """
+        The type of the numbers held in this Vector: 'int', 'float',
+        'complex' or 'object' for any other kind of number.
+        """
+        return DTYPES[self._kind]
+
+    def astype(self, dtype):
+        """
+        Returns a copy of this Vector holding its numbers as 'dtype'.  Only
+        conversions which lose nothing, such as int to float, are allowed.
+        """
+        return Vector._adopt(*_widened(self._re, self._im, self._kind, dtype))
 
     def __iter__(self):
         return self
@@ -43,14 +1036,15 @@ class Vector(object):
     def __next__(self):
         self.index += 1
         if self.index < self.dimension:
-            return self.elements[self.index]
+            return self[self.index]
         raise StopIteration
 
     def __str__(self):
+        elements = self.elements
         string = "Vector: ("
-        string += '{}, '.format(self.elements[0])
-        # string += '{:.4e}, '.format(self.elements[0])
-        for e in self.elements[1:]:
+        string += '{}, '.format(elements[0])
+        # string += '{:.4e}, '.format(elements[0])
+        for e in elements[1:]:
             string += '{}, '.format(e)
             # string += '{:.4e}, '.format(e)
         return string[:-2] + ")"
@@ -64,15 +1058,80 @@ class Vector(object):
         if (isinstance(v, Vector)):
             if self.dimension != v.dimension:
                 return False
-            length = len(self.elements)
-            return all([(math.isclose(self.elements[i].real, v.elements[i].real,
-                         abs_tol=10 ** -6) and
-                         math.isclose(self.elements[i].imag, v.elements[i].imag,
-                         abs_tol=10 ** -6)) for i in range(length)])
-        return False
+            return _equal((self._re, self._im, self._kind),
+                          (v._re, v._im, v._kind))
+        return NotImplemented
 
     def __getitem__(self, i):
-        return self.elements[i]
+        if isinstance(i, slice):
+            if self._im is None:
+                return _tolist(self._re[i])
+            return list(map(complex, self._re[i], self._im[i]))
+        if self._im is None:
+            return self._re[i]
+        return complex(self._re[i], self._im[i])
+
+    def __setitem__(self, i, x):
+        """
+        Overwrites number 'i' of this Vector with the number 'x'.  A Vector
+        which is a row of a Matrix writes into the Matrix, except for a row
+        of a Hermitian transpose, which raises TypeError.  Quantities cached
+        from the numbers are worked out again.
+        """
+        if not isinstance(i, int):
+            raise TypeError("Vector indices must be integers")
+        _check_writable(self)
+        if not -self.dimension <= i < self.dimension:
+            raise IndexError("Vector index out of range")
+        try:
+            kind = _kind_of((x,))
+        except AssertionError:
+            raise TypeError("Elements must be numbers")
+        if kind <= self._kind:
+            try:
+                if self._kind in (_INT, _OBJECT):
+                    self._re[i] = x
+                else:
+                    self._re[i] = float(x.real)
+                    if self._im is not None:
+                        self._im[i] = float(x.imag)
+                self._touch()
+                return
+            except (OverflowError, ValueError):
+                # Too big for typed storage
+                kind = _OBJECT
+        values = list(_values(self._re, self._im))
+        values[i] = x
+        self._assign(*_pack(values, max(kind, self._kind)))
+
+    def add(self, v, backend=None, out=None):
+        """
+        Returns a Vector whose elements are the sum of this Vector's elements
+        and the elements of Vector 'v'.  'backend' names the compute backend
+        to use for this call instead of the active one.  If Vector 'out' is
+        given the sum is written into it, rather than into a new Vector, and
+        it is returned.
+        """
+        if not isinstance(v, Vector):
+            raise TypeError("Other item must be Vector")
+        if self.dimension != v.dimension:
+            raise IndexError("Vectors must be same size.")
+        self._check_out(out)
+        return _call(get_backend(backend).add, self, v, out=out)
+
+    def subtract(self, v, backend=None, out=None):
+        """
+        Returns a Vector whose elements are the difference of this Vector's
+        elements and the elements of Vector 'v', worked out by 'backend' if
+        given.  If Vector 'out' is given the difference is written into it
+        and it is returned.
+        """
+        if not isinstance(v, Vector):
+            raise TypeError("Other item must be Vector")
+        if self.dimension != v.dimension:
+            raise IndexError("Vectors must be same size.")
+        self._check_out(out)
+        return _call(get_backend(backend).subtract, self, v, out=out)
 
     def __add__(self, v):
         """
@@ -81,12 +1140,8 @@ class Vector(object):
         of Vector 'v'.
         """
         if not isinstance(v, Vector):
-            raise TypeError("Other item must be Vector")
-        if self.dimension != v.dimension:
-            raise IndexError("Vectors must be same size.")
-        temp = [self.elements[i] + v.elements[i] for i, j in
-                enumerate(self.elements)]
-        return Vector(temp)
+            return NotImplemented
+        return self.add(v)
 
     def __sub__(self, v):
         """
@@ -95,91 +1150,119 @@ class Vector(object):
         the elements of Vector 'v'.
         """
         if not isinstance(v, Vector):
-            raise TypeError("Other item must be Vector")
-        return self.__add__(v.scale(-1))
+            return NotImplemented
+        return self.subtract(v)
+
+    def __iadd__(self, v):
+        """
+        Use '+=' operator to add Vector 'v' to this Vector in place.
+        """
+        return self.add(v, out=self)
+
+    def __isub__(self, v):
+        """
+        Use '-=' operator to subtract Vector 'v' from this Vector in place.
+        """
+        return self.subtract(v, out=self)
+
+    def __imul__(self, k):
+        """
+        Use '*=' operator to scale this Vector in place by the number 'k'.
+        Anything else is multiplied as by the '*' operator and the result
+        replaces this Vector.
+        """
+        if isinstance(k, Complex):
+            return self.scale_(k)
+        return NotImplemented
 
-    def __mul__(self, m):
+    def __mul__(self, m, backend=None):
         """
         Use '*' operator to multiply things with this Vector.  If 'm' is a
         Matrix then post-multiply it with this Vector.  If 'm' is a Vector
         then return the dot product of this Vector and 'm'.  If 'm' is
         neither a Vector nor a Matrix then attempt to scale this Vector by
-        'm'.
+        'm'.  Other types, such as a SparseMatrix, get to handle the product
+        themselves.  Called directly, 'backend' picks the compute backend.
         """
         if isinstance(m, Vector):
-            return self.__matmul__(m)
+            return self.__matmul__(m, backend)
         elif isinstance(m, Matrix):
             if m.rows != self.dimension:
                 raise IndexError("Matrix is wrong size")
+            return get_backend(backend).vecmat(self, m)
+        elif isinstance(m, Complex):
+            return self.scale(m, backend)
+        return NotImplemented
 
-            # Extract vectors from Matrix
-            vectors = []
-            for c_index in range(m.columns):
-                values = [m[r_index][c_index] for r_index in range(m.rows)]
-                vectors.append(Vector(values))
-
-            # Make a list of dot products
-            products = [self.__matmul__(v) for v in vectors]
-            return Vector(products)
-        else:
-            return self.scale(m)
-
-    def __matmul__(self, v):
+    def __matmul__(self, v, backend=None):
         """
         Use '@' operator to perform a dot product on two Vectors.  Result is
-        returned as an integer.
+        returned as an integer.  Called directly, 'backend' picks the
+        compute backend.
         """
         if not isinstance(v, Vector):
             raise TypeError("Other item must be Vector")
         if self.dimension != v.dimension:
             raise IndexError("Vectors must be same size")
-        return sum([self.elements[i] * v.elements[i] for i in
-                    range(self.dimension)])
+        return get_backend(backend).dot(self, v)
 
-    def scale(self, k):
+    def scale(self, k, backend=None, out=None):
         """
         Returns a Vector where all elements are scaled up/down by the
-        constant 'k'.
+        constant 'k'.  'backend' names the compute backend to use for this
+        call instead of the active one.  If Vector 'out' is given the result
+        is written into it and it is returned.
         """
         if not isinstance(k, Complex):
             raise TypeError('Scalar needs to be a number')
+        self._check_out(out)
+        return _call(get_backend(backend).scale, self, k, out=out)
 
-        new_elements = [k * e for e in self.elements]
-        return Vector(new_elements)
+    def scale_(self, k, backend=None):
+        """
+        Scales all elements of this Vector by the constant 'k' in place and
+        returns this Vector.
+        """
+        return self.scale(k, backend, out=self)
 
-    def magnitude(self):
+    def magnitude(self, backend=None):
         """
-        Finds the magnitude of the Vector and returns it.
+        Finds the magnitude of the Vector and returns it.  The magnitude is
+        cached until the numbers of this Vector change.
         """
-        return math.sqrt(self.__matmul__(Vector(self.elements)))
+        backend = get_backend(backend)
+        return _cached(self, ('magnitude', backend),
+                       lambda: backend.magnitude(self))
 
-    def angle(self, v):
+    def angle(self, v, backend=None):
         """
         Finds the angle between this Vector and Vector 'v'
         and returns it in degrees.
         """
         if not isinstance(v, Vector):
             raise TypeError("Other item must be Vector")
-        top = self.__matmul__(v)
-        bottom = self.magnitude() * v.magnitude()
-        angle = math.acos(top / bottom)
-        # We express our angles in degrees, the way that God
-        # intended for it to be.
-        return math.degrees(angle)
+        if self.dimension != v.dimension:
+            raise IndexError("Vectors must be same size")
+        return get_backend(backend).angle(self, v)
 
-    def unit(self):
+    def unit(self, backend=None):
         """
         Finds the unit vector which is aligned with this Vector and
-        returns is as a new Vector object.
+        returns is as a new Vector object.  The unit vector is cached until
+        the numbers of this Vector, or of the unit vector, change.
         """
-        try:
-            magnitude = self.magnitude()
-            mu = 1 / magnitude
-        except ZeroDivisionError:
-            raise ZeroDivisionError("{} has no unit vector.".format(self))
-        return self.scale(mu)
+        backend = get_backend(backend)
+
+        def unit():
+            try:
+                mu = 1 / self.magnitude(backend)
+            except ZeroDivisionError:
+                raise ZeroDivisionError("{} has no unit vector.".format(self))
+            return backend.scale(self, mu)
 
-    def cross(self, v):
+        return _cached(self, ('unit', backend), unit)
+
+    def cross(self, v, backend=None):
         """
         Returns a Vector which is the result of the cross product of
         this Vector and Vector 'v'.
@@ -188,13 +1271,7 @@ class Vector(object):
 
         if self.dimension != 3 or v.dimension != 3:
             raise IndexError(SIZE_MSG)
-        first = (self.elements[1] * v.elements[2]) - \
-                (self.elements[2] * v.elements[1])
-        second = (self.elements[2] * v.elements[0]) - \
-                 (self.elements[0] * v.elements[2])
-        third = (self.elements[0] * v.elements[1]) - \
-                (self.elements[1] * v.elements[0])
-        return Vector([first, second, third])
+        return get_backend(backend).cross(self, v)
 
 
 class RandomVector(Vector):
@@ -203,68 +1280,394 @@ class RandomVector(Vector):
     contents we only specify the quantity of elements, and the type, and
     the RandomVector is filled with that quantity of the specified type of
     element.
+
+    The numbers are drawn from 'rng', a random.Random, or from a new one
+    seeded with 'seed', or when neither is given from the shared generator
+    of the random module, so random.seed() makes them repeatable.
     """
 
-    def __init__(self, quantity=2, element_type='int'):
-        try:
-            assert isinstance(element_type, str)
-            element_type = element_type.lower()
-            assert element_type in ('int', 'float')
-        except AssertionError:
-            raise TypeError("{} is not a supported element type"
-                            .format(element_type))
+    __slots__ = ()
+
+    def __init__(self, quantity=2, element_type='int', seed=None, rng=None):
+        element_type = _random_type(element_type)
         if not isinstance(quantity, int):
             raise TypeError("Must use int for quantity")
         if quantity < 2:
             raise ValueError("Need at least 2 values")
 
-        seed()
-        if element_type == 'int':
-            values = [randint(-100, 100) for _ in range(quantity)]
-        else:
-            values = [(-100.0 + (random() * 200.0)) for _ in range(quantity)]
-        super().__init__(values)
+        # The numbers were made here so they need no checking
+        self._re, self._im, self._kind = _random_storage(
+            _generator(seed, rng), element_type, quantity)
+        self.dimension = quantity
+        self.index = -1
+        self._version = 0
+        self._cache = None
+        self._shared = False
+
+
+class Matrix(object):
+    """
+    A Matrix is a grid of numbers built up from rows of Vectors.
+
+    The numbers are held in one flat, contiguous, row-major storage buffer
+    (a pair of them for complex numbers) along with the shape of the Matrix
+    and the strides needed to step along a row and down a column.  Indexing
+    a Matrix hands back a row as a Vector which shares that storage.
+
+    A transpose is a view which shares storage with the original Matrix and
+    only swaps the strides.  A Hermitian transpose also sets a flag so the
+    numbers are conjugated as they are read.
+    """
+
+    __slots__ = ('_re', '_im', '_kind', '_strides', '_conj', 'rows',
+                 'columns', '_version', '_cache', '_shared')
+
+    def __init__(self, rows=None):
+        if rows is None:
+            raise IndexError("Need Vector or list of Vectors to form Matrix.")
+        self.columns = 0
+        self.rows = 0
+
+        try:
+            # Creation via list or tuple of Vectors
+            if (isinstance(rows, list) or isinstance(rows, tuple)):
+                # All rows must be Vectors
+                for r in rows:
+                    assert isinstance(r, Vector)
+                # All Vectors must be same size
+                self.columns = rows[0].dimension
+                for r in rows[1:]:
+                    assert self.columns == r.dimension
+                self.rows = len(rows)
+                vectors = rows
+
+            # Creation via single Vector
+            if (isinstance(rows, Vector)):
+                self.columns = rows.dimension
+                self.rows = 1
+                vectors = [rows, ]
+        except AssertionError:
+            raise TypeError("Need Vector or list of Vectors and all Vectors" +
+                            " must be same size.")
+
+        # Input was not a Vector or list/tuple of Vectors
+        if self.columns == 0:
+            raise TypeError("Need Vector or list of Vectors")
+
+        self._re, self._im, self._kind = _stack(vectors)
+        self._strides = (self.columns, 1)
+        self._conj = False
+        self._version = 0
+        self._cache = None
+        self._shared = False
+
+    @classmethod
+    def _adopt(cls, re, im, kind, rows, columns, strides=None, conj=False,
+               version=None):
+        """
+        Builds a Matrix around existing storage buffers without copying or
+        checking them.  Strides default to contiguous row-major order.  If
+        'conj' is True the numbers are conjugated whenever they are read.  A
+        view shares the 'version' of the storage it looks at, and is marked
+        as shared so it never swaps that storage for storage of its own.
+        """
+        m = cls.__new__(cls)
+        m._re, m._im, m._kind = re, im, kind
+        m.rows, m.columns = rows, columns
+        m._strides = strides or (columns, 1)
+        m._conj = conj
+        m._version = 0 if version is None else version
+        m._cache = None
+        m._shared = version is not None
+        return m
+
+    def _touch(self):
+        """
+        Records that the numbers in the storage of this Matrix have changed,
+        so quantities cached from them, here or on any view of the same
+        storage, are worked out again.
+        """
+        if isinstance(self._version, int):
+            self._version += 1
+        else:
+            self._version[0] += 1
+
+    def _renew(self):
+        """
+        Records that this Matrix has taken over new storage.  Views of its
+        old storage are told it changed, and it starts a fresh version.
+        """
+        self._touch()
+        self._version = 0
+        self._cache = None
+
+    def _view_version(self):
+        """
+        Returns the version of this Matrix as the list which views of its
+        storage share, so a change made through any of them is seen by all.
+        The plain int counter of a Matrix which owns its storage is turned
+        into one the first time a view is made.
+        """
+        if isinstance(self._version, int):
+            self._version = [self._version]
+        return self._version
+
+    def _slice(self, start, count, step, kind):
+        """
+        Returns 'count' numbers of storage, beginning at offset 'start' and
+        'step' apart, as a pair of zero-copy (real, imaginary) slices in the
+        form needed by a kernel working in 'kind'.  A Matrix which conjugates
+        its numbers hands back copies instead.
+        """
+        s = slice(start, start + (count - 1) * step + 1, step)
+        re = _view(self._re)[s]
+        im = None if self._im is None else _view(self._im)[s]
+        if self._conj:
+            # Conjugated numbers are copies, so copy both parts alike
+            if im is not None:
+                re, im = array('d', re), array('d', map(neg, im))
+            else:
+                re = [e.conjugate() for e in re]
+        return _parts(re, im, kind)
+
+    def _row(self, i, kind):
+        """
+        Returns row 'i' of this Matrix as (real, imaginary) slices.
+        """
+        row_stride, column_stride = self._strides
+        return self._slice(i * row_stride, self.columns, column_stride, kind)
+
+    def _column(self, j, kind):
+        """
+        Returns column 'j' of this Matrix as (real, imaginary) slices.
+        """
+        row_stride, column_stride = self._strides
+        return self._slice(j * column_stride, self.rows, row_stride, kind)
+
+    def _rows(self, kind):
+        """
+        Returns every row of this Matrix as lists of numbers, given as a pair
+        of (real rows, imaginary rows).  Imaginary rows are None when real.
+        """
+        rows = [self._row(i, kind) for i in range(self.rows)]
+        return _lists(rows)
+
+    def _columns(self, kind):
+        """
+        Returns every column of this Matrix as lists of numbers, given as a
+        pair of (real columns, imaginary columns).  They are a second copy
+        of every number, so they are only cached once a second product
+        gathers them, and then until the numbers of this Matrix change.  A
+        Matrix which is the right operand of many products has its columns
+        gathered twice, while one used once holds on to nothing.  Callers
+        must not change them.
+        """
+        def columns():
+            return _lists([self._column(j, kind) for j in range(self.columns)])
+
+        return _cached(self, ('columns', kind), columns, reused=True)
+
+    def _flat(self):
+        """
+        Returns the numbers of this Matrix, in row-major order, as a tuple of
+        (real, imaginary, kind).  Contiguous storage is returned as is while
+        views are gathered a row at a time into new contiguous buffers, which
+        kernels may read as often as they like.
+        """
+        if self._strides == (self.columns, 1) and not self._conj:
+            return self._re, self._im, self._kind
+        kind = self._kind
+        re = _buffer(kind)
+        im = None if self._im is None else array('d')
+        for i in range(self.rows):
+            row_re, row_im = self._row(i, kind)
+            _extend(re, row_re)
+            if im is not None:
+                _extend(im, row_im)
+        return re, im, kind
+
+    def _strip(self, i, j, count, step):
+        """
+        Returns 'count' numbers of storage, starting at row 'i' and column
+        'j' and 'step' apart, as the (real, imaginary) pair returned by
+        _split().  Nothing is copied, and numbers are not conjugated, which
+        none of the structural checks need.
+        """
+        row_stride, column_stride = self._strides
+        start = i * row_stride + j * column_stride
+        s = slice(start, start + (count - 1) * step + 1, step)
+        re = _view(self._re)[s]
+        im = None if self._im is None else _view(self._im)[s]
+        return _split(re, im, self._kind)
+
+    def _same_layout(self, m):
+        """
+        Returns True if Matrix 'm' lays its numbers out in storage exactly
+        as this Matrix does, such as when both are transposes, so the two
+        can be combined element by element straight from storage.
+        """
+        return (self._strides == m._strides and self._conj == m._conj and
+                self.rows == m.rows and self.columns == m.columns)
+
+    def _elementwise(self, m, kernel, out=None):
+        """
+        Applies element by element storage 'kernel' to this Matrix and Matrix
+        'm', which are the same size, and returns the result as a new Matrix.
+        Matrices laid out alike are combined straight from storage and the
+        result keeps their layout.  Otherwise each is read through its own
+        strides a row at a time, so neither is gathered into a copy first.
+        If Matrix 'out' is given the result is written into it instead.
+        """
+        if self._same_layout(m):
+            storage = kernel((self._re, self._im, self._kind),
+                             (m._re, m._im, m._kind))
+            if out is None:
+                return Matrix._adopt(*storage, self.rows, self.columns,
+                                     self._strides, self._conj)
+            if self._strides == (self.columns, 1) and not self._conj:
+                return _deliver(self, storage, out)
+        return _deliver(self, self._by_rows(m, kernel), out)
 
+    def _by_rows(self, m, kernel):
+        """
+        Applies element by element storage 'kernel' to this Matrix and Matrix
+        'm' one row at a time, reading each row in place through the strides
+        of its Matrix.  Returns the packed result in row-major order.  Should
+        one row need wider storage, such as for integers too large for a
+        typed buffer, the rows before it are widened to match.
+        """
+        kind = None
+        for i in range(self.rows):
+            row_re, row_im, row_kind = kernel(
+                (*self._row(i, self._kind), self._kind),
+                (*m._row(i, m._kind), m._kind))
+            if kind is None:
+                kind = row_kind
+                re = _buffer(kind)
+                im = array('d') if kind == _COMPLEX else None
+            elif row_kind > kind:
+                re, im = _convert(re, im, kind, row_kind)
+                kind = row_kind
+            elif row_kind < kind:
+                row_re, row_im = _convert(row_re, row_im, row_kind, kind)
+            _extend(re, row_re)
+            if im is not None:
+                _extend(im, row_im)
+        return re, im, kind
 
-class Matrix(object):
-    """
-    A Matrix is a list of Vector objects.  Each row in the Matrix is a Vector.
-    """
+    def _write(self, start, count, step, re, im):
+        """
+        Writes 'count' numbers, given as storage buffers 're' and 'im' in
+        the form used by this Matrix, into its storage beginning at offset
+        'start' and 'step' apart.  Numbers are conjugated on the way in if
+        this Matrix conjugates them on the way out.
+        """
+        if self._conj:
+            if im is not None:
+                im = array('d', map(neg, im))
+            else:
+                re = [e.conjugate() for e in re]
+        s = slice(start, start + (count - 1) * step + 1, step)
+        self._re[s] = re
+        if im is not None:
+            self._im[s] = im
+        self._touch()
 
-    def __init__(self, rows=None):
-        if rows is None:
-            raise IndexError("Need Vector or list of Vectors to form Matrix.")
-        self.columns = 0
-        self.rows = 0
+    def _assign(self, re, im, kind):
+        """
+        Overwrites the numbers of this Matrix with those held, in row-major
+        order, in storage buffers 're' and 'im' of 'kind'.  The numbers are
+        written through the strides into the existing storage, so views of
+        it see them, unless they need a wider kind of storage, in which case
+        this Matrix takes the new buffers over.  A Matrix which is a view
+        cannot, so for one TypeError is raised instead.
+        """
+        if kind > self._kind:
+            _check_widen(self, kind)
+            self._re, self._im, self._kind = re, im, kind
+            self._strides = (self.columns, 1)
+            self._conj = False
+            self._renew()
+            return
+        re, im = _convert(re, im, kind, self._kind)
+        row_stride, column_stride = self._strides
+        if (row_stride, column_stride) == (self.columns, 1):
+            self._write(0, len(re), 1, re, im)
+            return
+        c = self.columns
+        for i in range(self.rows):
+            row = slice(i * c, (i + 1) * c)
+            self._write(i * row_stride, c, column_stride, re[row],
+                        None if im is None else im[row])
 
-        try:
-            # Creation via list or tuple of Vectors
-            if (isinstance(rows, list) or isinstance(rows, tuple)):
-                # All rows must be Vectors
-                for r in rows:
-                    assert isinstance(r, Vector)
-                # All Vectors must be same size
-                self.columns = rows[0].dimension
-                for r in rows[1:]:
-                    assert self.columns == r.dimension
-                self.rows = len(rows)
-                self.row_list = [r for r in rows]
+    def _check_out(self, out, rows=None, columns=None):
+        """
+        Raises an exception unless 'out' is None or a Matrix with 'rows' and
+        'columns', which default to the size of this Matrix.
+        """
+        if out is None:
+            return
+        if not isinstance(out, Matrix):
+            raise TypeError("Output must be a Matrix")
+        size = (rows or self.rows, columns or self.columns)
+        if (out.rows, out.columns) != size:
+            raise IndexError("Output Matrix is wrong size")
 
-            # Creation via single Vector
-            if (isinstance(rows, Vector)):
-                self.columns = rows.dimension
-                self.rows = 1
-                self.row_list = [rows, ]
-        except AssertionError:
-            raise TypeError("Need Vector or list of Vectors and all Vectors" +
-                            " must be same size.")
+    @property
+    def row_list(self):
+        """
+        The rows of this Matrix as a list of Vectors sharing its storage.
+        """
+        return [self[i] for i in range(self.rows)]
 
-        # Input was not a Vector or list/tuple of Vectors
-        if self.columns == 0:
-            raise TypeError("Need Vector or list of Vectors")
+    @property
+    def dtype(self):
+        """
+        The type of the numbers held in this Matrix: 'int', 'float',
+        'complex' or 'object' for any other kind of number.
+        """
+        return DTYPES[self._kind]
+
+    def astype(self, dtype):
+        """
+        Returns a copy of this Matrix holding its numbers as 'dtype'.  Only
+        conversions which lose nothing, such as int to float, are allowed.
+        """
+        re, im, kind = self._flat()
+        return Matrix._adopt(*_widened(re, im, kind, dtype), self.rows,
+                             self.columns)
 
     def __getitem__(self, i):
-        return self.row_list[i]
+        if isinstance(i, slice):
+            return self.row_list[i]
+        if i < 0:
+            i += self.rows
+        if not 0 <= i < self.rows:
+            raise IndexError("Matrix row out of range")
+        re, im = self._row(i, self._kind)
+        if self._conj:
+            # Conjugated rows are copies, which writes could not reach
+            re, im = _readonly(re), _readonly(im)
+        return Vector._adopt(re, im, self._kind, self._view_version())
+
+    def __setitem__(self, i, v):
+        """
+        Overwrites row 'i' of this Matrix with the numbers of Vector 'v'.
+        """
+        if not isinstance(v, Vector):
+            raise TypeError("Other item must be Vector")
+        if v.dimension != self.columns:
+            raise IndexError("Vector is wrong size")
+        if i < 0:
+            i += self.rows
+        if not 0 <= i < self.rows:
+            raise IndexError("Matrix row out of range")
+        if v._kind > self._kind:
+            re, im, kind = self._flat()
+            self._assign(*_convert(re, im, kind, v._kind), v._kind)
+        re, im = _convert(v._re, v._im, v._kind, self._kind)
+        row_stride, column_stride = self._strides
+        self._write(i * row_stride, self.columns, column_stride, re, im)
 
     def __str__(self):
         string = "Matrix:\n"
@@ -279,100 +1682,229 @@ class Matrix(object):
         if not.
         """
         if not isinstance(m, Matrix):
+            return NotImplemented
+        if self.rows != m.rows or self.columns != m.columns:
             return False
-        if self.rows != m.rows:
-            return False
-        comparison = [self.row_list[i] == m.row_list[i] for i in
-                      range(self.rows)]
-        return all(comparison)
+        if self._same_layout(m):
+            return _equal((self._re, self._im, self._kind),
+                          (m._re, m._im, m._kind))
+        # Compare a row at a time through the strides, so views are not
+        # copied and the first row which differs ends the comparison
+        for i in range(self.rows):
+            if not _equal((*self._row(i, self._kind), self._kind),
+                          (*m._row(i, m._kind), m._kind)):
+                return False
+        return True
 
-    def __add__(self, m):
+    def add(self, m, backend=None, out=None):
         """
-        Adds this Matrix to Matrix M with the '+' operator.  Returns the result
-        as a new Matrix.
+        Adds Matrix 'm' to this Matrix and returns the result as a new
+        Matrix.  'backend' picks the compute backend for this call.  If
+        Matrix 'out' is given the result is written into it, and it is
+        returned, instead.
         """
         if not isinstance(m, Matrix):
             raise TypeError("Other item must be a Matrix")
-        try:
-            if (self.rows != m.rows) or (self.columns != m.columns):
-                raise IndexError
-            new_rows = [self.row_list[i] + m.row_list[i] for i in
-                        range(self.rows)]
-        except IndexError:
+        if (self.rows != m.rows) or (self.columns != m.columns):
             raise IndexError("Matrices must be same size to add")
+        self._check_out(out)
+        return _call(get_backend(backend).add, self, m, out=out)
+
+    def subtract(self, m, backend=None, out=None):
+        """
+        Subtracts Matrix 'm' from this Matrix, using 'backend' if given, and
+        returns the result as a new Matrix, or writes it into Matrix 'out'
+        if given.
+        """
+        if not isinstance(m, Matrix):
+            raise TypeError("Other item must be a Matrix")
+        if (self.rows != m.rows) or (self.columns != m.columns):
+            raise IndexError("Matrices must be same size to subtract")
+        self._check_out(out)
+        return _call(get_backend(backend).subtract, self, m, out=out)
 
-        return Matrix(new_rows)
+    def __add__(self, m):
+        """
+        Adds this Matrix to Matrix M with the '+' operator.  Returns the result
+        as a new Matrix.  Other types, such as a SparseMatrix, get to handle
+        the sum themselves.
+        """
+        if not isinstance(m, Matrix):
+            return NotImplemented
+        return self.add(m)
+
+    def __iadd__(self, m):
+        """
+        Adds Matrix 'm' to this Matrix in place with the '+=' operator.
+        """
+        if not isinstance(m, Matrix):
+            return NotImplemented
+        return self.add(m, out=self)
 
-    def hadamard(self, m):
+    def hadamard(self, m, backend=None, out=None):
         """
         Performs element by element multiplication between this Matrix and
-        Matrix 'm'.  The result is returned as a new Matrix.
+        Matrix 'm'.  The result is returned as a new Matrix, or written into
+        Matrix 'out' if given.
         """
         if not isinstance(m, Matrix):
             raise TypeError("Other item must be a Matrix")
-        try:
-            new_rows = []
-            if (self.rows != m.rows) or (self.columns != m.columns):
-                raise IndexError
-            for i in range(self.rows):
-                row = []
-                for j in range(self.columns):
-                    row.append(self.row_list[i][j] * m.row_list[i][j])
-                new_rows.append(Vector(row))
-        except IndexError:
+        if (self.rows != m.rows) or (self.columns != m.columns):
             raise IndexError("Matrices must be same size")
+        self._check_out(out)
+        return _call(get_backend(backend).hadamard, self, m, out=out)
 
-        return Matrix(new_rows)
+    def hadamard_(self, m, backend=None):
+        """
+        Multiplies this Matrix element by element by Matrix 'm' in place and
+        returns this Matrix.
+        """
+        return self.hadamard(m, backend, out=self)
 
-    def scale(self, k):
+    def scale(self, k, backend=None, out=None):
         """
         Scales each element within this Matrix by the value 'k' and returns
-        the result as a new Matrix.
+        the result as a new Matrix, or writes it into Matrix 'out' if given.
+        If 'k' is a Matrix then each row of this Matrix is multiplied by
+        'k', which is the same as multiplying this Matrix by the transpose
+        of 'k'.
         """
         if isinstance(k, Matrix):
-            new_rows = [k * r for r in self.row_list]
-        else:
-            new_rows = [r.scale(k) for r in self.row_list]
-        return Matrix(new_rows)
+            return self.multiply(k.transpose(), backend=backend, out=out)
+        if not isinstance(k, Complex):
+            raise TypeError('Scalar needs to be a number')
+        self._check_out(out)
+        return _call(get_backend(backend).scale, self, k, out=out)
+
+    def scale_(self, k, backend=None):
+        """
+        Scales each element within this Matrix by the value 'k' in place and
+        returns this Matrix.
+        """
+        return self.scale(k, backend, out=self)
 
     def __sub__(self, m):
         """
         Subtract Matrix 'm' from this Matrix with the '-' operator.
         Returns the result as a new Matrix.
         """
-        return self.__add__(m.scale(-1))
+        if not isinstance(m, Matrix):
+            return NotImplemented
+        return self.subtract(m)
+
+    def __isub__(self, m):
+        """
+        Subtracts Matrix 'm' from this Matrix in place with the '-='
+        operator.
+        """
+        if not isinstance(m, Matrix):
+            return NotImplemented
+        return self.subtract(m, out=self)
+
+    def __imul__(self, m):
+        """
+        Use '*=' operator to scale this Matrix in place by a number, or to
+        post-multiply it in place by a square Matrix.  Anything else is
+        multiplied as by the '*' operator and the result replaces this
+        Matrix.
+        """
+        if isinstance(m, Complex):
+            return self.scale_(m)
+        if isinstance(m, Matrix) and m.rows == m.columns == self.columns:
+            return self.multiply(m, out=self)
+        return NotImplemented
 
-    def __mul__(self, m):
+    def __mul__(self, m, backend=None):
         """
         Use '*' operator to multiply things with this Matrix.  If 'm' is a
         Matrix then post-multiply it with this Matrix.  If 'm' is a Vector
-        then post-multiply it with this Matrix.  If 'm' is not a Vector or
-        a Matrix then attempt to scale this Matrix with 'm'.
+        then post-multiply it with this Matrix.  If 'm' is a number then
+        scale this Matrix with 'm'.  Other types, such as a SparseMatrix,
+        get to handle the product themselves.  Called directly, 'backend'
+        picks the compute backend.
         """
         if isinstance(m, Vector):
             if self.columns != m.dimension:
                 raise IndexError("Vector is wrong size")
-
-            elements = [r @ m for r in self.row_list]
-            return Vector(elements)
+            return get_backend(backend).matvec(self, m)
         elif isinstance(m, Matrix):
-            if m.rows != self.columns:
-                raise IndexError("Matrix is wrong size")
+            return self.multiply(m, backend=backend)
+        elif isinstance(m, Complex):
+            return self.scale(m, backend)
+        return NotImplemented
 
-            # Column Vectors from 'm'
-            vectors = []
-            for c_index in range(m.columns):
-                values = [m[r_index][c_index] for r_index in range(m.rows)]
-                vectors.append(Vector(values))
-
-            # Find products and build resulting Matrix
-            new_rows = []
-            for r in self.row_list:
-                row = [r @ v for v in vectors]
-                new_rows.append(Vector(row))
-            return Matrix(new_rows)
-        else:
-            return self.scale(m)
+    def multiply(self, m, method=None, block_size=None, cutoff=None,
+                 workers=None, backend=None, out=None):
+        """
+        Post-multiplies Matrix 'm' with this Matrix and returns the product
+        as a new Matrix.  This is what the '*' operator uses.  'method' may
+        be 'classic', 'tiled', 'strassen', 'parallel' or 'auto', which tiles
+        products past TILED_THRESHOLD if that is set, and defaults to
+        MULTIPLY_METHOD.  Tiles are 'block_size' on a side, or BLOCK_SIZE if
+        not given.  Strassen recursion stops at 'cutoff', or STRASSEN_CUTOFF
+        if not given.  Parallel products use 'workers' processes, or WORKERS
+        if not given.  These only steer the plain Python backend; 'backend'
+        picks another one for this call.  If Matrix 'out' is given the
+        product is written into it, and it is returned, instead.  'out' may
+        be this Matrix.
+        """
+        if not isinstance(m, Matrix):
+            raise TypeError("Other item must be a Matrix")
+        if m.rows != self.columns:
+            raise IndexError("Matrix is wrong size")
+        if method not in (None, 'auto', 'classic', 'tiled', 'strassen',
+                          'parallel'):
+            raise ValueError("Unknown multiply method {}".format(method))
+        self._check_out(out, self.rows, m.columns)
+        product = get_backend(backend).matmul(self, m, method, block_size,
+                                              cutoff, workers)
+        if out is None:
+            return product
+        return _deliver(product, product._flat(), out)
+
+    def _check_same_size(self, m):
+        """
+        Raises an exception unless 'm' is a Matrix the same size as this one.
+        """
+        if not isinstance(m, Matrix):
+            raise TypeError("Other item must be a Matrix")
+        if (self.rows != m.rows) or (self.columns != m.columns):
+            raise IndexError("Matrices must be same size")
+
+    def rowwise_dot(self, m, backend=None):
+        """
+        Finds the dot product of each row of this Matrix with the same row of
+        Matrix 'm' and returns them all, in one pass, as a Vector.  The same
+        as Vector([self[i] @ m[i] for i in range(self.rows)]).
+        """
+        self._check_same_size(m)
+        return get_backend(backend).rowwise_dot(self, m)
+
+    def rowwise_norm(self, backend=None):
+        """
+        Finds the magnitude of each row of this Matrix and returns them all
+        as a Vector.
+        """
+        return get_backend(backend).rowwise_norm(self)
+
+    def rowwise_angle(self, m, backend=None):
+        """
+        Finds the angle, in degrees, between each row of this Matrix and the
+        same row of Matrix 'm' and returns them all as a Vector.
+        """
+        self._check_same_size(m)
+        return get_backend(backend).rowwise_angle(self, m)
+
+    def rowwise_cross(self, m, backend=None):
+        """
+        Finds the cross product of each row of this Matrix with the same row
+        of Matrix 'm' and returns them all as the rows of a new Matrix.  Both
+        Matrices must be stacks of 3D Vectors.
+        """
+        self._check_same_size(m)
+        if self.columns != 3:
+            raise IndexError("Cross product only valid for 3D Vector")
+        return get_backend(backend).rowwise_cross(self, m)
 
     def _matrix_not_square(self):
         """
@@ -388,22 +1920,52 @@ class Matrix(object):
         """
         if self._matrix_not_square():
             raise TypeError("Identity only valid on square Matrix")
-        new_rows = []
-        one_index = 0
-        for r in self.row_list:
-            temp = [0] * self.columns
-            temp[one_index] = 1
-            one_index += 1
-            new_rows.append(Vector(temp))
-        return Matrix(new_rows)
+        n = self.rows
+        re = array('q', [0]) * (n * n)
+        re[::n + 1] = array('q', [1]) * n
+        return Matrix._adopt(re, None, _INT, n, n)
 
     def shift(self, k):
         """
         Uses constant 'k' to shift the Matrix.  Result is returned as new
-        Matrix.
+        Matrix.  This is the same as adding 'k' times the identity Matrix,
+        but only the diagonal is worked on.
         """
-        m1 = self.identity()
-        return self.__add__(m1.scale(k))
+        if self._matrix_not_square():
+            raise TypeError("Shift only valid on square Matrix")
+        if not isinstance(k, Complex):
+            raise TypeError('Scalar needs to be a number')
+        return self._plus_diagonal([k] * self.rows)
+
+    def _plus_diagonal(self, diagonal):
+        """
+        Returns a new Matrix which is this Matrix with the numbers in list
+        'diagonal' added along its diagonal.  Everything else is copied
+        across as it is.
+        """
+        kind = max(self._kind, _kind_of(diagonal))
+        step = self.columns + 1
+        re, im = _parts(*self._flat()[:2], kind)
+        if kind == _COMPLEX:
+            re = array('d', re)
+            im = array('d', bytes(8 * len(re)) if im is None else im)
+            for i, x in enumerate(diagonal):
+                re[i * step] += x.real
+                im[i * step] += x.imag
+            return Matrix._adopt(re, im, kind, self.rows, self.columns)
+        if kind != _OBJECT:
+            try:
+                re = array('q' if kind == _INT else 'd', re)
+                for i, x in enumerate(diagonal):
+                    re[i * step] += x
+                return Matrix._adopt(re, None, kind, self.rows, self.columns)
+            except OverflowError:
+                kind = _OBJECT
+                re, im = _parts(*self._flat()[:2], kind)
+        re = list(re)
+        for i, x in enumerate(diagonal):
+            re[i * step] += x
+        return Matrix._adopt(re, None, kind, self.rows, self.columns)
 
     def transpose(self):
         """
@@ -412,13 +1974,20 @@ class Matrix(object):
         second row of this Matrix is the second column of the transpose, and
         so on.
 
-        This is NOT a Hermitian transpose.
+        The transpose is a view which shares storage with this Matrix, so
+        nothing is copied.  This is NOT a Hermitian transpose.  The same view
+        is handed back until the numbers of this Matrix change.
+        """
+        return _cached(self, 'transpose', self._transpose)
+
+    def _transpose(self):
         """
-        new_rows = []
-        for c in range(self.columns):
-            temp = [self.row_list[r][c] for r in range(self.rows)]
-            new_rows.append(Vector(temp))
-        return Matrix(new_rows)
+        Builds a new transpose view of this Matrix.
+        """
+        row_stride, column_stride = self._strides
+        return Matrix._adopt(self._re, self._im, self._kind, self.columns,
+                             self.rows, (column_stride, row_stride),
+                             self._conj, self._view_version())
 
     def ht(self):
         """
@@ -426,26 +1995,34 @@ class Matrix(object):
         a new Matrix.  The first row of this Matrix is the first column of
         the transpose, the second row of this Matrix is the second column
         of the transpose, and so on.
+
+        The Hermitian transpose is a view which shares storage with this
+        Matrix and conjugates numbers as they are read.  Its rows are
+        conjugated copies, so they are read-only; write through the view
+        itself, as in m.ht()[i] = v, instead.  Real numbers are their own
+        conjugates so for a real Matrix this is just the transpose.
         """
-        new_rows = []
-        for c in range(self.columns):
-            temp = [complex(self.row_list[r][c]).conjugate() for r in
-                    range(self.rows)]
-            new_rows.append(Vector(temp))
-        return Matrix(new_rows)
+        if self._kind not in (_COMPLEX, _OBJECT):
+            return self.transpose()
+
+        def ht():
+            m = self._transpose()
+            m._conj = not self._conj
+            return m
+
+        return _cached(self, 'ht', ht)
 
-    def diagonal(self):
+    def diagonal(self, backend=None):
         """
-        Finds the diagonal of the Matrix and returns it as a Vector.
+        Finds the diagonal of the Matrix and returns it as a Vector.  The
+        diagonal is cached until the numbers of this Matrix, or of the
+        diagonal, change.
         """
-        elements = []
-        column_index = 0
-        for r in range(self.rows):
-            elements.append(self.row_list[r][column_index])
-            column_index += 1
-        return Vector(elements)
+        backend = get_backend(backend)
+        return _cached(self, ('diagonal', backend),
+                       lambda: backend.diagonal(self))
 
-    def trace(self):
+    def trace(self, backend=None):
         """
         Finds the trace of the Matrix (sum of elements on the diagonal)
         and returns this as an integer/float (depends on what is on the
@@ -453,4 +2030,367 @@ class Matrix(object):
         """
         if self._matrix_not_square():
             raise TypeError("Trace only valid on square Matrix")
-        return sum(self.diagonal().elements)
+        backend = get_backend(backend)
+        return _cached(self, ('trace', backend), lambda: backend.trace(self))
+
+    def is_symmetric(self, tolerance=None):
+        """
+        Returns True if this Matrix is square and equal to its transpose, to
+        within 'tolerance' (TOLERANCE by default).  Each row to the right of
+        the diagonal is compared straight from storage with the column below
+        it, so nothing is copied and the first mismatch ends the check.
+        """
+        if self._matrix_not_square():
+            return False
+        n = self.rows
+        row_stride, column_stride = self._strides
+        for i in range(n - 1):
+            if not _all_close(self._strip(i, i + 1, n - i - 1, column_stride),
+                              self._strip(i + 1, i, n - i - 1, row_stride),
+                              tolerance):
+                return False
+        return True
+
+    def is_hermitian(self, tolerance=None):
+        """
+        Returns True if this Matrix is square and equal to its Hermitian
+        transpose, to within 'tolerance'.  Like is_symmetric() this only
+        visits each number once, with the diagonal checked to be real.  A
+        real Matrix is Hermitian when it is symmetric.
+        """
+        if self._kind < _COMPLEX:
+            return self.is_symmetric(tolerance)
+        if self._matrix_not_square():
+            return False
+        n = self.rows
+        row_stride, column_stride = self._strides
+        _, im = self._strip(0, 0, n, row_stride + column_stride)
+        if not _all_zero((im, None), tolerance):
+            return False
+        for i in range(n - 1):
+            re, im = self._strip(i + 1, i, n - i - 1, row_stride)
+            if not _all_close(self._strip(i, i + 1, n - i - 1, column_stride),
+                              (re, map(neg, im)), tolerance):
+                return False
+        return True
+
+    def is_upper_triangular(self, tolerance=None):
+        """
+        Returns True if every number below the diagonal is zero, to within
+        'tolerance'.  The check stops at the first number which is not.
+        """
+        row_stride, _ = self._strides
+        for j in range(min(self.rows - 1, self.columns)):
+            if not _all_zero(self._strip(j + 1, j, self.rows - j - 1,
+                                         row_stride), tolerance):
+                return False
+        return True
+
+    def is_lower_triangular(self, tolerance=None):
+        """
+        Returns True if every number above the diagonal is zero, to within
+        'tolerance'.  The check stops at the first number which is not.
+        """
+        _, column_stride = self._strides
+        for i in range(min(self.columns - 1, self.rows)):
+            if not _all_zero(self._strip(i, i + 1, self.columns - i - 1,
+                                         column_stride), tolerance):
+                return False
+        return True
+
+    def is_diagonal(self, tolerance=None):
+        """
+        Returns True if every number off the diagonal is zero, to within
+        'tolerance'.
+        """
+        return (self.is_upper_triangular(tolerance) and
+                self.is_lower_triangular(tolerance))
+
+
+class RandomMatrix(Matrix):
+    """
+    A RandomMatrix is like a Matrix except that instead of rows of Vectors
+    we only specify its size, square unless 'columns' is given, and the type
+    of element, and it is filled with random numbers as a RandomVector is.
+    Every number is drawn in one pass over the storage.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, rows=2, columns=None, element_type='int', seed=None,
+                 rng=None):
+        element_type = _random_type(element_type)
+        if columns is None:
+            columns = rows
+        if not (isinstance(rows, int) and isinstance(columns, int)):
+            raise TypeError("Must use int for rows and columns")
+        if rows < 1 or columns < 2:
+            raise ValueError("Need at least 1 row and 2 columns")
+
+        self._re, self._im, self._kind = _random_storage(
+            _generator(seed, rng), element_type, rows * columns)
+        self.rows, self.columns = rows, columns
+        self._strides = (columns, 1)
+        self._conj = False
+        self._version = 0
+        self._cache = None
+        self._shared = False
+
+
+class PythonBackend(object):
+    """
+    The reference compute backend.  It does all of its work in plain Python
+    straight on the storage buffers of Vectors and Matrices.  Operands have
+    already been checked by the Vector or Matrix method which called it.
+    Other backends can inherit from it and override what they do faster.
+    """
+
+    name = 'python'
+
+    def add(self, a, b, out=None):
+        """
+        Adds two Vectors, or two Matrices, and returns the sum.  If 'out' is
+        given the sum is written into it and 'out' is returned.  The same
+        goes for the other element by element operations.
+        """
+        return self._combine(a, b, add, out)
+
+    def subtract(self, a, b, out=None):
+        """
+        Subtracts Vector or Matrix 'b' from 'a' and returns the difference.
+        """
+        return self._combine(a, b, sub, out)
+
+    def _combine(self, a, b, op, out):
+        """
+        Adds or subtracts, with 'op', two Vectors or two Matrices.
+        """
+        if isinstance(a, Matrix):
+            return a._elementwise(b, partial(_combine, op=op), out)
+        return _deliver(a, _combine((a._re, a._im, a._kind),
+                                    (b._re, b._im, b._kind), op), out)
+
+    def hadamard(self, a, b, out=None):
+        """
+        Multiplies two Matrices element by element.
+        """
+        return a._elementwise(b, _product, out)
+
+    def scale(self, a, k, out=None):
+        """
+        Multiplies every element of Vector or Matrix 'a' by the number 'k'.
+        """
+        if isinstance(a, Matrix):
+            return _deliver(a, _scaled(a._flat(), k), out)
+        return _deliver(a, _scaled((a._re, a._im, a._kind), k), out)
+
+    def dot(self, a, b):
+        """
+        Returns the dot product of two Vectors.
+        """
+        kind = max(a._kind, b._kind)
+        return _dot(*_parts(a._re, a._im, kind), *_parts(b._re, b._im, kind))
+
+    def vecmat(self, v, m):
+        """
+        Pre-multiplies Matrix 'm' by Vector 'v' and returns a Vector.  Each
+        element is a dot product against a column of 'm', from the columns
+        it keeps cached.
+        """
+        kind = max(v._kind, m._kind)
+        parts = _parts(v._re, v._im, kind)
+        re, im = m._columns(kind)
+        return Vector._adopt(*_pack([_dot(*parts, *column) for column in
+                                     zip(re, im or repeat(None))], kind))
+
+    def matvec(self, m, v):
+        """
+        Post-multiplies Vector 'v' with Matrix 'm' and returns a Vector.
+        """
+        kind = max(v._kind, m._kind)
+        parts = _parts(v._re, v._im, kind)
+        return Vector._adopt(*_pack([_dot(*m._row(i, kind), *parts)
+                                     for i in range(m.rows)], kind))
+
+    def matmul(self, a, b, method=None, block_size=None, cutoff=None,
+               workers=None):
+        """
+        Multiplies Matrix 'a' by Matrix 'b' with the kernel chosen by
+        'method' and returns the product.
+        """
+        return Matrix._adopt(*_matmul(a, b, method, block_size, cutoff,
+                                      workers), a.rows, b.columns)
+
+    def diagonal(self, m):
+        """
+        Returns the diagonal of Matrix 'm' as a Vector.
+        """
+        row_stride, column_stride = m._strides
+        n = min(m.rows, m.columns)
+        return Vector._adopt(*_pack(_values(*m._slice(
+            0, n, row_stride + column_stride, m._kind)), m._kind))
+
+    def trace(self, m):
+        """
+        Returns the sum of the diagonal of square Matrix 'm'.
+        """
+        return sum(self.diagonal(m).elements)
+
+    def magnitude(self, v):
+        """
+        Returns the magnitude of Vector 'v'.
+        """
+        return math.sqrt(self.dot(v, v))
+
+    def angle(self, a, b):
+        """
+        Returns the angle between Vectors 'a' and 'b' in degrees.  The
+        magnitudes of both Vectors come from their caches.
+        """
+        top = self.dot(a, b)
+        bottom = a.magnitude(self) * b.magnitude(self)
+        angle = math.acos(top / bottom)
+        # We express our angles in degrees, the way that God
+        # intended for it to be.
+        return math.degrees(angle)
+
+    def cross(self, a, b):
+        """
+        Returns the cross product of 3D Vectors 'a' and 'b'.
+        """
+        kind = max(a._kind, b._kind)
+        a = a.elements
+        b = b.elements
+        first = (a[1] * b[2]) - (a[2] * b[1])
+        second = (a[2] * b[0]) - (a[0] * b[2])
+        third = (a[0] * b[1]) - (a[1] * b[0])
+        return Vector._adopt(*_pack([first, second, third], kind))
+
+    def rowwise_dot(self, a, b):
+        """
+        Returns the dot products of matching rows of Matrices 'a' and 'b' as
+        a Vector.
+        """
+        kind = max(a._kind, b._kind)
+        return Vector._adopt(*_pack([_dot(*a._row(i, kind), *b._row(i, kind))
+                                     for i in range(a.rows)], kind))
+
+    def rowwise_norm(self, m):
+        """
+        Returns the magnitude of every row of Matrix 'm' as a Vector.
+        """
+        return Vector._adopt(array('d', map(math.sqrt,
+                                            self.rowwise_dot(m, m).elements)),
+                             None, _FLOAT)
+
+    def rowwise_angle(self, a, b):
+        """
+        Returns the angles, in degrees, between matching rows of Matrices 'a'
+        and 'b' as a Vector.
+        """
+        tops = self.rowwise_dot(a, b).elements
+        bottoms = map(mul, self.rowwise_norm(a).elements,
+                      self.rowwise_norm(b).elements)
+        return Vector._adopt(array('d', [math.degrees(math.acos(t / b))
+                                         for t, b in zip(tops, bottoms)]),
+                             None, _FLOAT)
+
+    def rowwise_cross(self, a, b):
+        """
+        Returns the cross products of matching rows of Matrices 'a' and 'b',
+        which have 3 columns, as the rows of a new Matrix.
+        """
+        kind = max(a._kind, b._kind)
+        ax, ay, az = [_values(*a._column(j, kind)) for j in range(3)]
+        bx, by, bz = [_values(*b._column(j, kind)) for j in range(3)]
+        first = map(sub, map(mul, ay, bz), map(mul, az, by))
+        second = map(sub, map(mul, az, bx), map(mul, ax, bz))
+        third = map(sub, map(mul, ax, by), map(mul, ay, bx))
+        values = [x for row in zip(first, second, third) for x in row]
+        return Matrix._adopt(*_pack(values, kind), a.rows, 3)
+
+
+# Registered compute backends, by name, as the factories which build them
+# and as the backends themselves once they have been built.
+_BACKENDS = {}
+_LOADED = {}
+
+# Backend made active by use_backend() for the current thread or task.
+_ACTIVE = ContextVar('linear_backend', default=None)
+
+# Backend used when use_backend() is not in effect.  Set it with
+# set_backend() or the LINEAR_BACKEND environment variable.
+DEFAULT_BACKEND = os.environ.get('LINEAR_BACKEND', 'python')
+
+
+def register_backend(name, factory):
+    """
+    Registers a compute backend under 'name'.  'factory' is called with no
+    arguments the first time the backend is needed and must return it, so
+    a backend class can be registered directly.
+    """
+    _BACKENDS[name] = factory
+    _LOADED.pop(name, None)
+
+
+def backends():
+    """
+    Returns the names of all registered compute backends.
+    """
+    return list(_BACKENDS)
+
+
+def get_backend(backend=None):
+    """
+    Returns the compute backend called 'backend', or the active backend if
+    'backend' is None.  A backend object is handed back unchanged.  Raises
+    ValueError for an unknown name, and ImportError if the backend needs a
+    package which is not installed.
+    """
+    if backend is None:
+        backend = _ACTIVE.get() or DEFAULT_BACKEND
+    if not isinstance(backend, str):
+        return backend
+    try:
+        return _LOADED[backend]
+    except KeyError:
+        pass
+    if backend not in _BACKENDS:
+        raise ValueError("Unknown backend {}".format(backend))
+    _LOADED[backend] = _BACKENDS[backend]()
+    return _LOADED[backend]
+
+
+def set_backend(backend):
+    """
+    Makes 'backend' the default compute backend for later operations.
+    """
+    global DEFAULT_BACKEND
+    get_backend(backend)
+    DEFAULT_BACKEND = backend
+
+
+@contextmanager
+def use_backend(backend):
+    """
+    Makes 'backend' the active compute backend inside a with block.  The
+    backend in use before the block is restored when it ends.
+    """
+    active = get_backend(backend)
+    token = _ACTIVE.set(backend)
+    try:
+        yield active
+    finally:
+        _ACTIVE.reset(token)
+
+
+def _numpy_backend():
+    """
+    Builds the NumPy backend, which needs NumPy to be installed.
+    """
+    from numpy_backend import NumpyBackend
+    return NumpyBackend()
+
+
+register_backend('python', PythonBackend)
+register_backend('numpy', _numpy_backend)
@@ -0,0 +1,208 @@
+"""
+LU decomposition of square Matrices, for solving linear systems and finding
+determinants and inverses.
+
+An LU is worked out once from a Matrix A with partial pivoting, so that
+P A = L U where P reorders the rows, L is lower triangular with ones on its
+diagonal and U is upper triangular.  Working that out costs O(n^3), after
+which every solve costs only O(n^2):
+
+    factors = lu(a)
+    x = factors.solve(b)
+    y = factors.solve(c)
+
+lu() keeps the factorization cached on the Matrix until its numbers change,
+so solve(), det() and inverse() called on the same Matrix again reuse it.
+
+Integers are factorized as floats, though det() of an int Matrix is rounded
+back to an int.  Any other kind of number, such as a Fraction, is worked
+with as it is, so Fractions give exact answers.
+
+A Matrix is singular when a pivot is zero, or for floats when it is no
+bigger than the rounding error of the elimination: n times the machine
+epsilon times the largest row sum of the Matrix.  Rounding leaves what
+should cancel to zero as a tiny number instead, while a Matrix which is
+only badly scaled is still solved.
+"""
+import sys
+from functools import reduce
+from operator import mul
+
+from linear import (Matrix, Vector, _FLOAT, _INT, _OBJECT,
+                    _cached, _pack)
+
+
+def _numbers(re, im):
+    """
+    Joins lists of real parts 're' and imaginary parts 'im' into a list of
+    plain numbers.
+    """
+    return re if im is None else list(map(complex, re, im))
+
+
+class LU(object):
+    """
+    The LU decomposition, with partial pivoting, of a square Matrix.  The
+    factors are held as one grid of row lists: U on and above the diagonal
+    and the multipliers of L below it.  'pivots' gives, for each row of the
+    factors, the row of the Matrix it came from.
+    """
+
+    __slots__ = ('size', 'pivots', 'singular', '_kind', '_grid', '_sign',
+                 '_integers')
+
+    def __init__(self, matrix):
+        if not isinstance(matrix, Matrix):
+            raise TypeError("LU decomposition needs a Matrix")
+        if matrix.rows != matrix.columns:
+            raise TypeError("LU decomposition only valid on square Matrix")
+        n = self.size = matrix.rows
+        self._kind = kind = max(matrix._kind, _FLOAT)
+        re, im = matrix._rows(kind)
+        if matrix._kind == _INT:
+            re = [list(map(float, row)) for row in re]
+        grid = [_numbers(r, None if im is None else im[i])
+                for i, r in enumerate(re)]
+        # Generic numbers, such as Fractions, are exact so only zero is zero
+        tolerance = 0 if kind == _OBJECT else (
+            n * sys.float_info.epsilon *
+            max(sum(map(abs, row)) for row in grid))
+        pivots = list(range(n))
+        sign = 1
+        singular = False
+        for k in range(n):
+            p = max(range(k, n), key=lambda i: abs(grid[i][k]))
+            if abs(grid[p][k]) <= tolerance:
+                # Nothing left to eliminate with in this column
+                singular = True
+                continue
+            if p != k:
+                grid[k], grid[p] = grid[p], grid[k]
+                pivots[k], pivots[p] = pivots[p], pivots[k]
+                sign = -sign
+            top = grid[k]
+            pivot = top[k]
+            tail = top[k + 1:]
+            for row in grid[k + 1:]:
+                f = row[k] / pivot
+                row[k] = f
+                if f:
+                    row[k + 1:] = [x - f * y for x, y in
+                                   zip(row[k + 1:], tail)]
+        self.pivots = pivots
+        self.singular = singular
+        self._grid = grid
+        self._sign = sign
+        self._integers = matrix._kind == _INT
+
+    def lower(self):
+        """
+        Returns L, with ones on its diagonal, as a Matrix.
+        """
+        n = self.size
+        values = [row[j] if j < i else (1 if j == i else 0)
+                  for i, row in enumerate(self._grid) for j in range(n)]
+        return Matrix._adopt(*_pack(values, self._kind), n, n)
+
+    def upper(self):
+        """
+        Returns U as a Matrix.
+        """
+        n = self.size
+        values = [row[j] if j >= i else 0
+                  for i, row in enumerate(self._grid) for j in range(n)]
+        return Matrix._adopt(*_pack(values, self._kind), n, n)
+
+    def det(self):
+        """
+        Returns the determinant of the Matrix, the product of the diagonal
+        of U with the sign of the row swaps, or 0 if it is singular.  The
+        determinant of an int Matrix is an int.
+        """
+        if self.singular:
+            return 0
+        d = reduce(mul, (row[i] for i, row in enumerate(self._grid)),
+                   self._sign)
+        return round(d) if self._integers else d
+
+    def _solve(self, b):
+        """
+        Solves for one right hand side, given as a list of numbers, by
+        substituting forward through L and back through U.
+        """
+        grid = self._grid
+        y = [b[p] for p in self.pivots]
+        for i, row in enumerate(grid):
+            y[i] -= sum(map(mul, row[:i], y[:i]))
+        for i in range(self.size - 1, -1, -1):
+            row = grid[i]
+            y[i] = (y[i] - sum(map(mul, row[i + 1:], y[i + 1:]))) / row[i]
+        return y
+
+    def solve(self, b):
+        """
+        Solves A x = b, where A is the factorized Matrix, and returns x.
+        'b' is a Vector, giving a Vector, or a Matrix whose columns are each
+        solved for, giving a Matrix.  Raises ValueError if A is singular.
+        """
+        if self.singular:
+            raise ValueError("Matrix is singular")
+        if isinstance(b, Vector):
+            if b.dimension != self.size:
+                raise IndexError("Vector is wrong size")
+            kind = max(self._kind, b._kind)
+            return Vector._adopt(*_pack(self._solve(b.elements), kind))
+        if not isinstance(b, Matrix):
+            raise TypeError("Can only solve for a Vector or a Matrix")
+        if b.rows != self.size:
+            raise IndexError("Matrix is wrong size")
+        kind = max(self._kind, b._kind)
+        re, im = b._columns(b._kind)
+        columns = [self._solve(_numbers(r, None if im is None else im[j]))
+                   for j, r in enumerate(re)]
+        values = [column[i] for i in range(self.size) for column in columns]
+        return Matrix._adopt(*_pack(values, kind), b.rows, b.columns)
+
+    def inverse(self):
+        """
+        Returns the inverse of the factorized Matrix as a new Matrix.
+        Raises ValueError if it is singular.
+        """
+        if self.singular:
+            raise ValueError("Matrix is singular")
+        n = self.size
+        columns = [self._solve([1 if i == j else 0 for i in range(n)])
+                   for j in range(n)]
+        values = [column[i] for i in range(n) for column in columns]
+        return Matrix._adopt(*_pack(values, self._kind), n, n)
+
+
+def lu(matrix):
+    """
+    Returns the LU decomposition of square Matrix 'matrix'.  It is cached on
+    the Matrix and worked out again only once its numbers change.
+    """
+    if not isinstance(matrix, Matrix):
+        raise TypeError("LU decomposition needs a Matrix")
+    return _cached(matrix, 'lu', lambda: LU(matrix))
+
+
+def solve(matrix, b):
+    """
+    Solves matrix * x = b for x, a Vector or Matrix shaped like 'b'.
+    """
+    return lu(matrix).solve(b)
+
+
+def det(matrix):
+    """
+    Returns the determinant of square Matrix 'matrix'.
+    """
+    return lu(matrix).det()
+
+
+def inverse(matrix):
+    """
+    Returns the inverse of square Matrix 'matrix'.
+    """
+    return lu(matrix).inverse()
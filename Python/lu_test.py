@@ -0,0 +1,118 @@
+import unittest
+from fractions import Fraction
+from linear import Vector, Matrix, RandomMatrix, RandomVector
+from lu import LU, lu, solve, det, inverse
+
+
+# unittest requires CamelCase
+class TestLU(unittest.TestCase):
+    def setUp(self):
+        self.m1 = Matrix([Vector([2, 1, 1]),
+                          Vector([4, -6, 0]),
+                          Vector([-2, 7, 2])])
+        self.m2 = Matrix([Vector([1j, 2]),
+                          Vector([3, 4 - 1j])])
+        self.m3 = Matrix([Vector([Fraction(1), Fraction(2)]),
+                          Vector([Fraction(3), Fraction(4)])])
+
+
+    def tearDown(self):
+        del self.m1
+        del self.m2
+        del self.m3
+
+
+    def test_factors(self):
+        factors = LU(self.m1)
+        permuted = Matrix([self.m1[p] for p in factors.pivots])
+        self.assertEqual(factors.lower() * factors.upper(), permuted)
+        self.assertTrue(factors.lower().is_lower_triangular())
+        self.assertTrue(factors.upper().is_upper_triangular())
+        self.assertEqual(factors.lower().diagonal(), Vector([1, 1, 1]))
+        m = RandomMatrix(8, element_type='gaussian', seed=5)
+        factors = LU(m)
+        self.assertEqual(factors.lower() * factors.upper(),
+                         Matrix([m[p] for p in factors.pivots]))
+
+
+    def test_solve(self):
+        b = Vector([5, -2, 9])
+        x = solve(self.m1, b)
+        self.assertEqual(x, Vector([1, 1, 2]))
+        self.assertEqual(self.m1 * x, b)
+        b = Matrix([Vector([5, 1]), Vector([-2, 0]), Vector([9, 2j])])
+        self.assertEqual(self.m1 * solve(self.m1, b), b)
+        self.assertEqual(self.m2 * solve(self.m2, Vector([1, 1])),
+                         Vector([1, 1]))
+        x = solve(self.m3, Vector([1, 1]))
+        self.assertEqual(list(x.elements), [Fraction(-1), Fraction(1)])
+        m = RandomMatrix(12, element_type='float', seed=1)
+        v = RandomVector(12, 'float', seed=2)
+        self.assertEqual(m.transpose() * solve(m.transpose(), v), v)
+
+
+    def test_det_inverse(self):
+        self.assertEqual(det(self.m1), -16)
+        self.assertIsInstance(det(self.m1), int)
+        self.assertEqual(det(self.m3), Fraction(-2))
+        self.assertAlmostEqual(det(self.m2), 1j * (4 - 1j) - 6)
+        identity = self.m1.identity()
+        self.assertEqual(self.m1 * inverse(self.m1), identity)
+        self.assertEqual(inverse(self.m2) * self.m2, self.m2.identity())
+        self.assertEqual(inverse(self.m3), Matrix([
+            Vector([Fraction(-2), Fraction(1)]),
+            Vector([Fraction(3, 2), Fraction(-1, 2)])]))
+
+
+    def test_cache(self):
+        m = Matrix([Vector([4.0, 3.0]), Vector([6.0, 3.0])])
+        factors = lu(m)
+        self.assertIs(lu(m), factors)
+        self.assertAlmostEqual(det(m), -6)
+
+        # Verify that a changed Matrix is factorized again
+        m[0] = Vector([1.0, 0.0])
+        self.assertIsNot(lu(m), factors)
+        self.assertAlmostEqual(det(m), 3)
+        m.transpose().scale_(2)
+        self.assertAlmostEqual(det(m), 12)
+
+
+    def test_errors(self):
+        singular = Matrix([Vector([1, 2]), Vector([2, 4])])
+        self.assertEqual(det(singular), 0)
+        self.assertTrue(lu(singular).singular)
+        self.assertRaises(ValueError, solve, singular, Vector([1, 1]))
+        self.assertRaises(ValueError, inverse, singular)
+
+        # Verify that rounding left over from cancelling is not a pivot
+        for near in (Matrix([Vector([1, 2, 3]), Vector([4, 5, 6]),
+                             Vector([7, 8, 9])]),
+                     Matrix([Vector([0.1, 0.2, 0.3]), Vector([0.4, 0.5, 0.6]),
+                             Vector([0.7, 0.8, 0.9])])):
+            with self.subTest(near=near.dtype):
+                self.assertTrue(lu(near).singular)
+                self.assertEqual(det(near), 0)
+                self.assertRaises(ValueError, inverse, near)
+        self.assertFalse(lu(Matrix([Vector([1e-9, 0]),
+                                    Vector([0, 1e-9])])).singular)
+
+        # Badly scaled Matrices are not singular
+        for scaled in (Matrix([Vector([1000000, 0]), Vector([0, 1])]),
+                       Matrix([Vector([1, 0]), Vector([0, 1e-7])])):
+            with self.subTest(scaled=scaled.dtype):
+                self.assertFalse(lu(scaled).singular)
+                self.assertAlmostEqual(det(scaled), scaled[0][0] *
+                                       scaled[1][1])
+                self.assertEqual(scaled * solve(scaled, Vector([1, 1])),
+                                 Vector([1, 1]))
+        self.assertRaises(TypeError, lu, Matrix([Vector([1, 2, 3]),
+                                                 Vector([4, 5, 6])]))
+        self.assertRaises(TypeError, lu, [[1, 0], [0, 1]])
+        self.assertRaises(IndexError, solve, self.m1, Vector([1, 2]))
+        self.assertRaises(IndexError, solve, self.m1, self.m2)
+        self.assertRaises(TypeError, solve, self.m1, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
 import unittest
+from unittest import mock
 import cmath
-from linear import Vector, Matrix
+from fractions import Fraction
+import linear
+from linear import Vector, Matrix, RandomMatrix, RandomVector
 
 
 # unittest requires CamelCase
@@ -72,6 +75,29 @@ class TestMatrix(unittest.TestCase):
         self.assertEqual(m3.columns, self.v2.dimension)
 
 
+    def test_storage(self):
+        # Verify that a Matrix keeps one flat buffer rather than a Vector
+        # per row.
+        m = Matrix([Vector([1, 2, 3]), Vector([4.5, 5, 6])])
+        self.assertFalse(hasattr(m, '__dict__'))
+        self.assertEqual(list(m[1]), [4.5, 5.0, 6.0])
+
+        # Verify that rows are views which share the Matrix storage
+        row = m[0]
+        row[0] = 10
+        self.assertEqual(m[0][0], 10)
+
+        # Verify that rows can be indexed from the end and past the end
+        self.assertEqual(m[-1], Vector([4.5, 5, 6]))
+        self.assertRaises(IndexError, lambda: m[2])
+        self.assertEqual(m.row_list, [m[0], m[1]])
+
+        # Verify that mixed real and complex rows are stored together
+        c = Matrix([Vector([1, 2]), Vector([complex(0, 1), 3])])
+        self.assertEqual(c[1][0], complex(0, 1))
+        self.assertEqual(c[0], Vector([1, 2]))
+
+
     def test_equal(self):
         # Verify Matrix not equal to non_Matrix object
         self.assertNotEqual(Matrix([self.v2, self.v3]), self.v2)
@@ -144,6 +170,92 @@ class TestMatrix(unittest.TestCase):
         self.assertEqual(m.scale(n), Matrix([Vector([17, 23]),
                                              Vector([39, 53])]))
 
+    def test_in_place(self):
+        # Verify that in-place operators keep the same Matrix and storage
+        ones = Matrix([Vector([1, 1]), Vector([1, 1])])
+        m = Matrix([Vector([1, 2]), Vector([3, 4])])
+        n = m
+        storage = m._re
+        m += ones
+        self.assertIs(m, n)
+        self.assertIs(m._re, storage)
+        self.assertEqual(m, Matrix([Vector([2, 3]), Vector([4, 5])]))
+        m -= ones.scale(2)
+        self.assertEqual(m, Matrix([Vector([0, 1]), Vector([2, 3])]))
+        m *= 2
+        self.assertEqual(m, Matrix([Vector([0, 2]), Vector([4, 6])]))
+        self.assertIs(m.hadamard_(m), n)
+        self.assertEqual(m, Matrix([Vector([0, 4]), Vector([16, 36])]))
+        m *= Matrix([Vector([0, 1]), Vector([1, 0])])
+        self.assertIs(m, n)
+        self.assertEqual(m, Matrix([Vector([4, 0]), Vector([36, 16])]))
+        self.assertIs(m.scale_(0.5), n)
+        self.assertEqual(m, Matrix([Vector([2, 0]), Vector([18, 8])]))
+
+        # Verify that rows can be replaced
+        m[0] = Vector([7, 8])
+        m[-1] += Vector([1, 1])
+        self.assertEqual(m, Matrix([Vector([7, 8]), Vector([19, 9])]))
+        m[1] = Vector([1j, 0])
+        self.assertEqual(m, Matrix([Vector([7, 8]), Vector([1j, 0])]))
+        self.assertRaises(IndexError, lambda: m.__setitem__(2, self.v2))
+        self.assertRaises(IndexError, lambda: m.__setitem__(0, self.v2))
+        self.assertRaises(TypeError, lambda: m.__setitem__(0, [1, 2]))
+
+        # Verify that updating a view writes through to the shared storage
+        base = Matrix([Vector([1, 2, 3]), Vector([4, 5, 6])])
+        t = base.transpose()
+        t += Matrix([Vector([1, 0]), Vector([0, 1]), Vector([1, 1])])
+        self.assertEqual(base, Matrix([Vector([2, 2, 4]),
+                                       Vector([4, 6, 7])]))
+        c = Matrix([Vector([1j, 2]), Vector([3, 4j])])
+        h = c.ht()
+        h += Matrix([Vector([1j, 0]), Vector([0, 0])])
+        self.assertEqual(h, Matrix([Vector([0, 3]), Vector([2, -4j])]))
+        self.assertEqual(c, Matrix([Vector([0, 2]), Vector([3, 4j])]))
+
+        # Verify that a view refuses numbers its storage cannot hold
+        base = Matrix([Vector([1, 2]), Vector([3, 4])])
+        storage = base._re
+        self.assertRaises(TypeError, base[0].scale_, 0.5)
+        self.assertRaises(TypeError, base.transpose().scale_, 0.5)
+        self.assertRaises(TypeError, lambda: base.transpose().__setitem__(
+            0, Vector([0.5, 1])))
+        row = base[1]
+        self.assertRaises(TypeError, row.__iadd__, Vector([1j, 0]))
+        self.assertEqual(base, Matrix([Vector([1, 2]), Vector([3, 4])]))
+        self.assertIs(base._re, storage)
+        base[0].scale_(2)
+        base.transpose().scale_(2)
+        self.assertEqual(base, Matrix([Vector([4, 8]), Vector([6, 8])]))
+
+        # Verify that rows of a Matrix of generic numbers are views too
+        f = Matrix([Vector([Fraction(1, 2), 1]), Vector([2, 3])])
+        f[0].scale_(2)
+        row = f[1]
+        row += Vector([1, 1])
+        self.assertEqual(f, Matrix([Vector([1, 2]), Vector([3, 4])]))
+        f.transpose()[1].scale_(Fraction(1, 2))
+        self.assertEqual(f[0][1], 1)
+        self.assertEqual(f[1][1], 2)
+
+        # Verify that results can be written into another Matrix
+        out = Matrix([Vector([0.0, 0.0]), Vector([0.0, 0.0])])
+        storage = out._re
+        a = Matrix([Vector([1, 2]), Vector([3, 4])])
+        self.assertIs(a.add(ones, out=out), out)
+        self.assertIs(out._re, storage)
+        self.assertEqual(out, a + ones)
+        self.assertEqual(a.subtract(ones, out=out), a - ones)
+        self.assertEqual(a.hadamard(a, out=out), a.hadamard(a))
+        self.assertEqual(a.scale(3, out=out), a.scale(3))
+        self.assertEqual(a.multiply(a, out=out), a * a)
+        self.assertEqual(out, a * a)
+        self.assertRaises(IndexError, lambda: a.add(ones, out=self.m1))
+        self.assertRaises(IndexError, lambda: self.m1.multiply(
+            self.m1.transpose(), out=self.m1))
+        self.assertRaises(TypeError, lambda: a.add(ones, out=self.v2))
+
     def test_subtract(self):
         # Subtraction is primarily done in the addition method (after scaling
         # by -1) so not much testing here.
@@ -173,6 +285,111 @@ class TestMatrix(unittest.TestCase):
         m = Matrix([v, w, x])
         self.assertEqual(m * v, Vector([14, 32, 50]))
 
+    def test_multiply_tiled(self):
+        # Verify that the tiled kernel agrees with the classic kernel,
+        # including tiles which do not divide the Matrix evenly.
+        a = Matrix([Vector([(r * 7 + c) % 5 - 2 for c in range(7)])
+                    for r in range(5)])
+        b = Matrix([Vector([(r + c * 3) % 4 - 1.5 for c in range(6)])
+                    for r in range(7)])
+        classic = a.multiply(b, method='classic')
+        for size in (1, 2, 3, 8):
+            with self.subTest(size):
+                self.assertEqual(a.multiply(b, method='tiled',
+                                            block_size=size), classic)
+
+        # Verify that complex products are tiled correctly
+        c = Matrix([Vector([1, complex(0, 2)]), Vector([3, 4])])
+        self.assertEqual(c.multiply(c, method='tiled', block_size=1),
+                         Matrix([Vector([complex(1, 6), complex(0, 10)]),
+                                 Vector([complex(15, 0), complex(16, 6)])]))
+
+        # Verify that Strassen multiplication agrees with the classic kernel
+        # for even, odd and non-power-of-two sizes.
+        for n in (2, 5, 6, 11):
+            a = Matrix([Vector([(r * 3 + c) % 7 - 3 for c in range(n)])
+                        for r in range(n)])
+            b = Matrix([Vector([(r + c * 5) % 6 - 2.5 for c in range(n)])
+                        for r in range(n)])
+            with self.subTest(n):
+                self.assertEqual(a.multiply(b, method='strassen', cutoff=1),
+                                 a.multiply(b, method='classic'))
+        self.assertEqual(c.multiply(c, method='strassen', cutoff=1),
+                         c.multiply(c, method='classic'))
+
+        # Verify that Strassen falls back for non-square products and can be
+        # chosen for the '*' operator through the global setting.
+        self.assertEqual(a.multiply(b, method='strassen', cutoff=1),
+                         a.multiply(b))
+        self.assertEqual(self.m1.multiply(self.m3, method='strassen'),
+                         self.m1 * self.m3)
+        linear.MULTIPLY_METHOD = 'strassen'
+        try:
+            self.assertEqual(a * b, a.multiply(b, method='classic'))
+        finally:
+            linear.MULTIPLY_METHOD = 'auto'
+
+        # Verify that unknown kernels and non-Matrix operands are rejected
+        self.assertRaises(ValueError, lambda: a.multiply(b, method='fast'))
+        self.assertRaises(TypeError, lambda: a.multiply(self.v1))
+
+    def test_multiply_parallel(self):
+        a = Matrix([Vector([(r * 3 + c) % 7 - 3 for c in range(5)])
+                    for r in range(6)])
+        b = Matrix([Vector([(r + c * 5) % 6 - 2.5 for c in range(4)])
+                    for r in range(5)])
+        c = Matrix([Vector([1, complex(0, 2), 3]), Vector([3, 4, 5]),
+                    Vector([1, 1, 1])])
+        big = Matrix([Vector([2 ** 40, 1]), Vector([1, 2 ** 40])])
+
+        # Verify that small products fall back to the serial kernel
+        self.assertEqual(a.multiply(b, method='parallel', workers=2),
+                         a.multiply(b, method='classic'))
+
+        threshold = linear.PARALLEL_THRESHOLD
+        linear.PARALLEL_THRESHOLD = 2
+        try:
+            # Verify that bands of rows computed by worker processes agree
+            # with the serial kernel for real, complex and view operands.
+            self.assertEqual(a.multiply(b, method='parallel', workers=3),
+                             a.multiply(b, method='classic'))
+            self.assertEqual(c.multiply(c.ht(), method='parallel', workers=2),
+                             c.multiply(c.ht(), method='classic'))
+
+            # Verify that integer products too large for shared memory are
+            # redone serially and stay exact.
+            self.assertEqual(big.multiply(big, method='parallel',
+                                          workers=2)[0][0], 2 ** 80 + 1)
+        finally:
+            linear.PARALLEL_THRESHOLD = threshold
+
+
+    def test_rowwise(self):
+        a = Matrix([Vector([1, 2, 3]), Vector([5, 3, -2]), Vector([3, 4, 0])])
+        b = Matrix([Vector([4, 5, 6]), Vector([-1, 0, 3]), Vector([0, 0, 2])])
+
+        # Verify that batched results match doing one row at a time
+        self.assertEqual(a.rowwise_dot(b),
+                         Vector([a[i] @ b[i] for i in range(a.rows)]))
+        self.assertEqual(a.rowwise_norm(),
+                         Vector([a[i].magnitude() for i in range(a.rows)]))
+        self.assertEqual(a.rowwise_angle(b),
+                         Vector([a[i].angle(b[i]) for i in range(a.rows)]))
+        self.assertEqual(a.rowwise_cross(b),
+                         Matrix([a[i].cross(b[i]) for i in range(a.rows)]))
+        self.assertEqual(a.transpose().rowwise_dot(b.transpose()),
+                         Vector([-1, 10, 12]))
+
+        # Verify that complex rows are supported by the dot product
+        c = Matrix([Vector([complex(0, 1), 2]), Vector([1, 1])])
+        self.assertEqual(c.rowwise_dot(c), Vector([3, 2]))
+
+        # Verify that Matrices must be the same size and 3D for cross
+        self.assertRaises(IndexError, lambda: a.rowwise_dot(self.m1))
+        self.assertRaises(TypeError, lambda: a.rowwise_dot(self.v2))
+        self.assertRaises(IndexError, lambda: self.m4.rowwise_cross(self.m4))
+
+
     def test_identity(self):
         v = Vector([1, 2, 3])
         w = Vector([4, 5, 6])
@@ -209,6 +426,57 @@ class TestMatrix(unittest.TestCase):
                                                 Vector([3, 7]),
                                                 Vector([4, 8])]))
 
+    def test_transpose_view(self):
+        m = Matrix([Vector([1, 2, 3]), Vector([4, 5, 6])])
+        t = m.transpose()
+
+        # Verify that the transpose shares storage with the original
+        m[0][1] = 20
+        self.assertEqual(t[1], Vector([20, 5]))
+        self.assertEqual(t.transpose(), m)
+
+        # Verify that products and sums read through the view
+        n = Matrix([Vector([1, 0]), Vector([2, 1])])
+        expected = Matrix([Vector([9, 4]), Vector([30, 5]), Vector([15, 6])])
+        self.assertEqual(t * n, expected)
+        self.assertEqual(m.transpose() * m, t * Matrix([m[0], m[1]]))
+        self.assertEqual(t + t, t.scale(2))
+        self.assertEqual(t + expected, Matrix([Vector([10, 8]),
+                                               Vector([50, 10]),
+                                               Vector([18, 12])]))
+        self.assertEqual(t.hadamard(t).transpose(), m.hadamard(m))
+        self.assertEqual(t.diagonal(), Vector([1, 5]))
+
+        # Verify that complex views are read in full by every kernel
+        c = Matrix([Vector([1j, 2]), Vector([3, 4j])]).transpose()
+        self.assertEqual(c.scale(2), Matrix([Vector([2j, 6]),
+                                             Vector([4, 8j])]))
+        self.assertEqual(c.hadamard(c.scale(1j)),
+                         Matrix([Vector([-1j, 9j]), Vector([4j, -16j])]))
+
+        # Verify that views laid out differently are combined through
+        # their strides, without gathering either into a copy
+        with linear.use_backend('python'), \
+                mock.patch.object(Matrix, '_flat', side_effect=AssertionError):
+            self.assertEqual(t + expected, Matrix([Vector([10, 8]),
+                                                   Vector([50, 10]),
+                                                   Vector([18, 12])]))
+            self.assertEqual(c - c.transpose(), Matrix([Vector([0, 1]),
+                                                        Vector([-1, 0])]))
+            self.assertEqual(c.ht().hadamard(c.transpose()),
+                             Matrix([Vector([1, 4]), Vector([9, 16])]))
+            out = Matrix([Vector([0, 0]), Vector([0, 0]), Vector([0, 0])])
+            self.assertIs(t.add(expected, out=out), out)
+            self.assertEqual(out, t + expected)
+
+            # A row too large for typed storage widens the rows before it
+            big = Matrix([Vector([1, 2]), Vector([2 ** 62, 4])])
+            total = big.transpose() + Matrix([Vector([1, 2 ** 62]),
+                                              Vector([2, 4])])
+            self.assertEqual(total.dtype, 'object')
+            self.assertEqual(total[0][1], 2 ** 63)
+            self.assertEqual(total[1][0], 4)
+
     def test_ht(self):
         v = Vector([1, 2, complex(3, 4), 4])
         w = Vector([5, 6, 7, 8])
@@ -221,6 +489,30 @@ class TestMatrix(unittest.TestCase):
                                          Vector([complex(3, -4), 7]),
                                          Vector([4, 8])]))
 
+        # Verify that the Hermitian transpose of a Hermitian transpose is
+        # the original Matrix and that conjugation happens on read.
+        self.assertEqual(m.ht().ht(), m)
+        self.assertEqual(m.ht()[2][0], complex(3, -4))
+        self.assertEqual(m.ht() + m.transpose(),
+                         Matrix([Vector([2, 10]), Vector([4, 12]),
+                                 Vector([6, 14]), Vector([8, 16])]))
+        self.assertEqual((m.ht() * m)[2][2], 25 + 49)
+
+        # Verify that rows of a Hermitian transpose, which are conjugated
+        # copies, refuse writes rather than losing them
+        for a in (m, Matrix([Vector([Fraction(1, 2), 1j]),
+                             Vector([2, 3])])):
+            with self.subTest(dtype=a.dtype):
+                h = a.ht()
+                row = h[1]
+                self.assertRaises(TypeError, row.__setitem__, 0, 99)
+                self.assertRaises(TypeError, row.scale_, 2)
+                self.assertRaises(TypeError, row.add, row, out=row)
+                self.assertEqual(h[1], row)
+                self.assertEqual(row.scale(2), h[1].scale(2))
+                h[0] = Vector([7, 8j])
+                self.assertEqual(a[1][0], -8j)
+
 
     def test_diagonal(self):
         # Verify diagonal from rectangular Matrix
@@ -229,6 +521,10 @@ class TestMatrix(unittest.TestCase):
         # Verify diagonal from square Matrix
         self.assertEqual(self.m3.diagonal(), Vector([-1, 1, 10]))
 
+        # Verify diagonal from Matrix with more rows than columns
+        m = Matrix([self.v2, self.v3, self.v2, self.v3])
+        self.assertEqual(m.diagonal(), Vector([-1, 1, 1]))
+
 
     def test_trace(self):
         # Verify that trace not valid on rectangular Matrix
@@ -237,5 +533,165 @@ class TestMatrix(unittest.TestCase):
         # Verify trace feature on square Matrix
         self.assertEqual(self.m3.trace(), 10)
 
+
+    def test_structure(self):
+        s = Matrix([Vector([1, 2, 3]), Vector([2, 5, 6]), Vector([3, 6, 9])])
+        self.assertTrue(s.is_symmetric())
+        self.assertTrue(s.transpose().is_symmetric())
+        self.assertTrue(s.is_hermitian())
+        self.assertFalse(self.m3.is_symmetric())
+        self.assertFalse(self.m1.is_symmetric())
+
+        # Verify that the tolerance is honoured
+        t = Matrix([Vector([1, 2.001]), Vector([2, 1])])
+        self.assertFalse(t.is_symmetric())
+        self.assertTrue(t.is_symmetric(tolerance=0.01))
+
+        # Verify Hermitian checks, including conjugated views
+        h = Matrix([Vector([2, 1 + 1j]), Vector([1 - 1j, 3])])
+        self.assertTrue(h.is_hermitian())
+        self.assertFalse(h.is_symmetric())
+        self.assertTrue(h.ht().is_hermitian())
+        self.assertFalse(Matrix([Vector([1j, 0]),
+                                 Vector([0, 1])]).is_hermitian())
+        self.assertTrue(Matrix([Vector([1j, 2]),
+                                Vector([2, 1])]).is_symmetric())
+
+        # Verify triangular and diagonal checks, on rectangular Matrices too
+        u = Matrix([Vector([1, 2, 3]), Vector([0, 4, 5])])
+        self.assertTrue(u.is_upper_triangular())
+        self.assertFalse(u.is_lower_triangular())
+        self.assertTrue(u.transpose().is_lower_triangular())
+        self.assertFalse(u.is_diagonal())
+        self.assertTrue(Matrix([Vector([1, 0]), Vector([0, 1e-9]),
+                                Vector([0, 0])]).is_diagonal())
+        self.assertTrue(self.m3.identity().is_diagonal())
+        self.assertFalse(s.is_upper_triangular())
+
+    def test_cache(self):
+        m = Matrix([Vector([1, 2]), Vector([3, 4])])
+        before = linear.cache_info()
+        t = m.transpose()
+        self.assertIs(m.transpose(), t)
+        self.assertEqual(m.trace(), 5)
+        self.assertEqual(m.trace(), 5)
+        self.assertEqual(linear.cache_info().hits - before.hits, 2)
+
+        # Verify that writes through the Matrix, a row or a view are seen
+        m[0] = Vector([10, 20])
+        self.assertEqual(m.trace(), 14)
+        self.assertIsNot(m.transpose(), t)
+        self.assertEqual(t, m.transpose())
+        row = m[1]
+        row += Vector([1, 1])
+        self.assertEqual(m.trace(), 15)
+        m.transpose().scale_(2)
+        self.assertEqual(m.trace(), 30)
+
+        # Verify that a changed diagonal is not handed back
+        d = m.diagonal()
+        d *= 0
+        self.assertEqual(m.diagonal(), Vector([20, 10]))
+
+        # Verify that taking over wider storage forgets the old views
+        m *= 0.5
+        self.assertEqual(m.trace(), 15)
+        self.assertEqual(m.transpose(), Matrix([Vector([10, 4]),
+                                                Vector([20, 5])]))
+
+        # Verify that the cache can be cleared and is bounded
+        t = m.transpose()
+        linear.cache_clear()
+        self.assertEqual(linear.cache_info()[:2], (0, 0))
+        self.assertIsNot(m.transpose(), t)
+        size = linear.CACHE_SIZE
+        linear.CACHE_SIZE = 1
+        try:
+            m.trace()
+            m.diagonal()
+            self.assertEqual(len(m._cache), 1)
+        finally:
+            linear.CACHE_SIZE = size
+
+
+    def test_column_cache(self):
+        m = Matrix([Vector([1, 2]), Vector([3, 4])])
+        v = Vector([1, 1])
+        with linear.use_backend('python'):
+            # Verify that columns are only kept once a second product
+            # gathers them, and then reused
+            self.assertEqual(v * m, Vector([4, 6]))
+            self.assertIs(m._cache[('columns', linear._INT)][1],
+                          linear._ASKED)
+            before = linear.cache_info()
+            self.assertEqual(m * m, Matrix([Vector([7, 10]),
+                                            Vector([15, 22])]))
+            self.assertEqual(linear.cache_info().hits - before.hits, 0)
+            self.assertEqual(v * m, Vector([4, 6]))
+            self.assertEqual(linear.cache_info().hits - before.hits, 1)
+
+        # Verify that the columns are gathered again once the numbers change
+        m[0] = Vector([0, 1])
+        self.assertEqual(v * m, Vector([3, 5]))
+        row = m[1]
+        row *= 2
+        self.assertEqual(v * m, Vector([6, 9]))
+        t = m.transpose()
+        self.assertEqual(v * t, Vector([1, 14]))
+        m.scale_(2)
+        self.assertEqual(v * t, Vector([2, 28]))
+        self.assertEqual(Vector([1j, 1]) * m, Vector([12, 2j + 16]))
+
+
+    def test_dtype(self):
+        m = Matrix([Vector([1, 2]), Vector([3, 4])])
+        self.assertEqual(m.dtype, 'int')
+        self.assertEqual(m.ht().dtype, 'int')
+        self.assertEqual((m * m.scale(0.5)).dtype, 'float')
+        self.assertEqual(m.scale(1j).ht().dtype, 'complex')
+
+        # Verify that views convert into contiguous copies
+        t = m.transpose().astype('complex')
+        self.assertEqual((t.dtype, t._strides), ('complex', (2, 1)))
+        self.assertEqual(t, m.transpose())
+        self.assertRaises(TypeError, lambda: t.astype('float'))
+
+        # Verify exact and whole-buffer comparison across layouts
+        big = Matrix([Vector([2 ** 62, 1]), Vector([1, 1])])
+        self.assertNotEqual(big, Matrix([Vector([2 ** 62 + 1, 1]),
+                                         Vector([1, 1])]))
+        self.assertEqual(big.transpose(), big)
+        c = Matrix([Vector([1j, 2.5]), Vector([3, 4])])
+        self.assertEqual(c.ht().ht(), c)
+        self.assertEqual(c.astype('object'), c)
+        self.assertNotEqual(c.ht(), c.transpose())
+
+
+    def test_random(self):
+        # Verify the size and kind of a RandomMatrix
+        m = RandomMatrix(3)
+        self.assertIsInstance(m, Matrix)
+        self.assertEqual((m.rows, m.columns), (3, 3))
+        self.assertTrue(all(isinstance(e, int) for e in m[2].elements))
+        m = RandomMatrix(2, 5, 'gaussian', seed=4)
+        self.assertEqual((m.rows, m.columns), (2, 5))
+        self.assertTrue(all(isinstance(e, float) for e in m[1].elements))
+        self.assertEqual(m.transpose().rows, 5)
+
+        # Verify that a seeded RandomMatrix holds the numbers drawn by the
+        # same stream as RandomVectors, in row-major order
+        for element_type in ('int', 'float', 'complex'):
+            with self.subTest(element_type):
+                m = RandomMatrix(4, 2, element_type, seed=9)
+                self.assertEqual(m, RandomMatrix(4, 2, element_type, seed=9))
+                flat = RandomVector(8, element_type, seed=9).elements
+                self.assertEqual([e for i in range(4) for e in m[i].elements],
+                                 list(flat))
+
+        self.assertRaises(ValueError, lambda: RandomMatrix(0))
+        self.assertRaises(ValueError, lambda: RandomMatrix(3, 1))
+        self.assertRaises(TypeError, lambda: RandomMatrix(2.5))
+        self.assertRaises(TypeError, lambda: RandomMatrix(2, 2, 'text'))
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,6 @@
 # Quick test to determine if matrix trace is linear or not.
 
-from linear import RandomVector, Matrix
+from linear import RandomMatrix
 import random
 
 
@@ -19,8 +19,8 @@ def compare_scale(k, m1):
 random.seed()
 for _ in range(10):
     k = random.randint(-20, 20)
-    m1 = Matrix([RandomVector(3), RandomVector(3), RandomVector(3)])
-    m2 = Matrix([RandomVector(3), RandomVector(3), RandomVector(3)])
+    m1 = RandomMatrix(3)
+    m2 = RandomMatrix(3)
     compare_trace(m1, m2)
     compare_scale(k, m1)
     print('')
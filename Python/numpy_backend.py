@@ -0,0 +1,272 @@
+"""
+A compute backend for linear.py which hands the arithmetic over to NumPy.
+
+The README explains why the rest of this code avoids NumPy: the point is to
+learn the linear algebra, not to have it done for you.  This backend only
+exists so the same Vector and Matrix code can run quickly when NumPy happens
+to be installed.  Turn it on with linear.use_backend('numpy'),
+linear.set_backend('numpy'), a backend='numpy' argument, or by setting
+LINEAR_BACKEND=numpy in the environment.
+
+NumPy reads the typed storage buffers of Vectors and Matrices in place, with
+their strides, so transposes are not copied on the way in.  Generic Python
+numbers, which NumPy could only hold as boxed objects, are left to the plain
+Python backend.  So is integer arithmetic whose result might not fit in 64
+bits, since NumPy would wrap it around instead of letting it grow.
+"""
+from array import array
+
+import numpy as np
+
+from linear import (Matrix, PythonBackend, Vector, _COMPLEX, _FLOAT, _INT,
+                    _OBJECT, _view)
+
+
+def _generic(*operands):
+    """
+    Returns True if any of the Vectors or Matrices in 'operands' holds
+    generic Python numbers.
+    """
+    return any(op._kind == _OBJECT for op in operands)
+
+
+def _too_big(x, y, terms=1, op='mul'):
+    """
+    Returns True if NumPy arrays 'x' and 'y' hold integers and the result of
+    multiplying them ('mul'), summed over 'terms' products, or of adding
+    them ('add'), might not fit in 64 bits.
+    """
+    if x.dtype.kind == 'O' or y.dtype.kind == 'O':
+        return True
+    if x.dtype.kind not in 'iub' or y.dtype.kind not in 'iub':
+        return False
+    x_max = int(np.abs(x).max(initial=0))
+    y_max = int(np.abs(y).max(initial=0))
+    if op == 'add':
+        return x_max + y_max >= 2 ** 63
+    return x_max * y_max * terms >= 2 ** 63
+
+
+def _vector(v):
+    """
+    Returns a one dimensional NumPy array over the storage of Vector 'v'.
+    """
+    re = np.asarray(_view(v._re))
+    if v._im is None:
+        return re
+    return re + 1j * np.asarray(_view(v._im))
+
+
+def _grid(buf, m, writeable=False):
+    """
+    Returns a two dimensional NumPy view over storage buffer 'buf' of Matrix
+    'm', stepping through it with the strides of 'm'.  The view is read-only
+    unless 'writeable' is True.
+    """
+    flat = np.asarray(_view(buf))
+    row_stride, column_stride = m._strides
+    return np.lib.stride_tricks.as_strided(
+        flat, shape=(m.rows, m.columns),
+        strides=(row_stride * flat.itemsize, column_stride * flat.itemsize),
+        writeable=writeable)
+
+
+def _matrix(m):
+    """
+    Returns a two dimensional NumPy array holding the numbers of Matrix 'm'.
+    """
+    re = _grid(m._re, m)
+    if m._im is None:
+        return re
+    if m._conj:
+        return re - 1j * _grid(m._im, m)
+    return re + 1j * _grid(m._im, m)
+
+
+def _pack(result):
+    """
+    Copies a NumPy array into storage buffers and returns them as a tuple
+    of (real buffer, imaginary buffer, kind).
+    """
+    if np.iscomplexobj(result):
+        re = np.ascontiguousarray(result.real, np.float64)
+        im = np.ascontiguousarray(result.imag, np.float64)
+        return array('d', re.tobytes()), array('d', im.tobytes()), _COMPLEX
+    if np.issubdtype(result.dtype, np.integer) or result.dtype == np.bool_:
+        return (array('q', np.ascontiguousarray(result, np.int64).tobytes()),
+                None, _INT)
+    return (array('d', np.ascontiguousarray(result, np.float64).tobytes()),
+            None, _FLOAT)
+
+
+def _to_matrix(result):
+    """
+    Returns a two dimensional NumPy array as a new Matrix.
+    """
+    rows, columns = result.shape
+    return Matrix._adopt(*_pack(result), rows, columns)
+
+
+def _to_vector(result):
+    """
+    Returns a one dimensional NumPy array as a new Vector.
+    """
+    return Vector._adopt(*_pack(result))
+
+
+def _numpy(obj):
+    """
+    Returns a NumPy array holding the numbers of a Vector or a Matrix.
+    """
+    return _matrix(obj) if isinstance(obj, Matrix) else _vector(obj)
+
+
+def _to_result(result):
+    """
+    Returns a NumPy array as a new Vector or Matrix, depending on its shape.
+    """
+    return _to_matrix(result) if result.ndim == 2 else _to_vector(result)
+
+
+def _target(out):
+    """
+    Returns a writable NumPy view over the storage of Vector or Matrix
+    'out', or None if its numbers are not held in a single real buffer.
+    """
+    if out._im is not None or out._kind == _OBJECT:
+        return None
+    if isinstance(out, Matrix):
+        return _grid(out._re, out, writeable=True)
+    return np.asarray(_view(out._re))
+
+
+def _output(ufunc, x, y, out):
+    """
+    Applies NumPy 'ufunc' to 'x' and 'y' and returns the result as a new
+    Vector or Matrix.  If 'out' is given the result goes into it instead,
+    straight into its storage when that can hold the result unchanged.
+    """
+    if out is None:
+        return _to_result(ufunc(x, y))
+    target = _target(out)
+    if target is not None and np.can_cast(np.result_type(x, y), target.dtype):
+        ufunc(x, y, out=target)
+        out._touch()
+    else:
+        out._assign(*_pack(ufunc(x, y)))
+    return out
+
+
+class NumpyBackend(PythonBackend):
+    """
+    Compute backend which does its arithmetic with NumPy.  Anything NumPy
+    cannot hold natively is passed on to the plain Python backend.
+    """
+
+    name = 'numpy'
+
+    def add(self, a, b, out=None):
+        if not _generic(a, b):
+            x, y = _numpy(a), _numpy(b)
+            if not _too_big(x, y, op='add'):
+                return _output(np.add, x, y, out)
+        return super().add(a, b, out)
+
+    def subtract(self, a, b, out=None):
+        if not _generic(a, b):
+            x, y = _numpy(a), _numpy(b)
+            if not _too_big(x, y, op='add'):
+                return _output(np.subtract, x, y, out)
+        return super().subtract(a, b, out)
+
+    def hadamard(self, a, b, out=None):
+        if not _generic(a, b):
+            x, y = _matrix(a), _matrix(b)
+            if not _too_big(x, y):
+                return _output(np.multiply, x, y, out)
+        return super().hadamard(a, b, out)
+
+    def scale(self, a, k, out=None):
+        if not _generic(a) and isinstance(k, (int, float, complex)):
+            x = _numpy(a)
+            if not _too_big(x, np.asarray(k)):
+                return _output(np.multiply, x, k, out)
+        return super().scale(a, k, out)
+
+    def dot(self, a, b):
+        if not _generic(a, b):
+            x, y = _vector(a), _vector(b)
+            if not _too_big(x, y, a.dimension):
+                return np.dot(x, y).item()
+        return super().dot(a, b)
+
+    def vecmat(self, v, m):
+        if not _generic(v, m):
+            x, y = _vector(v), _matrix(m)
+            if not _too_big(x, y, m.rows):
+                return _to_vector(x @ y)
+        return super().vecmat(v, m)
+
+    def matvec(self, m, v):
+        if not _generic(m, v):
+            x, y = _matrix(m), _vector(v)
+            if not _too_big(x, y, m.columns):
+                return _to_vector(x @ y)
+        return super().matvec(m, v)
+
+    def matmul(self, a, b, method=None, block_size=None, cutoff=None,
+               workers=None):
+        if not _generic(a, b):
+            x, y = _matrix(a), _matrix(b)
+            if not _too_big(x, y, a.columns):
+                return _to_matrix(x @ y)
+        return super().matmul(a, b, method, block_size, cutoff, workers)
+
+    def diagonal(self, m):
+        if _generic(m):
+            return super().diagonal(m)
+        return _to_vector(np.diagonal(_matrix(m)))
+
+    def trace(self, m):
+        if not _generic(m):
+            x = _matrix(m)
+            if not _too_big(x, np.asarray(1), m.rows):
+                return np.trace(x).item()
+        return super().trace(m)
+
+    def cross(self, a, b):
+        if not _generic(a, b):
+            x, y = _vector(a), _vector(b)
+            if not _too_big(x, y, 2):
+                return _to_vector(np.cross(x, y))
+        return super().cross(a, b)
+
+    def rowwise_dot(self, a, b):
+        if not _generic(a, b):
+            x, y = _matrix(a), _matrix(b)
+            if not _too_big(x, y, a.columns):
+                return _to_vector(np.einsum('ij,ij->i', x, y))
+        return super().rowwise_dot(a, b)
+
+    def rowwise_norm(self, m):
+        if not _generic(m) and m._kind != _COMPLEX:
+            x = _matrix(m).astype(np.float64)
+            return _to_vector(np.sqrt(np.einsum('ij,ij->i', x, x)))
+        return super().rowwise_norm(m)
+
+    def rowwise_angle(self, a, b):
+        if not _generic(a, b) and _COMPLEX not in (a._kind, b._kind):
+            x = _matrix(a).astype(np.float64)
+            y = _matrix(b).astype(np.float64)
+            tops = np.einsum('ij,ij->i', x, y)
+            bottoms = (np.sqrt(np.einsum('ij,ij->i', x, x)) *
+                       np.sqrt(np.einsum('ij,ij->i', y, y)))
+            return _to_vector(np.degrees(np.arccos(tops / bottoms)))
+        return super().rowwise_angle(a, b)
+
+    def rowwise_cross(self, a, b):
+        if not _generic(a, b):
+            x, y = _matrix(a), _matrix(b)
+            if not _too_big(x, y, 2):
+                return _to_matrix(np.cross(x, y))
+        return super().rowwise_cross(a, b)
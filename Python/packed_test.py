@@ -0,0 +1,126 @@
+import unittest
+from unittest import mock
+from linear import Vector, Matrix
+from packed import HermitianMatrix, SymmetricMatrix
+
+
+# unittest requires CamelCase
+class TestPacked(unittest.TestCase):
+    def setUp(self):
+        self.m = Matrix([Vector([1, 2, 3]),
+                         Vector([2, 5, 6]),
+                         Vector([3, 6, 9])])
+        self.h = Matrix([Vector([2, 1 + 1j, 0]),
+                         Vector([1 - 1j, 3, 2j]),
+                         Vector([0, -2j, 1])])
+        self.s = SymmetricMatrix(self.m)
+        self.hs = HermitianMatrix(self.h)
+        self.v = Vector([1, -1, 2])
+
+
+    def tearDown(self):
+        del self.m
+        del self.h
+        del self.s
+        del self.hs
+        del self.v
+
+
+    def test_creation(self):
+        # Verify that only the upper triangle is stored
+        self.assertEqual(list(self.s._numbers()), [1, 2, 3, 5, 6, 9])
+        self.assertEqual(SymmetricMatrix([1, 2, 3, 5, 6, 9]), self.s)
+        self.assertEqual((self.s.rows, self.s.columns), (3, 3))
+        self.assertEqual((self.s.dtype, self.hs.dtype), ('int', 'complex'))
+        self.assertEqual(self.s.to_matrix(), self.m)
+        self.assertEqual(self.hs.to_matrix(), self.h)
+        self.assertEqual(self.s[1], Vector([2, 5, 6]))
+        self.assertEqual(self.hs[-1], Vector([0, -2j, 1]))
+        self.assertRaises(IndexError, lambda: self.s[3])
+
+        # Verify that the wrong numbers are rejected
+        self.assertRaises(ValueError, lambda: SymmetricMatrix(self.h))
+        self.assertRaises(ValueError,
+                          lambda: HermitianMatrix(self.m.scale(1j)))
+        self.assertRaises(ValueError, lambda: SymmetricMatrix([1, 2, 3, 4]))
+        self.assertRaises(ValueError, lambda: HermitianMatrix([1j, 0, 1]))
+        self.assertRaises(TypeError, lambda: SymmetricMatrix([1, 'a', 3]))
+
+
+    def test_equal(self):
+        self.assertTrue(self.s == self.m)
+        self.assertTrue(self.m == self.s)
+        self.assertTrue(self.hs == self.h)
+        self.assertFalse(self.s == self.hs)
+        self.assertTrue(SymmetricMatrix(self.m) == HermitianMatrix(self.m))
+        self.assertFalse(self.s == SymmetricMatrix([1, 2, 3]))
+        self.assertFalse(self.s == 1)
+
+
+    def test_add(self):
+        # Verify that two of the same type stay packed
+        self.assertIsInstance(self.s + self.s, SymmetricMatrix)
+        self.assertEqual(self.s + self.s, self.m + self.m)
+        self.assertIsInstance(self.hs - self.hs, HermitianMatrix)
+        self.assertEqual(self.hs - self.hs.scale(2), self.h - self.h.scale(2))
+
+        # Verify that anything else gives a dense Matrix
+        self.assertIsInstance(self.s + self.hs, Matrix)
+        self.assertEqual(self.s + self.hs, self.m + self.h)
+        self.assertEqual(self.m - self.hs, self.m - self.h)
+        self.assertEqual(self.hs + self.m, self.h + self.m)
+        self.assertRaises(IndexError,
+                          lambda: self.s + SymmetricMatrix([1, 2, 3]))
+        self.assertRaises(TypeError, lambda: self.s + 1)
+
+
+    def test_scale(self):
+        self.assertIsInstance(self.s.scale(2.5), SymmetricMatrix)
+        self.assertEqual(self.s.scale(2.5), self.m.scale(2.5))
+        self.assertIsInstance(self.hs * -2, HermitianMatrix)
+        self.assertIsInstance(self.hs.scale(1j), Matrix)
+        self.assertEqual(self.hs.scale(1j), self.h.scale(1j))
+        self.assertIsInstance(self.s.hadamard(self.s), SymmetricMatrix)
+        self.assertEqual(self.hs.hadamard(self.hs), self.h.hadamard(self.h))
+        self.assertEqual(self.s.hadamard(self.h), self.m.hadamard(self.h))
+        self.assertRaises(TypeError, lambda: self.s.scale('text'))
+
+
+    def test_multiply(self):
+        self.assertEqual(self.s * self.v, self.m * self.v)
+        self.assertEqual(self.v * self.s, self.v * self.m)
+        self.assertEqual(self.hs * self.v, self.h * self.v)
+        self.assertEqual(self.v * self.hs, self.v * self.h)
+        self.assertEqual(self.s * self.h, self.m * self.h)
+        self.assertEqual(self.h * self.s, self.h * self.m)
+        self.assertEqual(self.s * self.hs, self.m * self.h)
+        self.assertRaises(IndexError, lambda: self.s * Vector([1, 2]))
+        self.assertRaises(IndexError, lambda: Vector([1, 2]) * self.hs)
+
+
+    def test_structure(self):
+        self.assertEqual(self.s.trace(), 15)
+        self.assertEqual(self.hs.trace(), 6)
+        self.assertEqual(self.s.diagonal(), Vector([1, 5, 9]))
+        self.assertIs(self.s.transpose(), self.s)
+        self.assertEqual(self.hs.transpose(), self.h.transpose())
+        self.assertIs(self.hs.ht(), self.hs)
+        self.assertTrue(self.s.is_hermitian())
+        self.assertFalse(self.hs.is_symmetric())
+        self.assertTrue(HermitianMatrix(self.m).is_symmetric())
+
+
+    def test_no_copy(self):
+        # Verify that a row or the diagonal never copies every packed number
+        copy = mock.Mock(side_effect=AssertionError("packed numbers copied"))
+        with mock.patch.object(SymmetricMatrix, '_numbers', copy):
+            for s, m in ((self.s, self.m), (self.hs, self.h)):
+                with self.subTest(dtype=s.dtype):
+                    self.assertEqual(s.trace(), m.trace())
+                    self.assertEqual(s.diagonal(), m.diagonal())
+                    for i in range(s.rows):
+                        self.assertEqual(s[i], m[i])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import math
 from linear import Vector, Matrix
+from transform import Transform
 
 
 def gen_circle(theta):
@@ -22,8 +23,8 @@ plt.plot([c[0] for c in circle], [c[1] for c in circle], 'o')
 t1 = Matrix([Vector([1, 0]), Vector([1.25, 2])])
 
 # Since Matrix is a collection of Vectors we can use the rotation matrix to
-# scale each of them.
-circle2 = circle.scale(t1)
+# transform each of them in one pass.
+circle2 = Transform(t1)(circle)
 plt.plot([c[0] for c in circle2], [c[1] for c in circle2], '-')
 
 plt.axis([-3.0, 3.0, -2.5, 2.5])  # [xmin, xmax, ymin, ymax]
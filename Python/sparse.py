@@ -0,0 +1,553 @@
+"""
+A sparse Matrix for linear.py which only stores the numbers that are not
+zero.
+
+Most of the numbers in a large system matrix are often zero.  A dense
+linear.Matrix still holds every one of them, and multiplying it costs a
+multiplication for each.  A SparseMatrix keeps its numbers in compressed
+sparse row (CSR) or compressed sparse column (CSC) form:
+
+    - the numbers which are not zero, one major line (row for CSR, column
+      for CSC) after another, in typed storage buffers like a Vector's
+    - for each number, the minor index (column for CSR, row for CSC) it
+      sits at, in ascending order along each line
+    - for each major line, the offset of its first number, plus one more
+      offset marking the end of the last line
+
+so memory and arithmetic grow with the quantity of stored numbers rather
+than with rows * columns.  A CSC Matrix is laid out exactly as the CSR form
+of its transpose, which makes transpose() a view which copies nothing.
+
+A SparseMatrix mixes with Vectors and Matrices through the usual operators.
+Products with a Vector give a Vector, products and sums with a dense Matrix
+give a dense Matrix, and products and sums of two SparseMatrices stay
+sparse.
+"""
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+from numbers import Complex
+from operator import add, mul, sub
+
+from linear import (Matrix, Vector, _isclose, _kind_of, _pack, _tolist,
+                    _values)
+
+
+def _is_zero(x):
+    """
+    Returns True if number 'x' is zero to 6 decimal places.
+    """
+    return _isclose(x.real, 0) and _isclose(x.imag, 0)
+
+
+def _transposed(indptr, indices, data, lines):
+    """
+    Regroups compressed storage, given as its line offsets, minor indices
+    and numbers, around the other axis, which has 'lines' lines.  This turns
+    CSR storage into CSC storage and back again.  Returns the new (offsets,
+    indices, numbers).
+    """
+    counts = [0] * (lines + 1)
+    for j in indices:
+        counts[j + 1] += 1
+    for j in range(lines):
+        counts[j + 1] += counts[j]
+    new_indptr = array('q', counts)
+    new_indices = array('q', bytes(8 * len(indices)))
+    new_data = [0] * len(data)
+    for i in range(len(indptr) - 1):
+        for p in range(indptr[i], indptr[i + 1]):
+            q = counts[indices[p]]
+            counts[indices[p]] = q + 1
+            new_indices[q] = i
+            new_data[q] = data[p]
+    return new_indptr, new_indices, new_data
+
+
+def _merge(a, b, op, both_only=False):
+    """
+    Combines the numbers of SparseMatrices 'a' and 'b', which are the same
+    size and format, line by line with 'op'.  Positions stored in only one
+    of them are combined with zero unless 'both_only' is True, in which case
+    they are dropped.  Returns the result as (offsets, indices, numbers).
+    """
+    a_data, b_data = a._data(), b._data()
+    indptr = array('q', [0])
+    indices = array('q')
+    data = []
+    for line in range(len(a._indptr) - 1):
+        p, p_end = a._indptr[line], a._indptr[line + 1]
+        q, q_end = b._indptr[line], b._indptr[line + 1]
+        while p < p_end or q < q_end:
+            i = a._indices[p] if p < p_end else None
+            j = b._indices[q] if q < q_end else None
+            if j is None or (i is not None and i < j):
+                if not both_only:
+                    indices.append(i)
+                    data.append(op(a_data[p], 0))
+                p += 1
+            elif i is None or j < i:
+                if not both_only:
+                    indices.append(j)
+                    data.append(op(0, b_data[q]))
+                q += 1
+            else:
+                indices.append(i)
+                data.append(op(a_data[p], b_data[q]))
+                p += 1
+                q += 1
+        indptr.append(len(indices))
+    return indptr, indices, data
+
+
+def _dense_rows(m):
+    """
+    Returns the rows of dense Matrix 'm' as lists of plain numbers.
+    """
+    return [_tolist(_values(*m._row(i, m._kind))) for i in range(m.rows)]
+
+
+class SparseMatrix(object):
+    """
+    A SparseMatrix is a grid of numbers, most of them zero, which only keeps
+    the numbers that are not.  It can be built from a Matrix, a Vector or a
+    list of Vectors, just like a Matrix, or from a dictionary of numbers
+    with from_entries().  'format' is 'csr' to store it row by row or 'csc'
+    to store it column by column.
+    """
+
+    __slots__ = ('_re', '_im', '_kind', '_indptr', '_indices', 'format',
+                 'rows', 'columns')
+
+    def __init__(self, rows=None, format='csr'):
+        if format not in ('csr', 'csc'):
+            raise ValueError("Unknown sparse format {}".format(format))
+        m = rows if isinstance(rows, Matrix) else Matrix(rows)
+        indptr = array('q', [0])
+        indices = array('q')
+        data = []
+        for i, row in enumerate(_dense_rows(m)):
+            for j, x in enumerate(row):
+                if x != 0:
+                    indices.append(j)
+                    data.append(x)
+            indptr.append(len(indices))
+        self._fill(indptr, indices, data, m._kind, 'csr', m.rows, m.columns)
+        if format == 'csc':
+            self._fill(*_transposed(indptr, indices, data, m.columns),
+                       self._kind, 'csc', m.rows, m.columns)
+
+    def _fill(self, indptr, indices, data, kind, format, rows, columns):
+        """
+        Sets up this SparseMatrix around compressed storage, packing the
+        numbers in 'data' into typed buffers for 'kind'.
+        """
+        self._re, self._im, self._kind = _pack(data, kind)
+        self._indptr, self._indices = indptr, indices
+        self.format = format
+        self.rows, self.columns = rows, columns
+
+    @classmethod
+    def _adopt(cls, indptr, indices, data, kind, format, rows, columns):
+        """
+        Builds a SparseMatrix around compressed storage without checking it.
+        Numbers in 'data' which are exactly zero are dropped, while tiny
+        ones are kept, as they are numbers which were really stored.
+        """
+        if any(x == 0 for x in data):
+            keep = array('q', [0])
+            kept_indices = array('q')
+            kept = []
+            for line in range(len(indptr) - 1):
+                for p in range(indptr[line], indptr[line + 1]):
+                    if data[p] != 0:
+                        kept_indices.append(indices[p])
+                        kept.append(data[p])
+                keep.append(len(kept))
+            indptr, indices, data = keep, kept_indices, kept
+        m = cls.__new__(cls)
+        m._fill(indptr, indices, data, kind, format, rows, columns)
+        return m
+
+    @classmethod
+    def from_entries(cls, rows, columns, entries, format='csr'):
+        """
+        Builds a 'rows' by 'columns' SparseMatrix from dictionary 'entries',
+        which maps (row, column) positions to the numbers stored there.
+        Every other position holds zero.
+        """
+        if not (isinstance(rows, int) and isinstance(columns, int)):
+            raise TypeError("Must use int for rows and columns")
+        if rows < 1 or columns < 1:
+            raise ValueError("Need at least 1 row and 1 column")
+        if format not in ('csr', 'csc'):
+            raise ValueError("Unknown sparse format {}".format(format))
+        for i, j in entries:
+            if not (0 <= i < rows and 0 <= j < columns):
+                raise IndexError("Entry ({}, {}) is outside the Matrix"
+                                 .format(i, j))
+        try:
+            kind = _kind_of(entries.values())
+        except AssertionError:
+            raise TypeError("All elements must numbers")
+
+        if format == 'csr':
+            key, lines = (lambda e: e), rows
+        else:
+            key, lines = (lambda e: (e[1], e[0])), columns
+        indptr = array('q', [0]) * (lines + 1)
+        indices = array('q')
+        data = []
+        for position in sorted(entries, key=key):
+            line, index = key(position)
+            indptr[line + 1] += 1
+            indices.append(index)
+            data.append(entries[position])
+        for line in range(lines):
+            indptr[line + 1] += indptr[line]
+        return cls._adopt(indptr, indices, data, kind, format, rows, columns)
+
+    def _data(self):
+        """
+        Returns the stored numbers as a sequence of plain numbers.
+        """
+        return _values(self._re, self._im)
+
+    def _lines(self):
+        """
+        Returns the quantity of major lines: rows for CSR, columns for CSC.
+        """
+        return self.rows if self.format == 'csr' else self.columns
+
+    def _as(self, format):
+        """
+        Returns this SparseMatrix in 'format', converting it if needed.
+        """
+        if self.format == format:
+            return self
+        indptr, indices, data = _transposed(self._indptr, self._indices,
+                                            self._data(),
+                                            self.rows if format == 'csr'
+                                            else self.columns)
+        m = SparseMatrix.__new__(SparseMatrix)
+        m._fill(indptr, indices, data, self._kind, format, self.rows,
+                self.columns)
+        return m
+
+    @property
+    def nnz(self):
+        """
+        The quantity of numbers stored in this SparseMatrix.
+        """
+        return len(self._indices)
+
+    def entries(self):
+        """
+        Returns the stored numbers as a dictionary mapping (row, column)
+        positions to numbers.
+        """
+        data = self._data()
+        entries = {}
+        for line in range(self._lines()):
+            for p in range(self._indptr[line], self._indptr[line + 1]):
+                if self.format == 'csr':
+                    entries[line, self._indices[p]] = data[p]
+                else:
+                    entries[self._indices[p], line] = data[p]
+        return entries
+
+    def to_matrix(self):
+        """
+        Returns the numbers of this SparseMatrix as a new dense Matrix.
+        """
+        values = [0] * (self.rows * self.columns)
+        for (i, j), x in self.entries().items():
+            values[i * self.columns + j] = x
+        return Matrix._adopt(*_pack(values, self._kind), self.rows,
+                             self.columns)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.rows
+        if not 0 <= i < self.rows:
+            raise IndexError("Matrix row out of range")
+        row = [0] * self.columns
+        data = self._data()
+        if self.format == 'csr':
+            for p in range(self._indptr[i], self._indptr[i + 1]):
+                row[self._indices[p]] = data[p]
+        else:
+            for j in range(self.columns):
+                start, stop = self._indptr[j], self._indptr[j + 1]
+                p = bisect_left(self._indices, i, start, stop)
+                if p < stop and self._indices[p] == i:
+                    row[j] = data[p]
+        return Vector._adopt(*_pack(row, self._kind))
+
+    def __str__(self):
+        string = "SparseMatrix: {} x {}, {} stored\n".format(
+            self.rows, self.columns, self.nnz)
+        for (i, j), x in sorted(self.entries().items()):
+            string += "({}, {}): {}\n".format(i, j, x)
+        return string
+
+    def __eq__(self, m):
+        """
+        Compare this SparseMatrix with another SparseMatrix, or with a dense
+        Matrix, using the == operator.  Like Matrix, numbers which agree to
+        6 decimal places are equal.
+        """
+        if isinstance(m, Matrix):
+            if self.rows != m.rows or self.columns != m.columns:
+                return False
+            rows = zip(_dense_rows(self.to_matrix()), _dense_rows(m))
+            return all(_is_zero(x - y) for a, b in rows
+                       for x, y in zip(a, b))
+        if not isinstance(m, SparseMatrix):
+            return NotImplemented
+        if self.rows != m.rows or self.columns != m.columns:
+            return False
+        _, _, data = _merge(self, m._as(self.format), sub)
+        return all(map(_is_zero, data))
+
+    def _check_same_size(self, m):
+        """
+        Raises an exception unless 'm' is a Matrix or SparseMatrix the same
+        size as this one.
+        """
+        if not isinstance(m, (Matrix, SparseMatrix)):
+            raise TypeError("Other item must be a Matrix")
+        if (self.rows != m.rows) or (self.columns != m.columns):
+            raise IndexError("Matrices must be same size")
+
+    def _combine(self, m, op):
+        """
+        Adds or subtracts, with 'op', Matrix or SparseMatrix 'm'.  Two
+        SparseMatrices give a SparseMatrix while a dense Matrix gives a dense
+        Matrix.
+        """
+        self._check_same_size(m)
+        kind = max(self._kind, m._kind)
+        if isinstance(m, SparseMatrix):
+            return SparseMatrix._adopt(*_merge(self, m._as(self.format), op),
+                                       kind, self.format, self.rows,
+                                       self.columns)
+        values = [x for row in _dense_rows(m) for x in row]
+        if op is sub:
+            values = [-x for x in values]
+        for (i, j), x in self.entries().items():
+            values[i * self.columns + j] += x
+        return Matrix._adopt(*_pack(values, kind), self.rows, self.columns)
+
+    def __add__(self, m):
+        """
+        Adds Matrix or SparseMatrix 'm' to this SparseMatrix with the '+'
+        operator.
+        """
+        return self._combine(m, add)
+
+    __radd__ = __add__
+
+    def __sub__(self, m):
+        """
+        Subtracts Matrix or SparseMatrix 'm' from this SparseMatrix with the
+        '-' operator.
+        """
+        return self._combine(m, sub)
+
+    def __rsub__(self, m):
+        """
+        Subtracts this SparseMatrix from dense Matrix 'm', which is on the
+        left of the '-' operator.
+        """
+        if not isinstance(m, Matrix):
+            return NotImplemented
+        return self._combine(m, sub).scale(-1)
+
+    def scale(self, k):
+        """
+        Scales each element within this SparseMatrix by the value 'k' and
+        returns the result as a new SparseMatrix.
+        """
+        if not isinstance(k, Complex):
+            raise TypeError('Scalar needs to be a number')
+        kind = max(self._kind, _kind_of((k,)))
+        return SparseMatrix._adopt(self._indptr, self._indices,
+                                   list(map(mul, repeat(k), self._data())),
+                                   kind, self.format, self.rows, self.columns)
+
+    def hadamard(self, m):
+        """
+        Performs element by element multiplication between this SparseMatrix
+        and Matrix or SparseMatrix 'm'.  Zeros stay zero, so the result is
+        always a new SparseMatrix.
+        """
+        self._check_same_size(m)
+        kind = max(self._kind, m._kind)
+        if isinstance(m, SparseMatrix):
+            return SparseMatrix._adopt(*_merge(self, m._as(self.format), mul,
+                                               both_only=True),
+                                       kind, self.format, self.rows,
+                                       self.columns)
+        if self.format == 'csc':
+            m = m.transpose()
+        data = list(self._data())
+        for line in range(self._lines()):
+            start, stop = self._indptr[line], self._indptr[line + 1]
+            if start == stop:
+                continue
+            dense = _tolist(_values(*m._row(line, kind)))
+            for p in range(start, stop):
+                data[p] *= dense[self._indices[p]]
+        return SparseMatrix._adopt(self._indptr, self._indices, data, kind,
+                                   self.format, self.rows, self.columns)
+
+    def __mul__(self, m):
+        """
+        Use '*' operator to multiply things with this SparseMatrix.  A Vector
+        gives a Vector, a dense Matrix gives a dense Matrix and a
+        SparseMatrix gives a SparseMatrix.  Anything else is used to scale
+        this SparseMatrix.
+        """
+        if isinstance(m, Vector):
+            if self.columns != m.dimension:
+                raise IndexError("Vector is wrong size")
+            return self._matvec(m)
+        if isinstance(m, Matrix):
+            if m.rows != self.columns:
+                raise IndexError("Matrix is wrong size")
+            return self._matmul_dense(m)
+        if isinstance(m, SparseMatrix):
+            if m.rows != self.columns:
+                raise IndexError("Matrix is wrong size")
+            return self._matmul_sparse(m)
+        if isinstance(m, Complex):
+            return self.scale(m)
+        return NotImplemented
+
+    def __rmul__(self, m):
+        """
+        Handles a Vector or dense Matrix on the left of '*', which is the
+        same as multiplying the transpose of this SparseMatrix by the
+        transpose of 'm'.  Numbers scale this SparseMatrix.
+        """
+        if isinstance(m, Vector):
+            if m.dimension != self.rows:
+                raise IndexError("Matrix is wrong size")
+            return self.transpose()._matvec(m)
+        if isinstance(m, Matrix):
+            if m.columns != self.rows:
+                raise IndexError("Matrix is wrong size")
+            return self.transpose()._matmul_dense(m.transpose()).transpose()
+        if isinstance(m, Complex):
+            return self.scale(m)
+        return NotImplemented
+
+    def _matvec(self, v):
+        """
+        Post-multiplies Vector 'v' with this SparseMatrix and returns a
+        Vector.  Only the stored numbers are multiplied.
+        """
+        kind = max(self._kind, v._kind)
+        x = v.elements
+        data = self._data()
+        indices = self._indices
+        indptr = self._indptr
+        if self.format == 'csr':
+            return Vector._adopt(*_pack(
+                [sum(data[p] * x[indices[p]]
+                     for p in range(indptr[i], indptr[i + 1]))
+                 for i in range(self.rows)], kind))
+        y = [0] * self.rows
+        for j in range(self.columns):
+            xj = x[j]
+            for p in range(indptr[j], indptr[j + 1]):
+                y[indices[p]] += data[p] * xj
+        return Vector._adopt(*_pack(y, kind))
+
+    def _matmul_dense(self, m):
+        """
+        Post-multiplies dense Matrix 'm' with this SparseMatrix.  Each stored
+        number scales one row of 'm' into a row of the product, which is
+        returned as a dense Matrix.
+        """
+        a = self._as('csr')
+        data = a._data()
+        b = _dense_rows(m)
+        values = []
+        for i in range(a.rows):
+            acc = [0] * m.columns
+            for p in range(a._indptr[i], a._indptr[i + 1]):
+                acc = list(map(add, acc, map(mul, repeat(data[p]),
+                                             b[a._indices[p]])))
+            values.extend(acc)
+        return Matrix._adopt(*_pack(values, max(self._kind, m._kind)),
+                             self.rows, m.columns)
+
+    def _matmul_sparse(self, m):
+        """
+        Post-multiplies SparseMatrix 'm' with this SparseMatrix one row at a
+        time, gathering each row of the product from the rows of 'm' picked
+        out by the stored numbers.  Returns a SparseMatrix in CSR format.
+        """
+        a, b = self._as('csr'), m._as('csr')
+        a_data, b_data = a._data(), b._data()
+        indptr = array('q', [0])
+        indices = array('q')
+        data = []
+        for i in range(a.rows):
+            acc = {}
+            for p in range(a._indptr[i], a._indptr[i + 1]):
+                x, k = a_data[p], a._indices[p]
+                for q in range(b._indptr[k], b._indptr[k + 1]):
+                    j = b._indices[q]
+                    acc[j] = acc.get(j, 0) + x * b_data[q]
+            for j in sorted(acc):
+                indices.append(j)
+                data.append(acc[j])
+            indptr.append(len(indices))
+        return SparseMatrix._adopt(indptr, indices, data,
+                                   max(self._kind, m._kind), 'csr', a.rows,
+                                   b.columns)
+
+    def transpose(self):
+        """
+        Determines the transpose of this SparseMatrix and returns it as a
+        new SparseMatrix.  CSR storage read column by column is the CSC
+        storage of the transpose, so nothing is copied.
+        """
+        m = SparseMatrix.__new__(SparseMatrix)
+        m._re, m._im, m._kind = self._re, self._im, self._kind
+        m._indptr, m._indices = self._indptr, self._indices
+        m.format = 'csc' if self.format == 'csr' else 'csr'
+        m.rows, m.columns = self.columns, self.rows
+        return m
+
+    def _diagonal(self):
+        """
+        Returns the numbers on the diagonal as a list.  Indices along each
+        line are sorted so each one is found by bisection.
+        """
+        data = self._data()
+        diagonal = []
+        for k in range(min(self.rows, self.columns)):
+            start, stop = self._indptr[k], self._indptr[k + 1]
+            p = bisect_left(self._indices, k, start, stop)
+            found = p < stop and self._indices[p] == k
+            diagonal.append(data[p] if found else 0)
+        return diagonal
+
+    def diagonal(self):
+        """
+        Finds the diagonal of the SparseMatrix and returns it as a Vector.
+        """
+        return Vector._adopt(*_pack(self._diagonal(), self._kind))
+
+    def trace(self):
+        """
+        Finds the trace of the SparseMatrix (sum of elements on the
+        diagonal) and returns it.
+        """
+        if self.rows != self.columns:
+            raise TypeError("Trace only valid on square Matrix")
+        return sum(self._diagonal())
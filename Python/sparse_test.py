@@ -0,0 +1,164 @@
+import unittest
+from linear import Vector, Matrix
+from sparse import SparseMatrix
+
+
+# unittest requires CamelCase
+class TestSparseMatrix(unittest.TestCase):
+    def setUp(self):
+        self.d1 = Matrix([Vector([1, 0, 0, 2]),
+                          Vector([0, 0, 3, 0]),
+                          Vector([0, 4, 0, 0])])
+        self.d2 = Matrix([Vector([0, 5, 0, 0]),
+                          Vector([0, 0, -3, 1]),
+                          Vector([6, 0, 0, 0])])
+        self.s1 = SparseMatrix(self.d1)
+        self.s2 = SparseMatrix(self.d2, format='csc')
+
+
+    def tearDown(self):
+        del self.d1
+        del self.d2
+        del self.s1
+        del self.s2
+
+
+    def test_creation(self):
+        self.assertRaises(IndexError, lambda: SparseMatrix())
+        self.assertRaises(TypeError, lambda: SparseMatrix(1))
+        self.assertRaises(ValueError, lambda: SparseMatrix(self.d1, 'coo'))
+
+        # Only the numbers which are not zero are stored
+        self.assertEqual(self.s1.nnz, 4)
+        self.assertEqual((self.s1.rows, self.s1.columns), (3, 4))
+        self.assertEqual(list(self.s1._indptr), [0, 2, 3, 4])
+        self.assertEqual(list(self.s1._indices), [0, 3, 2, 1])
+        self.assertEqual(list(self.s2._indptr), [0, 1, 2, 3, 4])
+        self.assertEqual(list(self.s2._indices), [2, 0, 1, 1])
+
+        # Round trip through a dense Matrix
+        self.assertEqual(self.s1.to_matrix(), self.d1)
+        self.assertEqual(self.s2.to_matrix(), self.d2)
+        self.assertEqual(self.s2[1], Vector([0, 0, -3, 1]))
+        self.assertEqual(self.s2[-1], Vector([6, 0, 0, 0]))
+        self.assertRaises(IndexError, lambda: self.s1[3])
+
+        s = SparseMatrix.from_entries(3, 4, {(0, 0): 1, (0, 3): 2,
+                                             (1, 2): 3, (2, 1): 4})
+        self.assertEqual(s, self.s1)
+        self.assertEqual(SparseMatrix.from_entries(
+            3, 4, self.s2.entries(), format='csc').entries(),
+            self.s2.entries())
+        self.assertRaises(IndexError,
+                          lambda: SparseMatrix.from_entries(2, 2, {(2, 0): 1}))
+        self.assertRaises(TypeError, lambda: SparseMatrix.from_entries(
+            2, 2, {(0, 0): 'a'}))
+
+
+    def test_equal(self):
+        self.assertTrue(self.s1 == self.d1)
+        self.assertTrue(self.d1 == self.s1)
+        self.assertTrue(self.s1 == SparseMatrix(self.d1, format='csc'))
+        self.assertFalse(self.s1 == self.s2)
+        self.assertFalse(self.d1 == self.s2)
+        self.assertFalse(self.s1 == self.s1.transpose())
+        self.assertFalse(self.s1 == Vector([1, 2]))
+        self.assertFalse(self.s1 == 1)
+
+
+    def test_add(self):
+        total = self.d1 + self.d2
+        self.assertIsInstance(self.s1 + self.s2, SparseMatrix)
+        self.assertEqual(self.s1 + self.s2, total)
+        # 3 and -3 cancel out, leaving one less number stored
+        self.assertEqual((self.s1 + self.s2).nnz, 6)
+        self.assertIsInstance(self.s1 + self.d2, Matrix)
+        self.assertEqual(self.s1 + self.d2, total)
+        self.assertEqual(self.s1 - self.d2, self.d1 - self.d2)
+        self.assertEqual(self.s2 - self.s2, self.d1.scale(0))
+        self.assertEqual((self.s2 - self.s2).nnz, 0)
+        self.assertRaises(TypeError, lambda: self.s1 + 1)
+        self.assertRaises(IndexError, lambda: self.s1 + self.s1.transpose())
+
+
+    def test_tiny(self):
+        # Verify that tiny numbers are stored, not taken as zero
+        s = SparseMatrix.from_entries(2, 2, {(0, 0): 1e-8, (1, 1): 2.0})
+        self.assertEqual(s.nnz, 2)
+        tiny = SparseMatrix.from_entries(2, 2, {(0, 0): 1e-7, (1, 1): 1e-7j})
+        self.assertEqual((tiny + tiny).nnz, 2)
+        self.assertEqual((tiny + tiny).entries(), {(0, 0): 2e-7,
+                                                   (1, 1): 2e-7j})
+        self.assertEqual((tiny + tiny).to_matrix()[0][0], 2e-7)
+        self.assertEqual((tiny - tiny).nnz, 0)
+
+
+    def test_scale(self):
+        self.assertEqual(self.s1.scale(2), self.d1.scale(2))
+        self.assertEqual(self.s1 * 1.5, self.d1.scale(1.5))
+        self.assertEqual(2 * self.s2, self.d2.scale(2))
+        self.assertEqual(self.s1.scale(1j), self.d1.scale(1j))
+        self.assertEqual(self.s1.scale(0).nnz, 0)
+        self.assertRaises(TypeError, lambda: self.s1.scale('text'))
+
+
+    def test_hadamard(self):
+        d3 = Matrix([Vector([2, 1, 1, 2]),
+                     Vector([1, 1, 0, 1]),
+                     Vector([1, 4, 1, 1])])
+        expected = self.d1.hadamard(d3)
+        self.assertEqual(self.s1.hadamard(d3), expected)
+        self.assertEqual(self.s1.hadamard(d3).nnz, 3)
+        self.assertEqual(self.s1.hadamard(SparseMatrix(d3, 'csc')), expected)
+        self.assertEqual(SparseMatrix(self.d1, 'csc').hadamard(d3), expected)
+        self.assertEqual(self.s1.hadamard(self.s2).nnz, 1)
+
+
+    def test_multiply(self):
+        v = Vector([1, 2, 3, 4])
+        self.assertEqual(self.s1 * v, self.d1 * v)
+        self.assertEqual(self.s2 * v, self.d2 * v)
+        w = Vector([1, -1, 2])
+        self.assertEqual(w * self.s1, w * self.d1)
+        self.assertEqual(w * self.s2, w * self.d2)
+        self.assertRaises(IndexError, lambda: self.s1 * w)
+        self.assertRaises(IndexError, lambda: v * self.s1)
+
+        # Sparse by dense and dense by sparse give a dense Matrix
+        t = self.d2.transpose()
+        self.assertIsInstance(self.s1 * t, Matrix)
+        self.assertEqual(self.s1 * t, self.d1 * t)
+        self.assertEqual(self.s2 * self.d1.transpose(),
+                         self.d2 * self.d1.transpose())
+        self.assertIsInstance(t * self.s1, Matrix)
+        self.assertEqual(t * self.s1, t * self.d1)
+        self.assertRaises(IndexError, lambda: self.s1 * self.d1)
+
+        # Sparse by sparse stays sparse
+        product = self.s1 * self.s2.transpose()
+        self.assertIsInstance(product, SparseMatrix)
+        self.assertEqual(product, self.d1 * t)
+        self.assertEqual(self.s2.transpose() * self.s1, t * self.d1)
+
+
+    def test_transpose(self):
+        t = self.s1.transpose()
+        self.assertEqual(t.format, 'csc')
+        self.assertIs(t._indices, self.s1._indices)
+        self.assertEqual(t, self.d1.transpose())
+        self.assertEqual(self.s2.transpose(), self.d2.transpose())
+        self.assertEqual(t.transpose().format, 'csr')
+
+
+    def test_diagonal(self):
+        self.assertEqual(self.s1.diagonal(), Vector([1, 0, 0]))
+        self.assertEqual(self.s2.diagonal(), Vector([0, 0, 0]))
+        self.assertEqual(self.s1.transpose().diagonal(), Vector([1, 0, 0]))
+        square = SparseMatrix(Matrix([Vector([1, 2]), Vector([0, 4])]),
+                              'csc')
+        self.assertEqual(square.trace(), 5)
+        self.assertRaises(TypeError, lambda: self.s1.trace())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Times Matrix multiplication with the classic kernel against Strassen-Winograd
+multiplication for square matrices of growing size, and reports where
+Strassen starts to win.
+
+Usage:  python strassen_benchmark.py [cutoff] [size ...]
+"""
+import sys
+from benchmark import best_time
+from linear import RandomMatrix, STRASSEN_CUTOFF
+
+
+SIZES = (32, 64, 96, 128, 192, 256, 384)
+
+# Strassen only counts as faster once it beats the classic kernel by this
+# fraction, over the best of REPEATS runs each, so noise is not a crossover.
+MARGIN = 0.05
+REPEATS = 5
+
+
+def form_matrix(side):
+    """
+    Form a square matrix, of dimension side x side, which is filled with random
+    floats.  Return the matrix.
+    """
+    return RandomMatrix(side, element_type='float')
+
+
+def compare(sizes, cutoff):
+    """
+    Prints classic and Strassen timings for each size in 'sizes' above
+    'cutoff' and returns the first size at which Strassen was faster by at
+    least MARGIN, or None.  At or below the cutoff Strassen never splits, so
+    both would time the classic kernel.
+    """
+    crossover = None
+    print("{:>6} {:>12} {:>12} {:>8}".format('n', 'classic (s)',
+                                             'strassen (s)', 'ratio'))
+    for n in sizes:
+        if n <= cutoff:
+            print("{:>6} {:>34}".format(n, 'not above the cutoff'))
+            continue
+        a = form_matrix(n)
+        b = form_matrix(n)
+        classic = best_time(lambda: a.multiply(b, method='classic'), REPEATS)
+        strassen = best_time(lambda: a.multiply(b, method='strassen',
+                                                cutoff=cutoff), REPEATS)
+        print("{:>6} {:>12.4f} {:>12.4f} {:>8.2f}".format(n, classic, strassen,
+                                                          classic / strassen))
+        if crossover is None and strassen * (1 + MARGIN) <= classic:
+            crossover = n
+    return crossover
+
+
+if __name__ == "__main__":
+    cutoff = int(sys.argv[1]) if len(sys.argv) > 1 else STRASSEN_CUTOFF
+    sizes = [int(s) for s in sys.argv[2:]] or SIZES
+    print("Strassen cutoff: {}".format(cutoff))
+    crossover = compare(sizes, cutoff)
+    if crossover is None:
+        print("Strassen did not beat the classic kernel at these sizes.")
+    else:
+        print("Strassen first beat the classic kernel at n = {}."
+              .format(crossover))
@@ -0,0 +1,199 @@
+"""
+Out-of-core multiplication of Matrices too tall to hold in memory.
+
+The left operand is taken a block of rows at a time, from a Matrix, from a
+file written by binary.save(), or from any iterable of row Vectors or of
+Matrices which are already row blocks.  Each block is multiplied by a right
+operand, a Matrix or a Vector, held in memory, and the rows of the product
+are handed back a block at a time or written straight to a file:
+
+    for block in multiply('big.bin', right):
+        consume(block)
+
+    save_product('big.bin', right, 'product.bin')
+
+At most one block of the left operand and one of the product are held at
+once, so memory use is set by 'block_rows' rather than by the height of the
+left operand.
+"""
+import os
+import shutil
+import tempfile
+from array import array
+
+from binary import DTYPES, HEADER, MAGIC, VERSION, _header, _little, _opened
+from linear import Matrix, Vector, _COMPLEX, _INT, _convert
+
+# Rows of the left operand multiplied at a time when no block size is given
+BLOCK_ROWS = 256
+
+
+def _matrix_blocks(m, block_rows):
+    """
+    Yields Matrix 'm' as blocks of rows copied out of it one at a time.
+    """
+    for start in range(0, m.rows, block_rows):
+        stop = min(start + block_rows, m.rows)
+        yield Matrix([m[i] for i in range(start, stop)])
+
+
+def _file_blocks(file, block_rows):
+    """
+    Yields the Matrix held in 'file', a path or a binary file written by
+    binary.save(), as blocks read one at a time.
+    """
+    with _opened(file, 'rb') as f:
+        base = f.tell()
+        dimensions, kind, rows, columns = _header(f.read(HEADER.size))
+        if dimensions != 2:
+            raise ValueError("File holds a Vector, not a Matrix")
+        typecode = 'q' if kind == _INT else 'd'
+        plane = 8 * rows * columns
+        for start in range(0, rows, block_rows):
+            count = min(block_rows, rows - start)
+            offset = base + HEADER.size + 8 * start * columns
+            parts = []
+            for part in range(2 if kind == _COMPLEX else 1):
+                f.seek(offset + part * plane)
+                buf = array(typecode)
+                try:
+                    buf.fromfile(f, count * columns)
+                except EOFError:
+                    raise ValueError("Matrix file is truncated")
+                parts.append(_little(buf, typecode))
+            if len(parts) == 1:
+                parts.append(None)
+            yield Matrix._adopt(*parts, kind, count, columns)
+
+
+def _iterable_blocks(rows, block_rows):
+    """
+    Yields Matrices from an iterable of row blocks, passing Matrices through
+    and gathering Vectors 'block_rows' at a time.
+    """
+    pending = []
+    for row in rows:
+        if isinstance(row, Matrix):
+            if pending:
+                yield Matrix(pending)
+                pending = []
+            yield row
+        elif isinstance(row, Vector):
+            pending.append(row)
+            if len(pending) == block_rows:
+                yield Matrix(pending)
+                pending = []
+        else:
+            raise TypeError("Rows must be Vectors or Matrices")
+    if pending:
+        yield Matrix(pending)
+
+
+def row_blocks(source, block_rows=None):
+    """
+    Yields the rows of 'source' as Matrices of up to 'block_rows' rows.
+    'source' is a Matrix, a path or binary file written by binary.save(),
+    or an iterable of row Vectors or of Matrices which are row blocks
+    already, which are passed through as they are.
+    """
+    block_rows = block_rows or BLOCK_ROWS
+    if block_rows < 1:
+        raise ValueError("Need at least one row per block")
+    if isinstance(source, Matrix):
+        return _matrix_blocks(source, block_rows)
+    if isinstance(source, (str, bytes)) or hasattr(source, 'read') or \
+            hasattr(source, '__fspath__'):
+        return _file_blocks(source, block_rows)
+    return _iterable_blocks(source, block_rows)
+
+
+def multiply(source, right, block_rows=None):
+    """
+    Multiplies the rows of 'source', taken a block at a time as by
+    row_blocks(), by Matrix or Vector 'right' and yields the rows of the
+    product: a Matrix per block when 'right' is a Matrix or a Vector per
+    block when it is a Vector.
+    """
+    if not isinstance(right, (Matrix, Vector)):
+        raise TypeError("Can only multiply by a Matrix or a Vector")
+    for block in row_blocks(source, block_rows):
+        yield block * right
+
+
+def save_product(source, right, file, block_rows=None):
+    """
+    Multiplies 'source' by 'right' as multiply() does and writes the product,
+    a block at a time, to 'file', a path or a seekable binary file, in the
+    format read by binary.load().  Every block must hold numbers of the same
+    kind as the first, or a narrower one, or ValueError is raised.  Nothing
+    is left behind if that happens: a path is written to a temporary file
+    which only replaces it once the product is complete, and an open file is
+    truncated back to where the product started.
+    """
+    if hasattr(file, 'write'):
+        base = file.tell()
+        try:
+            _write_product(source, right, file, block_rows)
+        except Exception:
+            file.seek(base)
+            file.truncate()
+            raise
+        return
+    path = os.path.abspath(file)
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path),
+                                     prefix='.product', delete=False) as f:
+        try:
+            _write_product(source, right, f, block_rows)
+        except Exception:
+            f.close()
+            os.unlink(f.name)
+            raise
+    os.replace(f.name, path)
+
+
+def _write_product(source, right, f, block_rows):
+    """
+    Writes the product of 'source' and 'right' to open binary file 'f' for
+    save_product().
+    """
+    with tempfile.TemporaryFile() as spill:
+        base = f.tell()
+        f.write(bytes(HEADER.size))
+        kind = None
+        count = 0
+        for block in multiply(source, right, block_rows):
+            if isinstance(block, Matrix):
+                re, im, block_kind = block._flat()
+                count += block.rows
+            else:
+                re, im, block_kind = block._re, block._im, block._kind
+                count += block.dimension
+            if kind is None:
+                kind = block_kind
+                if kind not in DTYPES:
+                    raise TypeError("Can only save int, float or complex "
+                                    "numbers")
+            elif block_kind > kind:
+                raise ValueError("Every block must hold the same kind of "
+                                 "numbers as the first")
+            re, im = _convert(re, im, block_kind, kind)
+            typecode = 'q' if kind == _INT else 'd'
+            f.write(_little(re, typecode))
+            if im is not None:
+                # Imaginary parts go after every real part
+                spill.write(_little(im, 'd'))
+        if kind is None:
+            raise ValueError("Source has no rows")
+        if kind == _COMPLEX:
+            spill.seek(0)
+            shutil.copyfileobj(spill, f, 8 * BLOCK_ROWS)
+        end = f.tell()
+        if isinstance(right, Matrix):
+            header = (2, count, right.columns)
+        else:
+            header = (1, 1, count)
+        dimensions, rows, columns = header
+        f.seek(base)
+        f.write(HEADER.pack(MAGIC, VERSION, dimensions, DTYPES[kind], rows,
+                            columns))
+        f.seek(end)
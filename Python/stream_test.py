@@ -0,0 +1,119 @@
+import io
+import os
+import tempfile
+import tracemalloc
+import unittest
+from linear import Vector, Matrix
+from binary import save, load
+from stream import row_blocks, multiply, save_product
+from testutil import storage
+
+
+def stack(blocks):
+    """
+    Joins row blocks of a product back into one Matrix or Vector.
+    """
+    blocks = list(blocks)
+    if isinstance(blocks[0], Vector):
+        return Vector([e for b in blocks for e in b.elements])
+    return Matrix([b[i] for b in blocks for i in range(b.rows)])
+
+
+# unittest requires CamelCase
+class TestStream(unittest.TestCase):
+    def setUp(self):
+        self.m1 = Matrix([Vector([i, 2 * i - 7, 3]) for i in range(10)])
+        self.m2 = Matrix([Vector([0.5 * i, -1.5j, 2.25]) for i in range(7)])
+        self.right = Matrix([Vector([1, 2]),
+                             Vector([3, -4]),
+                             Vector([5, 6])])
+        self.v1 = Vector([1, -2, 3])
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'left.bin')
+        self.output = os.path.join(self.folder.name, 'product.bin')
+
+
+    def tearDown(self):
+        del self.m1
+        del self.m2
+        del self.right
+        del self.v1
+        self.folder.cleanup()
+        del self.folder
+
+
+    def test_blocks(self):
+        m1 = self.m1
+        blocks = list(row_blocks(m1, 4))
+        self.assertEqual([b.rows for b in blocks], [4, 4, 2])
+        self.assertEqual(stack(blocks), m1)
+        save(self.m2, self.path)
+        self.assertEqual(stack(row_blocks(self.path, 3)), self.m2)
+        rows = [m1[0], m1[1], Matrix([m1[2], m1[3]]), m1[4]]
+        self.assertEqual([b.rows for b in row_blocks(rows, 5)], [2, 2, 1])
+        self.assertRaises(TypeError, list, row_blocks([1, 2]))
+        self.assertRaises(ValueError, row_blocks, m1, -1)
+
+
+    def test_multiply(self):
+        square = Matrix([self.m2[i] for i in range(3)])
+        for left in (self.m1, self.m2, square.ht()):
+            save(left, self.path)
+            for right in (self.right, self.v1):
+                for source in (left, self.path, iter(list(left))):
+                    with self.subTest(left=left._kind, right=str(right)):
+                        self.assertEqual(
+                            storage(stack(multiply(source, right, 3))),
+                            storage(left * right))
+        self.assertRaises(IndexError, list, multiply(self.m1, Vector([1, 2])))
+        self.assertRaises(TypeError, list, multiply(self.m1, 2))
+
+
+    def test_save_product(self):
+        for left in (self.m1, self.m2):
+            for right in (self.right, self.v1):
+                with self.subTest(left=left._kind, right=str(right)):
+                    save(left, self.path)
+                    save_product(self.path, right, self.output, 4)
+                    self.assertEqual(storage(load(self.output)),
+                                     storage(left * right))
+                    self.assertEqual(load(self.output, 'r'), left * right)
+        buf = io.BytesIO(b'xyz')
+        buf.seek(3)
+        save_product(self.m1, self.right, buf)
+        buf.seek(3)
+        self.assertEqual(load(buf), self.m1 * self.right)
+        # A float block after int blocks cannot be written as ints, and
+        # leaves what was there before alone
+        blocks = [self.m1, self.m1.scale(0.5)]
+        self.assertRaises(ValueError, save_product, blocks, self.right,
+                          self.output)
+        self.assertEqual(load(self.output), self.m2 * self.v1)
+        self.assertEqual(sorted(os.listdir(self.folder.name)),
+                         ['left.bin', 'product.bin'])
+        self.assertRaises(ValueError, save_product, [], self.right,
+                          self.output)
+        buf.seek(3)
+        self.assertRaises(ValueError, save_product, blocks, self.right, buf)
+        self.assertEqual(buf.getvalue(), b'xyz')
+
+
+    def test_memory(self):
+        tall = Matrix([Vector([float(i), 1.0, -1.0, 2.0])
+                       for i in range(4000)])
+        save(tall, self.path)
+        del tall
+        right = Matrix([Vector([1.0, 2.0])] * 4)
+        tracemalloc.start()
+        try:
+            save_product(self.path, right, self.output, 16)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        # The left operand alone is 128000 bytes of numbers
+        self.assertLess(peak, 64000)
+        self.assertEqual(load(self.output).rows, 4000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,346 @@
+"""
+Square matrices for linear.py whose only numbers that are not zero lie on
+the diagonal.
+
+A DiagonalMatrix keeps just its n diagonal numbers, a ScaledIdentity keeps
+just its size and the one number repeated down its diagonal, and an
+IdentityMatrix is a ScaledIdentity of 1.  None of them ever builds the
+n * n grid, so:
+
+    - multiplying one by a Vector, or by another of them, costs n
+      multiplications
+    - multiplying one by a dense Matrix scales its rows (or its columns when
+      the Matrix is on the left), costing one multiplication per number
+    - adding one to a dense Matrix copies the Matrix and only adds along
+      the diagonal
+    - shift() and trace() only look at the diagonal
+
+They mix with Vectors and Matrices through the usual operators and compare
+equal to the dense Matrix holding the same numbers.
+"""
+from numbers import Complex
+from operator import add, mul, sub
+
+from linear import Matrix, Vector, _OBJECT, _all_close, _kind_of, _pack
+
+
+class DiagonalMatrix(object):
+    """
+    A DiagonalMatrix is a square Matrix which is zero everywhere off its
+    diagonal.  It is built from the numbers on its diagonal, given as a
+    Vector or as a list of numbers, and only stores those.
+    """
+
+    __slots__ = ('_diagonal', '_kind', 'rows', 'columns')
+
+    def __init__(self, elements):
+        if not isinstance(elements, Vector):
+            elements = Vector(elements)
+        self._diagonal = elements
+        self._kind = elements._kind
+        self.rows = self.columns = elements.dimension
+
+    @classmethod
+    def _adopt(cls, re, im, kind):
+        """
+        Builds a DiagonalMatrix around the storage buffers of its diagonal
+        without copying or checking them.
+        """
+        d = cls.__new__(cls)
+        d._diagonal = Vector._adopt(re, im, kind)
+        d._kind = kind
+        d.rows = d.columns = d._diagonal.dimension
+        return d
+
+    def _numbers(self):
+        """
+        Returns the numbers on the diagonal as a sequence of plain numbers.
+        """
+        return self._diagonal.elements
+
+    def _combine(self, m, op):
+        """
+        Combines the diagonals of this and DiagonalMatrix 'm' with 'op'.
+        """
+        values = list(map(op, self._numbers(), m._numbers()))
+        return DiagonalMatrix._adopt(*_pack(values, max(self._kind, m._kind)))
+
+    def _check_size(self, m):
+        """
+        Raises an exception unless Matrix 'm' is the same size as this one.
+        """
+        if (self.rows != m.rows) or (self.columns != m.columns):
+            raise IndexError("Matrices must be same size")
+
+    def to_matrix(self):
+        """
+        Returns the numbers of this Matrix as a new dense Matrix.
+        """
+        n = self.rows
+        values = [0] * (n * n)
+        values[::n + 1] = self._numbers()
+        return Matrix._adopt(*_pack(values, self._kind), n, n)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.rows
+        if not 0 <= i < self.rows:
+            raise IndexError("Matrix row out of range")
+        row = [0] * self.columns
+        row[i] = self._numbers()[i]
+        return Vector._adopt(*_pack(row, self._kind))
+
+    def __str__(self):
+        return "{}: diag{}\n".format(type(self).__name__,
+                                     self.diagonal().__str__()[8:])
+
+    def __eq__(self, m):
+        """
+        Compare with another diagonal Matrix, or with a dense Matrix, using
+        the == operator.  Like Matrix, numbers which agree to 6 decimal
+        places are equal.
+        """
+        if isinstance(m, DiagonalMatrix):
+            if self.rows != m.rows:
+                return False
+            return self.diagonal() == m.diagonal()
+        if isinstance(m, Matrix):
+            return self.to_matrix() == m
+        return NotImplemented
+
+    def __add__(self, m):
+        """
+        Adds diagonal or dense Matrix 'm' with the '+' operator.  Only the
+        diagonal is added to, so a dense Matrix gives a dense Matrix and a
+        diagonal one stays diagonal.
+        """
+        if isinstance(m, DiagonalMatrix):
+            self._check_size(m)
+            return self._combine(m, add)
+        if isinstance(m, Matrix):
+            self._check_size(m)
+            return m._plus_diagonal(self._numbers())
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, m):
+        """
+        Subtracts diagonal or dense Matrix 'm' with the '-' operator.
+        """
+        if isinstance(m, DiagonalMatrix):
+            self._check_size(m)
+            return self._combine(m, sub)
+        if isinstance(m, Matrix):
+            self._check_size(m)
+            return m.scale(-1)._plus_diagonal(self._numbers())
+        return NotImplemented
+
+    def __rsub__(self, m):
+        """
+        Subtracts this Matrix from dense Matrix 'm', which is on the left of
+        the '-' operator.
+        """
+        if isinstance(m, Matrix):
+            self._check_size(m)
+            return m._plus_diagonal(self.scale(-1)._numbers())
+        return NotImplemented
+
+    def scale(self, k):
+        """
+        Scales the diagonal by the value 'k' and returns the result as a new
+        diagonal Matrix.
+        """
+        if not isinstance(k, Complex):
+            raise TypeError('Scalar needs to be a number')
+        d = self._diagonal.scale(k)
+        return DiagonalMatrix._adopt(d._re, d._im, d._kind)
+
+    def shift(self, k):
+        """
+        Uses constant 'k' to shift the Matrix, which only changes the
+        diagonal.  Result is returned as a new diagonal Matrix.
+        """
+        if not isinstance(k, Complex):
+            raise TypeError('Scalar needs to be a number')
+        kind = max(self._kind, _kind_of((k,)))
+        return DiagonalMatrix._adopt(*_pack([x + k for x in self._numbers()],
+                                            kind))
+
+    def __mul__(self, m):
+        """
+        Use '*' operator to multiply things with this Matrix.  A Vector has
+        each of its numbers scaled by the matching diagonal number, and a
+        dense Matrix has each of its rows scaled.  Two diagonal Matrices
+        multiply diagonal by diagonal.  Numbers scale this Matrix.
+        """
+        if isinstance(m, DiagonalMatrix):
+            if m.rows != self.columns:
+                raise IndexError("Matrix is wrong size")
+            return self._combine(m, mul)
+        if isinstance(m, Vector):
+            if self.columns != m.dimension:
+                raise IndexError("Vector is wrong size")
+            values = list(map(mul, self._numbers(), m.elements))
+            return Vector._adopt(*_pack(values, max(self._kind, m._kind)))
+        if isinstance(m, Matrix):
+            if m.rows != self.columns:
+                raise IndexError("Matrix is wrong size")
+            rows, _ = m._rows(_OBJECT)
+            values = [d * x for d, row in zip(self._numbers(), rows)
+                      for x in row]
+            return Matrix._adopt(*_pack(values, max(self._kind, m._kind)),
+                                 m.rows, m.columns)
+        if isinstance(m, Complex):
+            return self.scale(m)
+        return NotImplemented
+
+    def __rmul__(self, m):
+        """
+        Handles a Vector or dense Matrix on the left of '*'.  A Vector has
+        each of its numbers scaled by the matching diagonal number, and a
+        dense Matrix has each of its columns scaled.
+        """
+        if isinstance(m, Vector):
+            if m.dimension != self.rows:
+                raise IndexError("Matrix is wrong size")
+            values = list(map(mul, m.elements, self._numbers()))
+            return Vector._adopt(*_pack(values, max(self._kind, m._kind)))
+        if isinstance(m, Matrix):
+            if m.columns != self.rows:
+                raise IndexError("Matrix is wrong size")
+            rows, _ = m._rows(_OBJECT)
+            diagonal = self._numbers()
+            values = [x * d for row in rows for x, d in zip(row, diagonal)]
+            return Matrix._adopt(*_pack(values, max(self._kind, m._kind)),
+                                 m.rows, m.columns)
+        if isinstance(m, Complex):
+            return self.scale(m)
+        return NotImplemented
+
+    def transpose(self):
+        """
+        A diagonal Matrix is its own transpose.
+        """
+        return self
+
+    def ht(self):
+        """
+        Determines the Hermitian transpose, which conjugates the diagonal.
+        """
+        return DiagonalMatrix._adopt(*_pack([x.conjugate()
+                                             for x in self._numbers()],
+                                            self._kind))
+
+    def diagonal(self):
+        """
+        Finds the diagonal of the Matrix and returns it as a Vector.
+        """
+        return Vector._adopt(*_pack(self._numbers(), self._kind))
+
+    def trace(self):
+        """
+        Finds the trace of the Matrix (sum of elements on the diagonal)
+        and returns it.
+        """
+        return sum(self._numbers())
+
+
+class ScaledIdentity(DiagonalMatrix):
+    """
+    A ScaledIdentity is the identity Matrix of 'size' rows scaled by the
+    number 'k'.  Only 'size' and 'k' are stored, and arithmetic between two
+    of them stays a ScaledIdentity.
+    """
+
+    __slots__ = ('k',)
+
+    def __init__(self, size, k=1):
+        if not isinstance(size, int):
+            raise TypeError("Must use int for size")
+        if size < 2:
+            raise ValueError("Need at least 2 rows")
+        try:
+            self._kind = _kind_of((k,))
+        except AssertionError:
+            raise TypeError('Scalar needs to be a number')
+        self.k = k
+        self.rows = self.columns = size
+
+    def _numbers(self):
+        return [self.k] * self.rows
+
+    def _combine(self, m, op):
+        if isinstance(m, ScaledIdentity):
+            return ScaledIdentity(self.rows, op(self.k, m.k))
+        return super()._combine(m, op)
+
+    def __str__(self):
+        return "{}: {} x {}, {} on the diagonal\n".format(
+            type(self).__name__, self.rows, self.columns, self.k)
+
+    def __eq__(self, m):
+        if isinstance(m, ScaledIdentity):
+            if self.rows != m.rows:
+                return False
+            return _all_close(([self.k.real], [self.k.imag]),
+                              ([m.k.real], [m.k.imag]))
+        return super().__eq__(m)
+
+    def scale(self, k):
+        if not isinstance(k, Complex):
+            raise TypeError('Scalar needs to be a number')
+        return ScaledIdentity(self.rows, self.k * k)
+
+    def shift(self, k):
+        if not isinstance(k, Complex):
+            raise TypeError('Scalar needs to be a number')
+        return ScaledIdentity(self.rows, self.k + k)
+
+    def __mul__(self, m):
+        """
+        Use '*' operator to multiply things with this Matrix.  Anything it
+        multiplies is just scaled by 'k'.
+        """
+        if isinstance(m, Vector):
+            if self.columns != m.dimension:
+                raise IndexError("Vector is wrong size")
+            return m.scale(self.k)
+        if isinstance(m, Matrix):
+            if m.rows != self.columns:
+                raise IndexError("Matrix is wrong size")
+            return m.scale(self.k)
+        return super().__mul__(m)
+
+    def __rmul__(self, m):
+        if isinstance(m, Vector):
+            if m.dimension != self.rows:
+                raise IndexError("Matrix is wrong size")
+            return m.scale(self.k)
+        if isinstance(m, Matrix):
+            if m.columns != self.rows:
+                raise IndexError("Matrix is wrong size")
+            return m.scale(self.k)
+        return super().__rmul__(m)
+
+    def ht(self):
+        return ScaledIdentity(self.rows, self.k.conjugate())
+
+    def trace(self):
+        return self.rows * self.k
+
+
+class IdentityMatrix(ScaledIdentity):
+    """
+    An IdentityMatrix has ones on its diagonal and zeros everywhere else.
+    Only its size is stored.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, size):
+        super().__init__(size, 1)
+
+    def __str__(self):
+        return "{}: {} x {}\n".format(type(self).__name__, self.rows,
+                                      self.columns)
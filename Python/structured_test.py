@@ -0,0 +1,108 @@
+import unittest
+from linear import Vector, Matrix
+from structured import DiagonalMatrix, IdentityMatrix, ScaledIdentity
+
+
+# unittest requires CamelCase
+class TestStructured(unittest.TestCase):
+    def setUp(self):
+        self.d = DiagonalMatrix([1, 2, 3])
+        self.s = ScaledIdentity(3, 2)
+        self.i = IdentityMatrix(3)
+        self.m = Matrix([Vector([1, 2, 3]),
+                         Vector([4, 5, 6]),
+                         Vector([7, 8, 9])])
+        self.dense = Matrix([Vector([1, 0, 0]),
+                             Vector([0, 2, 0]),
+                             Vector([0, 0, 3])])
+
+
+    def tearDown(self):
+        del self.d
+        del self.s
+        del self.i
+        del self.m
+        del self.dense
+
+
+    def test_creation(self):
+        self.assertRaises(IndexError, lambda: DiagonalMatrix([1]))
+        self.assertRaises(TypeError, lambda: DiagonalMatrix([1, 'a']))
+        self.assertRaises(TypeError, lambda: ScaledIdentity(2.0, 1))
+        self.assertRaises(ValueError, lambda: ScaledIdentity(1, 1))
+        self.assertRaises(TypeError, lambda: ScaledIdentity(2, 'a'))
+        self.assertEqual((self.i.rows, self.i.columns), (3, 3))
+        self.assertEqual(self.d.to_matrix(), self.dense)
+        self.assertEqual(self.d[1], Vector([0, 2, 0]))
+        self.assertEqual(self.i[-1], Vector([0, 0, 1]))
+        self.assertRaises(IndexError, lambda: self.i[3])
+
+
+    def test_equal(self):
+        self.assertTrue(self.d == self.dense)
+        self.assertTrue(self.dense == self.d)
+        self.assertTrue(self.i == self.m.identity())
+        self.assertTrue(self.s == DiagonalMatrix([2, 2, 2]))
+        self.assertTrue(self.s == ScaledIdentity(3, 2.0000001))
+        self.assertFalse(self.s == ScaledIdentity(4, 2))
+        self.assertFalse(self.i == self.s)
+        self.assertFalse(self.d == self.m)
+        self.assertFalse(self.d == 1)
+
+
+    def test_add(self):
+        self.assertEqual(self.d + self.m, self.dense + self.m)
+        self.assertEqual(self.m + self.d, self.dense + self.m)
+        self.assertEqual(self.m - self.d, self.m - self.dense)
+        self.assertEqual(self.d - self.m, self.dense - self.m)
+        self.assertIsInstance(self.d + self.m, Matrix)
+        self.assertEqual(self.d + self.s, DiagonalMatrix([3, 4, 5]))
+        self.assertIsInstance(self.s + self.i, ScaledIdentity)
+        self.assertEqual(self.s - self.i, self.i)
+        self.assertRaises(IndexError, lambda: self.d + IdentityMatrix(2))
+        self.assertRaises(TypeError, lambda: self.d + 1)
+
+
+    def test_multiply(self):
+        v = Vector([1, -1, 2])
+        self.assertEqual(self.d * v, self.dense * v)
+        self.assertEqual(v * self.d, v * self.dense)
+        self.assertEqual(self.s * v, Vector([2, -2, 4]))
+        self.assertEqual(v * self.i, v)
+        self.assertEqual(self.d * self.m, self.dense * self.m)
+        self.assertEqual(self.m * self.d, self.m * self.dense)
+        self.assertEqual(self.i * self.m, self.m)
+        self.assertEqual(self.m * self.s, self.m.scale(2))
+        self.assertEqual(self.d * self.d, DiagonalMatrix([1, 4, 9]))
+        self.assertIsInstance(self.s * self.s, ScaledIdentity)
+        self.assertEqual(self.s * self.s, ScaledIdentity(3, 4))
+        self.assertEqual(self.d * 2, self.d + self.d)
+        self.assertEqual(0.5 * self.s, self.i)
+        self.assertRaises(IndexError, lambda: self.d * Vector([1, 2]))
+        self.assertRaises(IndexError, lambda: Vector([1, 2]) * self.i)
+        self.assertRaises(TypeError, lambda: self.d * 'text')
+
+
+    def test_shift(self):
+        self.assertEqual(self.m.shift(3), self.m + self.m.identity().scale(3))
+        self.assertEqual(self.m.transpose().shift(1.5),
+                         self.m.transpose() + self.m.identity().scale(1.5))
+        self.assertEqual(self.d.shift(1), DiagonalMatrix([2, 3, 4]))
+        self.assertIsInstance(self.i.shift(1), ScaledIdentity)
+        self.assertEqual(self.i.shift(1), self.s)
+        self.assertRaises(TypeError, lambda: self.d.shift('text'))
+
+
+    def test_trace(self):
+        self.assertEqual(self.d.trace(), 6)
+        self.assertEqual(self.s.trace(), 6)
+        self.assertEqual(self.i.trace(), 3)
+        self.assertEqual(self.d.diagonal(), Vector([1, 2, 3]))
+        self.assertIs(self.d.transpose(), self.d)
+        self.assertEqual(ScaledIdentity(2, 1j).ht(), ScaledIdentity(2, -1j))
+        self.assertEqual(DiagonalMatrix([1j, 2]).ht(),
+                         DiagonalMatrix([-1j, 2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
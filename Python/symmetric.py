@@ -1,5 +1,7 @@
 from random import seed, randint
-from linear import RandomVector, Matrix
+from linear import RandomMatrix
+from lazy import lazy
+from packed import SymmetricMatrix
 
 
 def is_symmectric(matrix):
@@ -7,24 +9,22 @@ def is_symmectric(matrix):
     Tests a matrix to determine if it symmectric or not.  Returns True if it is
     symmetric.
     """
-    return matrix == matrix.transpose()
+    return matrix.is_symmetric()
 
 def form_symmetric(matrix):
     """
     Uses 'matrix' as a base to form a new symmetric matrix.  If successful
-    returns the symmetric matrix.
+    returns the symmetric matrix, with only one triangle stored.
     """
-    return matrix + matrix.transpose()
+    return SymmetricMatrix((lazy(matrix) + lazy(matrix).transpose())
+                           .evaluate())
 
 def form_matrix(side):
     """
     Form a square matrix, of dimension side x side, which is filled with random
     integers.  Return the matrix.
     """
-    vectors = []
-    for _ in range(side):
-        vectors.append(RandomVector(quantity=side))
-    return Matrix(vectors)
+    return RandomMatrix(side)
 
 def test_add():
     """
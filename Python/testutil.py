@@ -0,0 +1,15 @@
+"""
+Helpers shared by the unit tests.
+"""
+from linear import Matrix
+
+
+def storage(x):
+    """
+    Returns the dtype and exact numbers held by Matrix or Vector 'x', to
+    check a result holds the very same numbers as another, not just close
+    ones of any type.
+    """
+    if isinstance(x, Matrix):
+        return x.dtype, [row.elements for row in x.row_list]
+    return x.dtype, x.elements
@@ -0,0 +1,174 @@
+"""
+Linear and affine transforms of whole stacks of points for linear.py.
+
+A stack of points is a Matrix with one point per row, such as the circle in
+scale.py.  A Transform is built once from a small square Matrix, and
+optionally an offset Vector, and then moves every point p of a stack to
+matrix * p + offset in a single pass over its storage:
+
+    rotate = Transform(Matrix([Vector([c, -s]), Vector([s, c])]))
+    moved = rotate(points)
+
+The numbers of the Matrix are read out once, when the Transform is built,
+rather than once per point.  2-D, 3-D and 4-D points are moved by a
+kernel for their size with every multiply and add written out, so 2-D,
+3-D and homogeneous 4x4 transforms never loop over rows or columns.  An
+affine transform can also be given as a homogeneous Matrix, one row and
+column bigger than the points, whose last column is the offset and whose
+last row is (0, ..., 0, 1).
+
+stream() transforms points a chunk at a time, from anything row_blocks() in
+stream.py reads, so only one chunk is held at once.
+"""
+from operator import mul
+
+from linear import Matrix, Vector, _kind_of, _pack, _values
+from stream import row_blocks
+
+# Points transformed at a time by stream() when no chunk size is given
+CHUNK_POINTS = 4096
+
+
+def _move2(flat, coefficients, offset):
+    """
+    Moves 2-D points, given as flat row-major numbers, by the numbers of a
+    2x2 Matrix in row-major order and an offset.  Returns the flat numbers
+    of the moved points as a list.
+    """
+    a00, a01, a10, a11 = coefficients
+    t0, t1 = offset
+    it = iter(flat)
+    return [y for x0, x1 in zip(it, it)
+            for y in (a00 * x0 + a01 * x1 + t0,
+                      a10 * x0 + a11 * x1 + t1)]
+
+
+def _move3(flat, coefficients, offset):
+    """
+    Moves 3-D points like _move2() does 2-D ones.
+    """
+    a00, a01, a02, a10, a11, a12, a20, a21, a22 = coefficients
+    t0, t1, t2 = offset
+    it = iter(flat)
+    return [y for x0, x1, x2 in zip(it, it, it)
+            for y in (a00 * x0 + a01 * x1 + a02 * x2 + t0,
+                      a10 * x0 + a11 * x1 + a12 * x2 + t1,
+                      a20 * x0 + a21 * x1 + a22 * x2 + t2)]
+
+
+def _move4(flat, coefficients, offset):
+    """
+    Moves 4-D points like _move2() does 2-D ones.
+    """
+    (a00, a01, a02, a03, a10, a11, a12, a13,
+     a20, a21, a22, a23, a30, a31, a32, a33) = coefficients
+    t0, t1, t2, t3 = offset
+    it = iter(flat)
+    return [y for x0, x1, x2, x3 in zip(it, it, it, it)
+            for y in (a00 * x0 + a01 * x1 + a02 * x2 + a03 * x3 + t0,
+                      a10 * x0 + a11 * x1 + a12 * x2 + a13 * x3 + t1,
+                      a20 * x0 + a21 * x1 + a22 * x2 + a23 * x3 + t2,
+                      a30 * x0 + a31 * x1 + a32 * x2 + a33 * x3 + t3)]
+
+
+# Kernels with every multiply and add written out, by number of dimensions.
+# Points with more dimensions are transformed as a Matrix product.
+_KERNELS = {2: _move2, 3: _move3, 4: _move4}
+
+
+class Transform(object):
+    """
+    A Transform moves points p, given as the rows of a Matrix, to
+    matrix * p + offset.  'matrix' is a square Matrix the size of the
+    points, with 'offset' an optional Vector, or if 'homogeneous' is True a
+    Matrix one bigger than the points which holds both.
+    """
+
+    __slots__ = ('matrix', 'offset', 'dimension', '_kind', '_coefficients',
+                 '_offsets')
+
+    def __init__(self, matrix, offset=None, homogeneous=False):
+        if not isinstance(matrix, Matrix):
+            raise TypeError("Transform needs a Matrix")
+        if matrix.rows != matrix.columns:
+            raise IndexError("Transform Matrix must be square")
+        if offset is not None and not isinstance(offset, Vector):
+            raise TypeError("Offset must be a Vector")
+        numbers = list(_values(*matrix._flat()[:2]))
+        n = matrix.rows
+        if homogeneous:
+            if offset is not None:
+                raise ValueError("A homogeneous Matrix holds its own offset")
+            if n < 3 or numbers[-n:] != [0] * (n - 1) + [1]:
+                raise ValueError("Homogeneous Matrix must end with a row "
+                                 "of (0, ..., 0, 1)")
+            self.dimension = n - 1
+            offsets = numbers[n - 1:-n:n]
+            numbers = [x for i in range(n - 1)
+                       for x in numbers[i * n:i * n + n - 1]]
+        else:
+            self.dimension = n
+            offsets = [0] * n if offset is None else offset.elements
+        if len(offsets) != self.dimension:
+            raise IndexError("Offset must be the same size as the points")
+        self.matrix = matrix
+        self.offset = offset
+        self._coefficients = numbers
+        self._offsets = offsets
+        self._kind = _kind_of(numbers + offsets)
+
+    def __call__(self, points):
+        """
+        Returns the points of Matrix 'points' moved by this Transform, as a
+        new Matrix.
+        """
+        return self.apply(points)
+
+    def apply(self, points):
+        """
+        Returns the points of Matrix 'points' moved by this Transform, as a
+        new Matrix.
+        """
+        if not isinstance(points, Matrix):
+            raise TypeError("Points must be the rows of a Matrix")
+        d = self.dimension
+        if points.columns != d:
+            raise IndexError("Points must be {}-dimensional".format(d))
+        kind = max(points._kind, self._kind)
+        re, im, _ = points._flat()
+        if d in _KERNELS:
+            moved = _KERNELS[d](_values(re, im), self._coefficients,
+                                self._offsets)
+        else:
+            moved = self._product(_values(re, im))
+        return Matrix._adopt(*_pack(moved, kind), points.rows, d)
+
+    def _product(self, flat):
+        """
+        Moves points, given as flat row-major numbers, with a dot product
+        per number rather than an unrolled kernel.
+        """
+        d = self.dimension
+        rows = [self._coefficients[i * d:(i + 1) * d] for i in range(d)]
+        it = iter(flat)
+        return [sum(map(mul, row, p)) + t
+                for p in zip(*[it] * d)
+                for row, t in zip(rows, self._offsets)]
+
+    def stream(self, source, chunk_points=None):
+        """
+        Yields the points of 'source', a Matrix, a file written by
+        binary.save() or an iterable of point Vectors or Matrices, moved by
+        this Transform, one chunk of at most 'chunk_points' at a time.
+        """
+        for block in row_blocks(source, chunk_points or CHUNK_POINTS):
+            yield self.apply(block)
+
+
+def transform(points, matrix, offset=None, homogeneous=False):
+    """
+    Returns the points of Matrix 'points', one per row, moved by 'matrix'
+    and 'offset' as a Transform moves them.  Build a Transform to move
+    several stacks of points the same way.
+    """
+    return Transform(matrix, offset, homogeneous).apply(points)
@@ -0,0 +1,89 @@
+import unittest
+from linear import Vector, Matrix, RandomMatrix
+from transform import Transform, transform
+
+
+# unittest requires CamelCase
+class TestTransform(unittest.TestCase):
+    def setUp(self):
+        self.points = Matrix([Vector([1, 2]),
+                              Vector([-3, 0]),
+                              Vector([4, -5])])
+        self.t1 = Matrix([Vector([1, 0]),
+                          Vector([1.25, 2])])
+        self.offset = Vector([10, -1])
+
+
+    def tearDown(self):
+        del self.points
+        del self.t1
+        del self.offset
+
+
+    def test_linear(self):
+        # Verify that every point p becomes t1 * p, as with scale()
+        moved = transform(self.points, self.t1)
+        self.assertEqual(moved, self.points.scale(self.t1))
+        self.assertEqual(moved[2], self.t1 * self.points[2])
+        for d in (2, 3, 4, 6):
+            for element_type in ('int', 'float', 'complex'):
+                with self.subTest(d=d, element_type=element_type):
+                    points = RandomMatrix(20, d, element_type, seed=d)
+                    m = RandomMatrix(d, d, element_type, seed=d + 1)
+                    moved = Transform(m)(points)
+                    self.assertEqual(moved, points.scale(m))
+                    self.assertEqual(moved.dtype, points.dtype)
+
+        # Verify that views and wider matrices are handled
+        t = self.points.transpose().transpose()
+        self.assertEqual(transform(self.points.ht().ht(), self.t1.ht()),
+                         t.scale(self.t1.transpose()))
+        self.assertEqual(transform(self.points, self.t1.scale(1j)).dtype,
+                         'complex')
+
+
+    def test_affine(self):
+        moved = transform(self.points, self.t1, self.offset)
+        for i in range(self.points.rows):
+            self.assertEqual(moved[i],
+                             self.t1 * self.points[i] + self.offset)
+        h = Matrix([Vector([1, 0, 10]),
+                    Vector([1.25, 2, -1]),
+                    Vector([0, 0, 1])])
+        self.assertEqual(transform(self.points, h, homogeneous=True), moved)
+        # Integers stay exact
+        self.assertEqual(transform(self.points,
+                                   Matrix([Vector([2, 1]), Vector([0, 3])]),
+                                   Vector([1, 1])).dtype, 'int')
+
+
+    def test_stream(self):
+        t = Transform(self.t1, self.offset)
+        points = RandomMatrix(10, 2, 'float', seed=3)
+        chunks = list(t.stream(points, 4))
+        self.assertEqual([c.rows for c in chunks], [4, 4, 2])
+        self.assertEqual([c[i] for c in chunks for i in range(c.rows)],
+                         t(points).row_list)
+        rows = (points[i] for i in range(points.rows))
+        self.assertEqual(list(t.stream(rows))[0], t(points))
+
+
+    def test_errors(self):
+        self.assertRaises(TypeError, Transform, [[1, 0], [0, 1]])
+        self.assertRaises(IndexError, Transform, self.points)
+        self.assertRaises(TypeError, Transform, self.t1, [1, 2])
+        self.assertRaises(IndexError, Transform, self.t1, Vector([1, 2, 3]))
+        self.assertRaises(ValueError, Transform, self.t1, homogeneous=True)
+        skewed = Matrix([Vector([1, 0, 0]),
+                         Vector([0, 1, 0]),
+                         Vector([0, 1, 1])])
+        self.assertRaises(ValueError, Transform, skewed, homogeneous=True)
+        self.assertRaises(ValueError, Transform, skewed, self.offset,
+                          homogeneous=True)
+        self.assertRaises(IndexError, transform, self.points.transpose(),
+                          self.t1)
+        self.assertRaises(TypeError, transform, Vector([1, 2]), self.t1)
+
+
+if __name__ == "__main__":
+    unittest.main()
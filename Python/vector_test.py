@@ -1,5 +1,7 @@
 import unittest
-from linear import Vector, RandomVector, Matrix
+from array import array
+from linear import Vector, RandomVector, Matrix, cache_info, substream
+from fractions import Fraction
 from random import seed, randint
 
 
@@ -36,6 +38,44 @@ class TestVector(unittest.TestCase):
         self.assertEqual(Vector([1, 0, -1.0]), self.v5)
 
 
+    def test_storage(self):
+        # Verify that Vectors do not carry a per-instance __dict__
+        self.assertFalse(hasattr(self.v1, '__dict__'))
+        self.assertFalse(hasattr(RandomVector(), '__dict__'))
+
+        # Verify that real numbers are kept in typed buffers
+        self.assertIsInstance(self.v1._re, array)
+        self.assertIsInstance(self.v1[0], int)
+        self.assertIsInstance(self.v5._re, array)
+        self.assertIsInstance(self.v5[0], float)
+
+        # Verify that elements are a list which does not change the Vector
+        self.assertEqual(Vector([1, 2, 3]).elements, [1, 2, 3])
+        self.v1.elements[0] = 10
+        self.assertEqual(self.v1[0], 1)
+
+        # Verify that slices are lists whatever the storage, as before
+        m = Matrix([self.v1, self.v2])
+        for v in (self.v1, self.v4, self.v6, m[1],
+                  Vector([Fraction(1, 2), 3])):
+            with self.subTest(dtype=v.dtype):
+                self.assertIsInstance(v[:2], list)
+                self.assertEqual(v[:2], v.elements[:2])
+
+        # Verify that a Vector owning its numbers counts its version in a
+        # plain int, and only views share one through a list
+        self.assertIsInstance(Vector([1, 2, 3])._version, int)
+        self.assertIs(m[0]._version, m._version)
+
+        # Verify that complex numbers survive being split into two buffers
+        self.assertEqual(self.v6[1], complex(4, 5))
+        self.assertEqual(self.v6.elements, [complex(3, 0), complex(4, 5)])
+
+        # Verify that integers too large for a typed buffer stay exact
+        big = 2 ** 70
+        self.assertEqual((Vector([big, 1]) + Vector([1, 1]))[0], big + 1)
+
+
     def test_addition(self):
         # Verify we can add Vectors.
         self.assertEqual(self.v1 + self.v2, Vector([5, 7, 9]))
@@ -62,6 +102,8 @@ class TestVector(unittest.TestCase):
 
         # Verify that Vectors containing complex numbers can be subtracted.
         self.assertEqual(self.v7 - self.v6, Vector([-2, complex(-2, -5)]))
+        self.assertEqual(Vector([1, 2j]) - Vector([1j, 2]),
+                         Vector([1 - 1j, -2 + 2j]))
 
         # Verify that vectors have to be the same size to be subtracted.
         self.assertRaises(IndexError, lambda: self.v1 - self.v3)
@@ -83,6 +125,55 @@ class TestVector(unittest.TestCase):
         self.assertEqual(self.v1.scale(2), Vector([2, 4, 6]))
         self.assertEqual(self.v1.scale(0.5), Vector([0.5, 1.0, 1.5]))
 
+
+    def test_in_place(self):
+        # Verify that in-place operators keep the same Vector and storage
+        v = Vector([1, 2, 3])
+        w = v
+        storage = v._re
+        v += Vector([1, 1, 1])
+        self.assertIs(v, w)
+        self.assertIs(v._re, storage)
+        self.assertEqual(v, Vector([2, 3, 4]))
+        v -= Vector([2, 2, 2])
+        self.assertEqual(v, Vector([0, 1, 2]))
+        v *= 3
+        self.assertIs(v, w)
+        self.assertEqual(v, Vector([0, 3, 6]))
+
+        # Verify that numbers needing wider storage still work in place
+        self.assertIs(v.scale_(0.5), w)
+        self.assertEqual(v, Vector([0, 1.5, 3]))
+        v += Vector([1j, 0, 0])
+        self.assertEqual(v, Vector([1j, 1.5, 3]))
+
+        # Verify that results can be written into another Vector
+        out = Vector([0.0, 0.0, 0.0])
+        storage = out._re
+        self.assertIs(self.v1.add(self.v2, out=out), out)
+        self.assertIs(out._re, storage)
+        self.assertEqual(out, Vector([5, 7, 9]))
+        self.assertEqual(self.v1.subtract(self.v2, out=out),
+                         Vector([-3, -3, -3]))
+        self.assertEqual(self.v1.scale(2, out=out), Vector([2, 4, 6]))
+        self.assertEqual(out, Vector([2, 4, 6]))
+        self.assertRaises(IndexError, lambda: self.v1.add(self.v2,
+                                                          out=self.v3))
+        self.assertRaises(TypeError, lambda: self.v1.scale(2, out=[0, 0, 0]))
+
+        # Verify that a row of a Matrix is updated inside the Matrix
+        m = Matrix([Vector([1, 2]), Vector([3, 4])])
+        row = m[1]
+        row += Vector([10, 10])
+        self.assertEqual(m, Matrix([Vector([1, 2]), Vector([13, 14])]))
+
+        # Verify that multiplying by a Matrix still gives a new Vector
+        v = Vector([1, 2])
+        w = v
+        v *= m
+        self.assertIsNot(v, w)
+        self.assertEqual(v, Vector([27, 30]))
+
     def test_dot_prod(self):
         # Verify a Vector is needed for dot product
         self.assertRaises(TypeError, lambda: self.v1 @ [1, 2, 3])
@@ -159,6 +250,66 @@ class TestVector(unittest.TestCase):
         # Which is true, but c'mon man....
         self.assertAlmostEqual(vu.magnitude(), 1)
 
+    def test_dtype(self):
+        # Verify that the dtype follows the numbers through operations
+        self.assertEqual(Vector([1, 2]).dtype, 'int')
+        self.assertEqual(Vector([1, 2.5]).dtype, 'float')
+        self.assertEqual(Vector([1, 2j]).dtype, 'complex')
+        self.assertEqual(Vector([Fraction(1, 2), 1]).dtype, 'object')
+        self.assertEqual((Vector([1, 2]) + Vector([1.5, 2])).dtype, 'float')
+        self.assertEqual(Vector([1, 2]).scale(1j).dtype, 'complex')
+
+        # Verify that numbers can only be widened
+        v = Vector([1, 2])
+        w = v.astype('float')
+        self.assertEqual((w.dtype, w), ('float', v))
+        self.assertIsNot(v.astype('int')._re, v._re)
+        self.assertEqual(v.astype('complex').elements, [1 + 0j, 2 + 0j])
+        self.assertRaises(TypeError, lambda: w.astype('int'))
+        self.assertRaises(TypeError, lambda: v.astype('double'))
+
+        # Verify that integers are compared exactly
+        self.assertNotEqual(Vector([2 ** 62, 1]), Vector([2 ** 62 + 1, 1]))
+        self.assertEqual(Vector([0.1, 1]), Vector([0.1 + 10 ** -9, 1]))
+
+
+    def test_cache(self):
+        # Verify that the magnitude is worked out once and then cached
+        v = Vector([3, 4])
+        before = cache_info()
+        self.assertEqual(v.magnitude(), 5)
+        self.assertEqual(v.magnitude(), 5)
+        after = cache_info()
+        self.assertEqual(after.misses - before.misses, 1)
+        self.assertEqual(after.hits - before.hits, 1)
+
+        # Verify that the angle uses the cached magnitudes
+        v.angle(Vector([4, 3]))
+        self.assertEqual(cache_info().hits - after.hits, 1)
+
+        # Verify that changing the Vector, or the cached unit vector, means
+        # they are worked out again
+        u = v.unit()
+        self.assertIs(v.unit(), u)
+        v += Vector([3, 4])
+        self.assertEqual(v.magnitude(), 10)
+        self.assertIsNot(v.unit(), u)
+        u = v.unit()
+        u *= 2
+        self.assertEqual(v.unit(), Vector([0.6, 0.8]))
+
+        # Verify that setting a number, even a wider one, is noticed
+        v[0] = 0
+        self.assertEqual(v.magnitude(), 8)
+        v[1] = 0.5
+        self.assertEqual(v.magnitude(), 0.5)
+        v[1] = 1j
+        self.assertEqual(v, Vector([0, 1j]))
+        v[0] = 2 ** 70
+        self.assertEqual(v[0], 2 ** 70)
+        self.assertRaises(IndexError, v.__setitem__, 2, 1)
+        self.assertRaises(TypeError, v.__setitem__, 0, 'a')
+
 
     def test_cross(self):
         # Verify that both Vectors need to be 3D to perform cross prod.
@@ -209,5 +360,34 @@ class TestVector(unittest.TestCase):
             with self.subTest(i):
                 self.assertTrue(isinstance(rv.elements[i], float))
 
+
+    def test_random_seed(self):
+        # Verify that a seed or a generator makes the numbers repeatable
+        for element_type in ('int', 'float', 'gaussian', 'complex'):
+            with self.subTest(element_type):
+                rv = RandomVector(50, element_type, seed=7)
+                self.assertEqual(rv, RandomVector(50, element_type, seed=7))
+                self.assertNotEqual(rv, RandomVector(50, element_type,
+                                                     seed=8))
+        self.assertEqual(RandomVector(5, rng=substream(3, 1)),
+                         RandomVector(5, rng=substream(3, 1)))
+        self.assertNotEqual(RandomVector(20, rng=substream(3, 0)),
+                            RandomVector(20, rng=substream(3, 1)))
+        seed(11)
+        rv = RandomVector(20)
+        seed(11)
+        self.assertEqual(RandomVector(20), rv)
+
+        # Verify the kinds and ranges of the numbers
+        rv = RandomVector(200, 'complex', seed=1)
+        self.assertTrue(all(isinstance(e, complex) for e in rv.elements))
+        self.assertTrue(all(abs(e.real) <= 100 and abs(e.imag) <= 100
+                            for e in rv.elements))
+        rv = RandomVector(200, seed=1)
+        self.assertTrue(all(-100 <= e <= 100 for e in rv.elements))
+        self.assertRaises(TypeError, lambda: RandomVector(3, 'text'))
+        self.assertRaises(ValueError,
+                          lambda: RandomVector(3, seed=1, rng=substream(1, 0)))
+
 if __name__ == "__main__":
     unittest.main()